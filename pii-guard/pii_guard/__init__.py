@@ -1,5 +1,10 @@
 # pii_guard/__init__.py
 from .detector import PIIDetector
-from .guard import guard_answer, scrub_ingest
+from .guard import guard_answer, scrub_ingest, scrub_ingest_batch
+from .incremental import DocumentStore, rescrub_ingest
+from .dedupe import ChunkCache
+from .filescan import scan_file
+from .sdk import PIIGuard
 
-__all__ = ["PIIDetector", "guard_answer", "scrub_ingest"]
\ No newline at end of file
+__all__ = ["PIIDetector", "guard_answer", "scrub_ingest", "scrub_ingest_batch",
+           "DocumentStore", "rescrub_ingest", "ChunkCache", "scan_file", "PIIGuard"]
\ No newline at end of file
@@ -0,0 +1,296 @@
+# pii_guard/address.py
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .names import Trie, _is_hangul
+
+# 시/도 (정식 명칭과 흔히 쓰는 약칭)
+SIDO = (
+    "서울", "서울시", "서울특별시", "부산", "부산시", "부산광역시", "대구", "대구시", "대구광역시",
+    "인천", "인천시", "인천광역시", "광주", "광주광역시", "대전", "대전시", "대전광역시",
+    "울산", "울산시", "울산광역시", "세종", "세종시", "세종특별자치시",
+    "경기", "경기도", "강원", "강원도", "강원특별자치도", "충북", "충청북도", "충남", "충청남도",
+    "전북", "전라북도", "전북특별자치도", "전남", "전라남도", "경북", "경상북도", "경남", "경상남도",
+    "제주", "제주도", "제주특별자치도",
+)
+
+# 시/군/구 (자치구, 시, 군, 일반구)
+SIGUNGU = (
+    # 자치구 (서울/광역시)
+    "종로구", "중구", "용산구", "성동구", "광진구", "동대문구", "중랑구", "성북구", "강북구", "도봉구", "노원구",
+    "은평구", "서대문구", "마포구", "양천구", "강서구", "구로구", "금천구", "영등포구", "동작구", "관악구",
+    "서초구", "강남구", "송파구", "강동구", "서구", "동구", "영도구", "부산진구", "동래구", "남구", "북구",
+    "해운대구", "사하구", "금정구", "연제구", "수영구", "사상구", "수성구", "달서구", "미추홀구", "연수구",
+    "남동구", "부평구", "계양구", "광산구", "유성구", "대덕구",
+    # 광역시 군
+    "기장군", "달성군", "군위군", "강화군", "옹진군", "울주군",
+    # 경기
+    "수원시", "성남시", "의정부시", "안양시", "부천시", "광명시", "평택시", "동두천시", "안산시", "고양시",
+    "과천시", "구리시", "남양주시", "오산시", "시흥시", "군포시", "의왕시", "하남시", "용인시", "파주시",
+    "이천시", "안성시", "김포시", "화성시", "광주시", "양주시", "포천시", "여주시", "연천군", "가평군", "양평군",
+    "장안구", "권선구", "팔달구", "영통구", "수정구", "중원구", "분당구", "만안구", "동안구", "상록구", "단원구",
+    "덕양구", "일산동구", "일산서구", "처인구", "기흥구", "수지구",
+    # 강원
+    "춘천시", "원주시", "강릉시", "동해시", "태백시", "속초시", "삼척시", "홍천군", "횡성군", "영월군", "평창군",
+    "정선군", "철원군", "화천군", "양구군", "인제군", "고성군", "양양군",
+    # 충북
+    "청주시", "충주시", "제천시", "보은군", "옥천군", "영동군", "증평군", "진천군", "괴산군", "음성군", "단양군",
+    "상당구", "서원구", "흥덕구", "청원구",
+    # 충남
+    "천안시", "공주시", "보령시", "아산시", "서산시", "논산시", "계룡시", "당진시", "금산군", "부여군", "서천군",
+    "청양군", "홍성군", "예산군", "태안군", "동남구", "서북구",
+    # 전북
+    "전주시", "군산시", "익산시", "정읍시", "남원시", "김제시", "완주군", "진안군", "무주군", "장수군", "임실군",
+    "순창군", "고창군", "부안군", "완산구", "덕진구",
+    # 전남
+    "목포시", "여수시", "순천시", "나주시", "광양시", "담양군", "곡성군", "구례군", "고흥군", "보성군", "화순군",
+    "장흥군", "강진군", "해남군", "영암군", "무안군", "함평군", "영광군", "장성군", "완도군", "진도군", "신안군",
+    # 경북
+    "포항시", "경주시", "김천시", "안동시", "구미시", "영주시", "영천시", "상주시", "문경시", "경산시", "의성군",
+    "청송군", "영양군", "영덕군", "청도군", "고령군", "성주군", "칠곡군", "예천군", "봉화군", "울진군", "울릉군",
+    # 경남
+    "창원시", "진주시", "통영시", "사천시", "김해시", "밀양시", "거제시", "양산시", "의령군", "함안군", "창녕군",
+    "남해군", "하동군", "산청군", "함양군", "거창군", "합천군", "의창구", "성산구", "마산합포구", "마산회원구",
+    "진해구",
+    # 제주
+    "제주시", "서귀포시",
+)
+
+# 시/도 없이 주소를 시작할 수 있는 주요 도로명 (건물번호가 뒤따라야 주소로 인정)
+ROADS = (
+    "세종대로", "종로", "을지로", "퇴계로", "테헤란로", "강남대로", "도산대로", "논현로", "봉은사로", "영동대로",
+    "올림픽로", "한강대로", "여의대로", "국회대로", "양재대로", "남부순환로", "동일로", "도봉로", "마포대로",
+    "월드컵로", "신촌로", "경인로", "시흥대로", "송파대로", "천호대로", "왕산로", "중앙대로", "해운대로",
+    "수영로", "달구벌대로", "동대구로", "인주대로", "경명대로", "상무대로", "계룡로", "한밭대로", "삼산로",
+    "판교역로", "분당수서로", "정자일로", "중부대로", "경수대로", "노형로", "연북로",
+)
+
+# 주소 구성 단계 (앞 단계에서 뒤 단계 순서로만 이어짐)
+LEVEL_SIDO = 0
+LEVEL_SIGUNGU = 1
+LEVEL_DONG = 2
+LEVEL_ROAD = 3
+LEVEL_NUMBER = 4
+LEVEL_DETAIL = 5
+
+# 같은 단계가 반복될 수 있는 최대 횟수 (성남시 분당구, ○○면 ○○리, 101동 202호 등)
+LEVEL_REPEATS = {LEVEL_SIDO: 1, LEVEL_SIGUNGU: 2, LEVEL_DONG: 2, LEVEL_ROAD: 1, LEVEL_NUMBER: 1, LEVEL_DETAIL: 3}
+
+# 사전에 없는 하위 구성 요소 (길이 상한을 두어 후보마다 짧은 범위만 확인)
+DONG_PATTERN = re.compile(r'[가-힣]{1,5}\d{0,3}(?:동|읍|면|리)|[가-힣]{1,4}\d{1,2}가')
+ROAD_PATTERN = re.compile(r'[가-힣\d]{1,10}(?:로|길)')
+NUMBER_PATTERN = re.compile(r'(?:산\s?)?\d{1,5}(?:-\d{1,5})?(?:번지)?(?!\d)')
+DETAIL_PATTERN = re.compile(
+    r'\d{1,4}동|\d{1,5}호|(?:지하\s?)?\d{1,3}층|[가-힣A-Za-z\d]{1,15}(?:아파트|빌라|오피스텔|빌딩|타워|맨션)|\([^()\n]{1,20}\)'
+)
+
+# 읍/면/동 형태지만 일반 단어인 것
+NON_DONGS = frozenset(("이동", "행동", "활동", "운동", "자동", "공동", "출동", "감동", "변동", "작동", "노동", "연동",
+                       "가동", "정면", "측면", "화면", "방면", "전면", "이면", "표면", "장면", "국면", "처리", "관리",
+                       "정리", "거리", "무리", "요리", "논리", "심리", "원리", "대리", "수리", "유리"))
+
+# 구성 요소 사이 구분자 (공백 최대 2자, 쉼표)
+SEPARATOR = re.compile(r',?[ \t]{0,2}')
+
+# 주소 뒤에 붙는 조사/표현 (구성 요소 끝으로 인정)
+TRAILERS = ("에서", "에", "의", "은", "는", "이", "으로", "로", "까지", "부근", "근처", "인근", "쪽", "소재", "거주")
+
+# 우편번호 (01000~63999)
+POSTAL_CODE = re.compile(r'(?<!\d)(?:0[1-9]|[1-5]\d|6[0-3])\d{3}(?!\d)')
+POSTAL_CUE = re.compile(r'우편\s?번호[\s:：]*|\(우\)\s?|우\)\s?|〒\s?')
+POSTAL_BEFORE = re.compile(r'\(?(\d{5})\)?[ \t,]*$')
+POSTAL_AFTER = re.compile(r'[ \t,]*\(?(\d{5})(?!\d)')
+
+ADDRESS_CONFIDENCE = 0.8
+NUMBERED_ADDRESS_CONFIDENCE = 0.9
+POSTAL_CONFIDENCE = 0.9
+
+
+def load_gazetteer(path: str) -> Dict[str, int]:
+    """
+    추가 지명 사전 파일 로드 (한 줄에 지명 하나, #은 주석)
+
+    단계는 끝 글자로 정함: 도/시 → 시/도 또는 시, 군/구 → 시/군/구, 동/읍/면/리/가 → 읍/면/동, 로/길 → 도로명
+    """
+    entries = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        name = line.split("#", 1)[0].strip()
+        if not name:
+            continue
+        if name.endswith(("특별시", "광역시", "특별자치시", "특별자치도", "도")):
+            entries[name] = LEVEL_SIDO
+        elif name.endswith(("시", "군", "구")):
+            entries[name] = LEVEL_SIGUNGU
+        elif name.endswith(("로", "길")):
+            entries[name] = LEVEL_ROAD
+        else:
+            entries[name] = LEVEL_DONG
+    return entries
+
+
+class KoreanAddressDetector:
+    """
+    지명 사전(트라이) 기반 한국어 주소 탐지
+
+    - 주소는 시/도, 시/군/구 또는 주요 도로명에서만 시작 (후보 위치는 컴파일된 문자 클래스로 찾음)
+    - 이후 시/군/구 → 읍/면/동 → 도로명 → 건물번호/지번 → 동/호/층 순서로만 구성 요소를 이어 붙임
+      (구성 요소마다 길이 상한이 있어 텍스트 길이에 선형)
+    - 읍/면/동 또는 도로명 단계까지 이어져야 주소로 보고 (지역명만 언급한 문장은 제외)
+    - 5자리 숫자는 우편번호 표현(우편번호, (우))이 앞에 있거나 주소 바로 앞뒤에 있을 때만 우편번호로 보고
+    """
+
+    def __init__(self, extra_entries: Optional[Dict[str, int]] = None):
+        entries: Dict[str, int] = {}
+        entries.update((name, LEVEL_SIDO) for name in SIDO)
+        entries.update((name, LEVEL_SIGUNGU) for name in SIGUNGU)
+        entries.update((name, LEVEL_ROAD) for name in ROADS)
+        entries.update(extra_entries or {})
+        self.levels = entries
+        self.gazetteer = Trie(entries)
+
+        # 후보 위치: 앞이 한글이 아니고 지명 첫 글자로 시작하는 곳 (지명 앞 두 글자로 트라이 탐색 전에 거름)
+        # (문자 클래스를 앞에 두어 정규식 엔진의 문자 집합 빠른 탐색을 사용하고, 앞 글자는 고정 폭 후방 탐색으로 확인)
+        initials = "".join(sorted(self.gazetteer.root))
+        self._candidates = re.compile("[" + initials + "](?<![가-힣][" + initials + "])")
+        self._prefixes = frozenset(name[:2] for name in entries)
+        self._trailer = re.compile("(?:" + "|".join(sorted(TRAILERS, key=len, reverse=True)) + ")")
+
+    def _ends_word(self, text: str, end: int) -> bool:
+        """구성 요소 뒤가 한글이 아니거나 조사/표현으로 이어지는지"""
+        if end >= len(text) or not _is_hangul(text[end]):
+            return True
+        return self._trailer.match(text, end) is not None
+
+    def _gazetteer_component(self, text: str, position: int, level: int) -> Optional[Tuple[int, int]]:
+        """position에서 시작하는 가장 긴 사전 지명 중 level 이후 단계인 것 (끝 위치, 단계)"""
+        ends = list(self.gazetteer.match_ends(text, position))
+        for end in reversed(ends):
+            component_level = self.levels[text[position:end]]
+            if component_level >= level:
+                return end, component_level
+        return None
+
+    def _component(self, text: str, position: int, level: int) -> Optional[Tuple[int, int, bool]]:
+        """position에서 시작하는 level 이후 단계의 가장 긴 구성 요소 (끝 위치, 단계, 사전 지명 여부)"""
+        best = None
+        found = self._gazetteer_component(text, position, level)
+        if found:
+            best = (found[0], found[1], True)
+        structural = []
+        if level <= LEVEL_DONG:
+            structural.append((DONG_PATTERN, LEVEL_DONG))
+        if level <= LEVEL_ROAD:
+            structural.append((ROAD_PATTERN, LEVEL_ROAD))
+        if LEVEL_DONG <= level <= LEVEL_NUMBER:
+            structural.append((NUMBER_PATTERN, LEVEL_NUMBER))
+        if level >= LEVEL_NUMBER:
+            structural.append((DETAIL_PATTERN, LEVEL_DETAIL))
+        for pattern, component_level in structural:
+            match = pattern.match(text, position)
+            if match and (best is None or match.end() > best[0]):
+                if component_level == LEVEL_DONG and match.group() in NON_DONGS:
+                    continue
+                best = (match.end(), component_level, False)
+        return best
+
+    def _parse(self, text: str, start: int) -> Optional[Tuple[int, int, float]]:
+        """start에서 시작하는 주소 (start, end, confidence) 또는 None"""
+        # 첫 구성 요소는 사전 지명 (시/도, 시/군/구, 주요 도로명)
+        first = self._gazetteer_component(text, start, LEVEL_SIDO)
+        if first is None:
+            return None
+        end, level = first
+        if not self._ends_word(text, end) and self._component(text, end, level) is None:
+            return None  # 서울대학교처럼 더 긴 단어의 앞부분
+        anchored = level < LEVEL_ROAD
+        deepest = level
+        repeats = 1
+        numbered = False
+        gazetteer_road = level == LEVEL_ROAD
+        length = len(text)
+        while True:
+            position = SEPARATOR.match(text, end).end()
+            if position >= length:
+                break
+            component = self._component(text, position, level)
+            if component is None:
+                break
+            component_end, component_level, from_gazetteer = component
+            if component_level == level:
+                if repeats >= LEVEL_REPEATS[level]:
+                    break
+                repeats += 1
+            else:
+                repeats = 1
+            # 구성 요소 뒤에 한글이 바로 이어지면 다음 구성 요소가 붙어 있는 경우만 인정 (강남구역삼동)
+            if not self._ends_word(text, component_end) and (
+                    component_level >= LEVEL_NUMBER or self._component(text, component_end, component_level) is None):
+                break
+            level = component_level
+            deepest = max(deepest, component_level)
+            numbered = numbered or component_level >= LEVEL_NUMBER
+            if component_level == LEVEL_ROAD:
+                gazetteer_road = from_gazetteer
+            end = component_end
+
+        # 읍/면/동이 있거나, 도로명은 사전 도로명(시/도·시/군/구 뒤)이거나 건물번호가 있을 때만 주소
+        if deepest < LEVEL_DONG:
+            return None
+        if deepest >= LEVEL_ROAD and not numbered and not (anchored and gazetteer_road):
+            return None
+        confidence = NUMBERED_ADDRESS_CONFIDENCE if numbered else ADDRESS_CONFIDENCE
+        return start, end, confidence
+
+    def _postal_codes(self, text: str, addresses: List[Tuple[int, int, float]]) -> List[Tuple[int, int, float]]:
+        """우편번호 표현 뒤 또는 주소 바로 앞/뒤의 5자리 우편번호"""
+        found = {}
+        for cue in POSTAL_CUE.finditer(text):
+            match = POSTAL_CODE.match(text, cue.end())
+            if match:
+                found[match.start()] = (match.start(), match.end(), POSTAL_CONFIDENCE)
+        for start, end, _ in addresses:
+            before = POSTAL_BEFORE.search(text, max(0, start - 10), start)
+            if before:
+                offset = before.start(1)
+                if POSTAL_CODE.fullmatch(before.group(1)) and (offset == 0 or not text[offset - 1].isdigit()):
+                    found[offset] = (offset, offset + 5, POSTAL_CONFIDENCE)
+            after = POSTAL_AFTER.match(text, end)
+            if after and POSTAL_CODE.fullmatch(after.group(1)):
+                found[after.start(1)] = (after.start(1), after.end(1), POSTAL_CONFIDENCE)
+        return [found[key] for key in sorted(found)]
+
+    def find(self, text: str) -> List[Tuple[int, int, float]]:
+        """(start, end, confidence) 리스트 (주소, 우편번호 - 위치 순, 겹치지 않음)"""
+        addresses = []
+        last_end = 0
+        prefixes = self._prefixes
+        for candidate in self._candidates.finditer(text):
+            position = candidate.start()
+            if position < last_end or text[position:position + 2] not in prefixes:
+                continue
+            address = self._parse(text, position)
+            if address:
+                addresses.append(address)
+                last_end = address[1]
+        postal = [code for code in self._postal_codes(text, addresses)
+                  if not any(start <= code[0] < end for start, end, _ in addresses)]
+        return sorted(addresses + postal)
+
+
+_default_detector: Optional[KoreanAddressDetector] = None
+
+
+def default_address_detector() -> KoreanAddressDetector:
+    """내장 지명 사전으로 만든 공용 주소 탐지기 (트라이는 읽기 전용이라 스레드 간 공유)"""
+    global _default_detector
+    if _default_detector is None:
+        _default_detector = KoreanAddressDetector()
+    return _default_detector
+
+
+def address_detector(gazetteer_path: Optional[str] = None) -> KoreanAddressDetector:
+    """추가 지명 사전 파일이 있으면 내장 사전에 더한 탐지기, 없으면 공용 탐지기"""
+    if not gazetteer_path:
+        return default_address_detector()
+    return KoreanAddressDetector(load_gazetteer(gazetteer_path))
@@ -0,0 +1,95 @@
+# pii_guard/admission.py
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+# 처리 방식
+MODE_FULL = "full"              # RegEx + LLM
+MODE_REGEX_ONLY = "regex_only"  # LLM 과부하로 RegEx만 사용
+
+
+class OverloadedError(Exception):
+    """대기 중인 요청이 한도를 넘어 새 요청을 받을 수 없음 (HTTP 429)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server overloaded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    워커 단위 요청 수락 제어
+
+    - 처리 중/대기 중인 요청이 max_pending 이상이면 거절 (OverloadedError)
+    - LLM 대기열 길이나 처리 지연이 임계값을 넘으면 RegEx 전용으로 처리
+      (대기열 길이는 호출하는 쪽에서 요청 우선순위 이상의 대기만 세어 넘기고, 적재 요청은 별도 임계값 사용)
+      (지연 기준으로 RegEx 전용인 동안 probe_interval마다 한 요청은 LLM으로 보내 지연을 다시 측정 - 반개방 시험)
+    - 그 외에는 RegEx + LLM으로 처리
+
+    이벤트 루프 안에서만 호출되므로 별도 잠금을 사용하지 않음
+    """
+
+    def __init__(self, max_pending: int = 64, degrade_queue_depth: int = 8,
+                 degrade_latency: float = 5.0, retry_after: float = 1.0, probe_interval: float = 2.0,
+                 degrade_background_queue_depth: int = 32):
+        self.max_pending = max_pending
+        self.degrade_queue_depth = degrade_queue_depth  # LLM 대기열 임계값 (0이면 사용 안 함)
+        self.degrade_background_queue_depth = degrade_background_queue_depth  # 적재(백그라운드) 요청의 대기열 임계값
+        self.degrade_latency = degrade_latency          # LLM 처리 지연 임계값(초, 0이면 사용 안 함)
+        self.retry_after = retry_after
+        self.probe_interval = probe_interval            # 지연 기준 RegEx 전용 중 LLM 시험 요청 간격(초, 0이면 사용 안 함)
+        self._last_probe: Optional[float] = None
+        self.pending = 0
+        self.admitted = 0
+        self.degraded = 0
+        self.rejected = 0
+        self.probes = 0
+
+    def decide(self, llm_queue_depth: int = 0, llm_latency: float = 0.0, background: bool = False) -> str:
+        """새 요청의 처리 방식 결정 (한도 초과시 OverloadedError)"""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise OverloadedError(self._retry_after(llm_latency))
+        queue_threshold = self.degrade_background_queue_depth if background else self.degrade_queue_depth
+        if queue_threshold and llm_queue_depth >= queue_threshold:
+            return MODE_REGEX_ONLY
+        if self.degrade_latency and llm_latency >= self.degrade_latency:
+            # 지연 EWMA는 LLM 요청이 끝날 때만 갱신되므로 가끔 LLM을 시험해야 RegEx 전용에서 벗어날 수 있음
+            now = time.monotonic()
+            if self._last_probe is None:
+                self._last_probe = now
+            elif self.probe_interval and now - self._last_probe >= self.probe_interval:
+                self._last_probe = now
+                self.probes += 1
+                return MODE_FULL
+            return MODE_REGEX_ONLY
+        self._last_probe = None
+        return MODE_FULL
+
+    def _retry_after(self, llm_latency: float) -> int:
+        """Retry-After 초 (설정값과 현재 LLM 처리 지연 중 큰 값, 최소 1초)"""
+        return max(1, math.ceil(max(self.retry_after, llm_latency)))
+
+    @contextmanager
+    def admit(self, llm_queue_depth: int = 0, llm_latency: float = 0.0, background: bool = False):
+        """요청을 수락하고 처리 방식을 반환, 블록이 끝나면 대기 수에서 제외"""
+        mode = self.decide(llm_queue_depth, llm_latency, background)
+        self.pending += 1
+        self.admitted += 1
+        if mode == MODE_REGEX_ONLY:
+            self.degraded += 1
+        try:
+            yield mode
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "admitted": self.admitted,
+            "degraded": self.degraded,
+            "rejected": self.rejected,
+            "probes": self.probes
+        }
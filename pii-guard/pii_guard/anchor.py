@@ -0,0 +1,107 @@
+# pii_guard/anchor.py
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Any, Tuple
+
+
+class AhoCorasick:
+    """다중 문자열 동시 검색 오토마톤 (텍스트 한 번 순회로 모든 패턴의 모든 출현 위치 탐색)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = [pattern for pattern in patterns if pattern]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        # 너비 우선으로 실패 링크 구성
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """(start, end, 패턴 인덱스)를 끝 위치 순서로 반환 (겹치는 출현 포함)"""
+        state = 0
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                end = position + 1
+                yield end - len(self.patterns[index]), end, index
+
+
+def _is_boundary(text: str, start: int, end: int, value: str) -> bool:
+    """숫자/영문으로 시작·끝나는 값은 더 긴 숫자/영문 토큰의 일부가 아니어야 함"""
+    if value[0].isascii() and value[0].isalnum() and start > 0:
+        before = text[start - 1]
+        if before.isascii() and before.isalnum():
+            return False
+    if value[-1].isascii() and value[-1].isalnum() and end < len(text):
+        after = text[end]
+        if after.isascii() and after.isalnum():
+            return False
+    return True
+
+
+def anchor_llm_results(text: str, results: List[Dict[str, Any]], min_length: int = 2) -> List[Dict[str, Any]]:
+    """
+    LLM이 보고한 값들을 원문에서 한 번에 찾아 정확한 위치를 부여
+
+    - 값이 여러 번 나오면 모든 출현 위치에 대해 결과를 생성
+    - 원문에 없는 값(환각)이나 min_length보다 짧은 값은 제외
+    - LLM이 보고한 start/end는 사용하지 않음
+
+    Returns:
+        start/end가 원문 기준으로 보정된 결과 리스트 (위치 순 정렬, 같은 유형·위치 중복 제거)
+    """
+    by_value: Dict[str, List[Dict[str, Any]]] = {}
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        value = result.get('value')
+        if not isinstance(value, str):
+            continue
+        value = value.strip()
+        if len(value) < min_length:
+            continue
+        by_value.setdefault(value, []).append(result)
+
+    if not by_value:
+        return []
+
+    automaton = AhoCorasick(by_value.keys())
+    anchored: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+    for start, end, index in automaton.finditer(text):
+        value = automaton.patterns[index]
+        if not _is_boundary(text, start, end, value):
+            continue
+        for result in by_value[value]:
+            key = (str(result.get('type', '')).upper(), start, end)
+            existing = anchored.get(key)
+            if existing is None or result.get('confidence', 0) > existing.get('confidence', 0):
+                anchored[key] = {**result, "value": value, "start": start, "end": end}
+
+    return sorted(anchored.values(), key=lambda x: (x["start"], x["end"]))
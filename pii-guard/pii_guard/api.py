@@ -1,13 +1,155 @@
 # pii_guard/api.py
-from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager, nullcontext
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, RedirectResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
-from .guard import guard_answer, scrub_ingest
+from .guard import guard_answer, scrub_ingest, scrub_ingest_batch
 from .detector import PIIDetector
+from .incremental import DocumentStore, rescrub_ingest
+from .dedupe import ChunkCache
+from .fingerprint import FingerprintIndex
+from .singleflight import SingleFlight
+from .admission import AdmissionController, OverloadedError, MODE_REGEX_ONLY
+from .scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, current_priority, skip_llm
+from .health import HealthMonitor
+from .serialization import render
+from .sdk import detector_from_settings
+from .tracing import TraceExporter, current_trace, span, start_trace
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스별 PII 탐지기 인스턴스 (fork 이후 lifespan에서 생성)
+detector: Optional[PIIDetector] = None
+_detector_lock = threading.Lock()
+
+# 증분 재스크럽용 이전 문서 버전 보관소 (워커 프로세스별)
+document_store = DocumentStore(max_documents=get_settings().rescrub_max_documents)
+
+# 적재 문단 중복 제거용 결과 캐시 (워커 프로세스별, 배치 간 공유)
+chunk_cache = ChunkCache(max_entries=get_settings().chunk_cache_max_entries) if get_settings().ingest_dedupe else None
+
+# 적재 시 마스킹한 PII 지문 인덱스 (파일로 워커 간 주기적 동기화)
+fingerprint_index: Optional[FingerprintIndex] = None
+if get_settings().fingerprint_enabled:
+    _fingerprint_salt = get_settings().fingerprint_salt
+    if not _fingerprint_salt:
+        import secrets
+        logger.warning("PII_GUARD_FINGERPRINT_SALT is not set; fingerprints are limited to this worker process")
+        _fingerprint_salt = secrets.token_hex(16)
+    fingerprint_index = FingerprintIndex(_fingerprint_salt)
+
+# 동일 답변 동시 가드 요청 합치기 (워커 이벤트 루프 단위)
+guard_flight = SingleFlight()
+
+# 과부하 시 RegEx 전용 처리/요청 거절 (워커 프로세스별)
+admission = AdmissionController(
+    max_pending=get_settings().max_pending_requests,
+    degrade_queue_depth=get_settings().degrade_queue_depth,
+    degrade_background_queue_depth=get_settings().degrade_background_queue_depth,
+    degrade_latency=get_settings().degrade_latency_ms / 1000,
+    retry_after=get_settings().retry_after,
+    probe_interval=get_settings().degrade_probe_interval_ms / 1000
+)
+
+# 워커당 동시 탐지 작업 수 제한 (이벤트 루프별로 lifespan에서 생성)
+_request_semaphore: Optional[asyncio.Semaphore] = None
+
+# 백그라운드 헬스 체크 결과 (lifespan에서 생성)
+health_monitor: Optional[HealthMonitor] = None
+
+# 요청별 단계 처리 시간 기록 파일 (경로 지정시, JSON Lines)
+trace_exporter: Optional[TraceExporter] = TraceExporter(get_settings().trace_path) if get_settings().trace_path else None
+
+
+def get_detector() -> PIIDetector:
+    """현재 워커의 PII 탐지기 반환 (없으면 한 번만 생성)"""
+    global detector
+    if detector is None:
+        with _detector_lock:
+            if detector is None:
+                detector = detector_from_settings(get_settings())
+    return detector
+
+
+def sync_fingerprints(force: bool = False) -> None:
+    """지문 인덱스를 공유 파일과 동기화 (주기가 지났을 때만)"""
+    if fingerprint_index is None:
+        return
+    settings = get_settings()
+    if force and settings.fingerprint_path:
+        fingerprint_index.sync(settings.fingerprint_path)
+    else:
+        fingerprint_index.maybe_sync(settings.fingerprint_path, settings.fingerprint_sync_interval)
+
+
+def _run_and_sync(func, regex_only, *args):
+    with skip_llm() if regex_only else nullcontext():
+        result = func(*args)
+    sync_fingerprints()
+    return result
+
+
+def _llm_load(priority: int = PRIORITY_INTERACTIVE):
+    """(priority 이상 우선순위의 LLM 대기열 길이, LLM 처리 지연 초) - LLM 미사용시 (0, 0)"""
+    if detector is None or detector.llm_client is None:
+        return 0, 0.0
+    scheduler = detector.llm_client.scheduler
+    return scheduler.queue_depth(priority), scheduler.latency
+
+
+async def run_detection(func, *args, priority: int = PRIORITY_INTERACTIVE):
+    """
+    동기 탐지 함수를 스레드풀에서 실행 (동시 실행 수 제한)
+
+    LLM이 밀려 있으면 RegEx 전용으로 처리하고 결과에 degraded 표시,
+    대기 요청이 한도를 넘으면 OverloadedError (429)
+    /guard는 자기 앞에 설 대기(대화형)만 세므로 대량 적재 대기열로 저하되지 않음
+    """
+    with admission.admit(*_llm_load(priority), background=priority >= PRIORITY_BACKGROUND) as mode:
+        regex_only = mode == MODE_REGEX_ONLY
+        if _request_semaphore is None:
+            result = await run_in_threadpool(_run_and_sync, func, regex_only, *args)
+        else:
+            with span("queue"):
+                await _request_semaphore.acquire()
+            try:
+                result = await run_in_threadpool(_run_and_sync, func, regex_only, *args)
+            finally:
+                _request_semaphore.release()
+    result["degraded"] = regex_only
+    for item in result.get("results", []):
+        item["degraded"] = regex_only
+    return result
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """워커 시작 시 탐지기를 미리 생성하여 첫 요청 지연 방지"""
+    global _request_semaphore, health_monitor
+    settings = get_settings()
+    _request_semaphore = asyncio.Semaphore(settings.max_concurrent_requests)
+    await run_in_threadpool(get_detector)
+    logger.info(f"PII detector warmed up (llm_enabled={detector.use_llm})")
+    await run_in_threadpool(sync_fingerprints, True)
+
+    health_monitor = HealthMonitor(detector, interval=settings.health_interval, llm_timeout=settings.health_timeout)
+    await run_in_threadpool(health_monitor.probe)
+    health_task = asyncio.create_task(health_monitor.run())
+    yield
+    health_task.cancel()
+    await run_in_threadpool(sync_fingerprints, True)
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="PII Guard API",
     description="""
     ## RAG 챗봇용 PII 탐지 및 마스킹 서비스
@@ -54,8 +196,35 @@ app = FastAPI(
     ]
 )
 
-# 전역 PII 탐지기 인스턴스 (LLM 활성화)
-detector = PIIDetector(use_llm=True)
+@app.exception_handler(OverloadedError)
+async def overloaded_handler(request: Request, exc: OverloadedError):
+    """대기 요청 한도 초과시 429 + Retry-After"""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many pending requests", "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """요청별 단계 처리 시간 기록 → Server-Timing 헤더 (설정으로 켰거나 ?debug=true 요청) / 추적 파일"""
+    with start_trace(request.url.path) as trace:
+        response = await call_next(request)
+    debug = request.query_params.get("debug", "").lower() in ("1", "true", "yes", "on")
+    if debug or get_settings().server_timing:
+        response.headers["Server-Timing"] = trace.server_timing()
+    if trace_exporter is not None:
+        await run_in_threadpool(trace_exporter.export, trace, method=request.method, status=response.status_code)
+    return response
+
+
+def respond(result: Dict[str, Any], http_request: Request, model, debug: bool = False):
+    """탐지 결과 응답 (debug 요청시 단계별 처리 시간 debug.timings 포함)"""
+    trace = current_trace()
+    if debug and trace is not None:
+        result = {**result, "debug": {"timings": trace.timings(), "elapsed_ms": trace.elapsed_ms()}}
+    return render(result, http_request.headers.get("accept"), model)
 
 
 class GuardRequest(BaseModel):
@@ -72,7 +241,7 @@ class PIIMatchInfo(BaseModel):
     value: str = Field(..., title="원본 값", description="탐지된 PII의 원본 값")
     span: List[int] = Field(..., title="위치", description="텍스트 내 PII의 시작/끝 위치 [start, end]")
     confidence: float = Field(..., title="신뢰도", description="탐지 신뢰도 (0.0-1.0)", ge=0.0, le=1.0)
-    source: str = Field(..., title="탐지 방식", description="탐지 방식 (regex 또는 llm)")
+    source: str = Field(..., title="탐지 방식", description="탐지 방식 (regex, llm 또는 적재 지문 조회 fingerprint)")
 
 
 class PromptInjectionInfo(BaseModel):
@@ -134,6 +303,21 @@ class GuardResponse(BaseModel):
             "details": "Role manipulation detected: '너는 이제 내 비서야'"
         }
     )
+    known_pii_leak: bool = Field(
+        False,
+        title="알려진 PII 유출",
+        description="적재 단계에서 마스킹한 PII 값이 답변에 포함되었는지 여부 (지문 인덱스 사용시)"
+    )
+    early_exit: bool = Field(
+        False,
+        title="조기 차단",
+        description="차단이 확정되어 남은 LLM 탐지 단계를 생략했는지 여부 (PII_GUARD_GUARD_EARLY_EXIT 사용시)"
+    )
+    degraded: bool = Field(
+        False,
+        title="성능 저하 처리",
+        description="LLM 과부하로 RegEx만 사용하여 탐지했는지 여부"
+    )
 
 
 class ScrubRequest(BaseModel):
@@ -145,6 +329,14 @@ class ScrubRequest(BaseModel):
     )
 
 
+class DedupeInfo(BaseModel):
+    chunks: int = Field(..., title="문단 수", description="분할된 전체 문단 수", ge=0)
+    unique_chunks: int = Field(..., title="신규 문단 수", description="새로 탐지한 문단 수", ge=0)
+    reused_chunks: int = Field(..., title="재사용 문단 수", description="이전 결과를 재사용한 문단 수", ge=0)
+    dedupe_ratio: float = Field(..., title="중복 제거율", description="재사용 문단 비율 (0.0-1.0)", ge=0.0, le=1.0)
+    reused_char_ratio: float = Field(..., title="재사용 문자 비율", description="재사용 문단이 차지하는 문자 비율 (0.0-1.0)", ge=0.0, le=1.0)
+
+
 class ScrubResponse(BaseModel):
     scrubbed: str = Field(
         ...,
@@ -180,6 +372,65 @@ class ScrubResponse(BaseModel):
             }
         ]
     )
+    dedupe: Optional[DedupeInfo] = Field(
+        None,
+        title="문단 중복 제거 통계",
+        description="반복 문단(머리말/꼬리말 등) 결과 재사용 통계 (중복 제거 사용시)"
+    )
+    degraded: bool = Field(
+        False,
+        title="성능 저하 처리",
+        description="LLM 과부하로 RegEx만 사용하여 탐지했는지 여부"
+    )
+
+
+class ScrubBatchRequest(BaseModel):
+    texts: List[str] = Field(
+        ...,
+        title="텍스트 목록",
+        description="PII 마스킹 처리할 원본 콘텐츠 텍스트 목록",
+        example=["문의: help@bank.com\n\n고객 연락처 010-9876-5432", "문의: help@bank.com\n\n본문"]
+    )
+
+
+class ScrubBatchResponse(BaseModel):
+    results: List[ScrubResponse] = Field(..., title="문서별 결과", description="요청 순서와 동일한 문서별 마스킹 결과")
+    dedupe: DedupeInfo = Field(..., title="배치 중복 제거 통계", description="배치 전체 문단 중복 제거 통계")
+    degraded: bool = Field(
+        False,
+        title="성능 저하 처리",
+        description="LLM 과부하로 RegEx만 사용하여 탐지했는지 여부"
+    )
+
+
+class RescrubRequest(BaseModel):
+    doc_id: str = Field(
+        ...,
+        title="문서 ID",
+        description="지식베이스 문서 식별자 (이전 스크럽 버전과 비교하는 키)",
+        example="kb-2024-0001"
+    )
+    text: str = Field(
+        ...,
+        title="텍스트",
+        description="수정된 문서 전체 텍스트",
+        example="고객 박영희님의 연락처는 010-9876-5432이며, 서울시 강남구 역삼동에 거주합니다."
+    )
+
+
+class RescrubResponse(ScrubResponse):
+    doc_id: str = Field(..., title="문서 ID", description="요청한 문서 식별자")
+    incremental: bool = Field(
+        ...,
+        title="증분 처리 여부",
+        description="이전 버전과 비교하여 변경 구간만 다시 탐지했는지 여부 (이전 버전이 없으면 전체 스크럽)"
+    )
+    redetected_spans: List[List[int]] = Field(
+        ...,
+        title="재탐지 구간",
+        description="새 텍스트 기준으로 다시 탐지한 구간 목록 [start, end]"
+    )
+    redetected_chars: int = Field(..., title="재탐지 문자 수", description="다시 탐지한 전체 문자 수", ge=0)
 
 
 @app.get("/", include_in_schema=False)
@@ -197,10 +448,13 @@ async def api_info():
         "service": "PII Guard API",
         "version": "1.0.0",
         "description": "RAG 챗봇용 PII 탐지 및 마스킹 서비스",
-        "llm_enabled": detector.use_llm,
+        "llm_enabled": get_detector().use_llm,
         "endpoints": {
             "/guard": "LLM 답변 PII 가드 및 마스킹",
             "/ingest/scrub": "데이터 적재용 PII 사전 마스킹",
+            "/ingest/scrub/batch": "데이터 적재용 PII 일괄 마스킹",
+            "/ingest/rescrub": "수정된 문서 증분 PII 마스킹",
+            "/metrics": "처리 지표",
             "/health": "서비스 헬스체크"
         },
         "supported_pii_types": ["PHONE", "EMAIL", "CARD", "RRN", "ACCOUNT", "NAME", "ADDRESS", "ID_NUMBER"],
@@ -301,10 +555,21 @@ async def api_info():
                   }
               }
           })
-async def guard_llm_answer(request: GuardRequest) -> GuardResponse:
+async def guard_llm_answer(request: GuardRequest, http_request: Request, debug: bool = False) -> GuardResponse:
     """LLM 답변에서 PII 탐지 및 가드 처리"""
-    result = guard_answer(request.text, detector)
-    return GuardResponse(**result)
+    early_exit = get_settings().guard_early_exit
+
+    def run():
+        return run_detection(guard_answer, request.text, get_detector(), fingerprint_index, early_exit)
+
+    if debug:
+        # 디버그 요청은 자기 실행의 단계별 처리 시간을 받아야 하므로 합치지 않음
+        result = await run()
+    else:
+        # 같은 답변이 같은 옵션으로 동시에 들어오면 한 번만 처리하고 결과를 공유 (결과에 영향을 주는 옵션은 모두 키에 포함)
+        key = guard_flight.make_key("guard", request.text, early_exit, current_priority(), fingerprint_index is not None)
+        result = await guard_flight.do(key, run)
+    return respond(result, http_request, GuardResponse, debug)
 
 
 @app.post("/ingest/scrub",
@@ -350,38 +615,106 @@ async def guard_llm_answer(request: GuardRequest) -> GuardResponse:
                   }
               }
           })
-async def scrub_ingest_data(request: ScrubRequest) -> ScrubResponse:
+async def scrub_ingest_data(request: ScrubRequest, http_request: Request, debug: bool = False) -> ScrubResponse:
     """데이터 적재(ingest) 단계에서 PII 사전 마스킹 처리"""
-    result = scrub_ingest(request.text, detector)
-    return ScrubResponse(**result)
+    result = await run_detection(scrub_ingest, request.text, get_detector(), chunk_cache, fingerprint_index,
+                                 priority=PRIORITY_BACKGROUND)
+    return respond(result, http_request, ScrubResponse, debug)
+
+
+@app.post("/ingest/scrub/batch",
+          response_model=ScrubBatchResponse,
+          summary="데이터 적재용 PII 일괄 마스킹",
+          description="""
+          여러 문서를 한 번에 사전 마스킹합니다.
+
+          **중복 제거:**
+          - 각 문서를 빈 줄 기준 문단으로 나누고 문단 내용의 해시로 탐지 결과를 캐시
+          - 배치 안, 그리고 이전 배치에서 이미 처리한 문단(머리말, 꼬리말, 고지문 등)은 다시 탐지하지 않음
+          - 응답의 `dedupe`로 재사용 비율 확인
+          """,
+          tags=["데이터 전처리"])
+async def scrub_ingest_batch_data(request: ScrubBatchRequest, http_request: Request,
+                                  debug: bool = False) -> ScrubBatchResponse:
+    """여러 문서의 PII 일괄 사전 마스킹 (반복 문단 결과 재사용)"""
+    result = await run_detection(scrub_ingest_batch, request.texts, get_detector(), chunk_cache, fingerprint_index,
+                                 priority=PRIORITY_BACKGROUND)
+    return respond(result, http_request, ScrubBatchResponse, debug)
+
+
+@app.post("/ingest/rescrub",
+          response_model=RescrubResponse,
+          summary="수정된 문서 증분 PII 마스킹",
+          description="""
+          이전에 스크럽한 같은 문서(`doc_id`)와 비교하여 변경된 부분만 다시 탐지합니다.
+
+          **처리 방식:**
+          - 줄 단위 diff로 변경 구간을 찾고 앞뒤 여유 구간을 포함하여 재탐지
+          - 변경되지 않은 구간의 기존 매치는 새 위치로 이동하여 재사용
+          - 이전 버전이 없으면 전체 스크럽 후 다음 요청을 위해 저장
+
+          이전 버전은 워커 프로세스 메모리에 보관되므로, 다른 워커로 요청이 가면 전체 스크럽으로 처리됩니다.
+          """,
+          tags=["데이터 전처리"])
+async def rescrub_ingest_data(request: RescrubRequest, http_request: Request, debug: bool = False) -> RescrubResponse:
+    """수정된 문서의 변경 구간만 PII 재탐지 및 마스킹"""
+    result = await run_detection(rescrub_ingest, request.doc_id, request.text, get_detector(), document_store,
+                                 1, fingerprint_index, priority=PRIORITY_BACKGROUND)
+    return respond(result, http_request, RescrubResponse, debug)
+
+
+@app.get("/metrics",
+         summary="처리 지표",
+         description="요청 합치기, 캐시 등 워커 프로세스의 처리 지표를 반환합니다.",
+         tags=["모니터링"])
+async def metrics():
+    """워커 처리 지표"""
+    return {
+        "admission": admission.stats(),
+        "guard_singleflight": guard_flight.stats(),
+        "chunk_cache": chunk_cache.stats() if chunk_cache is not None else None,
+        "verdict_cache": (
+            detector.llm_detector.cache.stats()
+            if detector is not None and detector.llm_detector is not None and detector.llm_detector.cache is not None
+            else None
+        ),
+        "llm_batching": (
+            detector.llm_detector.batcher.stats()
+            if detector is not None and detector.llm_detector is not None and detector.llm_detector.batcher is not None
+            else None
+        ),
+        "injection_prefilter": (
+            detector.injection_prefilter.stats()
+            if detector is not None and detector.injection_prefilter is not None
+            else None
+        ),
+        "llm_scheduler": (
+            detector.llm_client.scheduler.stats()
+            if detector is not None and detector.llm_client is not None
+            else None
+        ),
+        "regex_backend": (
+            {"name": detector.regex_backend.name, "timeouts": getattr(detector.regex_backend, "timeouts", 0)}
+            if detector is not None
+            else None
+        ),
+        "fingerprints": len(fingerprint_index) if fingerprint_index is not None else None,
+        "documents": len(document_store)
+    }
 
 
 @app.get("/health",
          summary="헬스 체크",
-         description="서비스의 상태와 PII 탐지기 준비 상태를 확인합니다.",
+         description="서비스의 상태와 PII 탐지기 준비 상태를 확인합니다. 상태는 백그라운드에서 주기적으로 확인한 결과입니다.",
          tags=["모니터링"])
 async def health_check():
-    """서비스 헬스체크"""
-    try:
-        # PII 탐지기 동작 테스트
-        test_result = detector.detect_pii("테스트 010-1234-5678")
-        detector_status = "ready" if len(test_result) > 0 else "warning"
-
-        # LLM 상태 확인
-        llm_status = "enabled" if detector.use_llm else "disabled"
-        if detector.use_llm and detector.llm_client:
-            try:
-                # 간단한 LLM 테스트
-                injection_test = detector.detect_prompt_injection("안녕하세요")
-                llm_status = "ready"
-            except:
-                llm_status = "error"
-    except Exception:
-        detector_status = "error"
-        llm_status = "error"
+    """서비스 헬스체크 (백그라운드 프로브의 마지막 결과를 즉시 반환)"""
+    state = health_monitor.snapshot() if health_monitor is not None else HealthMonitor.empty_snapshot()
+    detector_status = state["detector_status"]
+    llm_status = state["llm_status"]
 
     return {
-        "status": "healthy",
+        "status": "unhealthy" if detector_status == "error" else "healthy",
         "service": "pii-guard",
         "version": "1.0.0",
         "detector_status": detector_status,
@@ -389,13 +722,20 @@ async def health_check():
         "features": {
             "regex_detection": "enabled",
             "llm_detection": llm_status,
-            "prompt_injection_defense": llm_status,
+            "prompt_injection_defense": (
+                "enabled" if detector is not None and detector.injection_prefilter is not None else llm_status
+            ),
             "hybrid_matching": "enabled"
         },
-        "timestamp": "2024-01-01T00:00:00Z"
+        "last_checked": state["checked_at"],
+        "check_age_seconds": state["age_seconds"],
+        "consecutive_failures": state["consecutive_failures"],
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
     }
 
 
 if __name__ == "__main__":
+    # 개발용 단일 프로세스 실행 (운영 환경은 python -m pii_guard.server 사용)
     import uvicorn
-    uvicorn.run("pii_guard.api:app", host="0.0.0.0", port=3000, reload=True)
+    settings = get_settings()
+    uvicorn.run("pii_guard.api:app", host=settings.host, port=settings.port, reload=True)
@@ -0,0 +1,137 @@
+# pii_guard/batching.py
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .llm_client import estimate_tokens
+from .scheduler import current_priority, llm_priority
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingItem:
+    def __init__(self, text: str, cache_key: Optional[str], priority: int):
+        self.text = text
+        self.cache_key = cache_key
+        self.priority = priority
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class LLMBatcher:
+    """짧은 시간 창 안에 들어온 PII 탐지 요청을 하나의 다중 항목 프롬프트로 묶어 처리"""
+
+    def __init__(self, llm_detector, max_batch_size: int = 8, max_delay: float = 0.01,
+                 max_batch_tokens: int = 3000, max_concurrency: int = 2):
+        self.llm_detector = llm_detector
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay  # 배치를 채우기 위해 첫 요청을 붙잡아 두는 최대 시간(초)
+        self.max_batch_tokens = max_batch_tokens  # 배치 프롬프트 입력 토큰 예산
+
+        self._queue: "queue.Queue[_PendingItem]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm-batch")
+        self._arrival_interval = max_delay * 2  # 요청 간격 EWMA (적응형 대기 판단용)
+        self._last_arrival = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.batched_items = 0
+        self.fallback_items = 0
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="llm-batcher", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, text: str) -> List[Dict[str, Any]]:
+        """PII 탐지 요청을 배치 큐에 넣고 결과를 기다림 (detect_pii_sync와 같은 형식)"""
+        cache_key = self.llm_detector._cache_key("pii", text)
+        cached = self.llm_detector._cache_get(cache_key, text)
+        if cached is not None:
+            return cached
+
+        now = time.monotonic()
+        with self._lock:
+            self._arrival_interval = 0.8 * self._arrival_interval + 0.2 * (now - self._last_arrival)
+            self._last_arrival = now
+
+        item = _PendingItem(text, cache_key, current_priority())
+        self._queue.put(item)
+        return item.future.result()
+
+    def _should_wait(self) -> bool:
+        """최근 요청 간격이 대기 시간보다 짧을 때만 배치를 채우려고 기다림 (한가할 때는 즉시 전송)"""
+        return self._arrival_interval < self.max_delay
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            batch = [first]
+            tokens = estimate_tokens(first.text)
+            deadline = first.enqueued_at + self.max_delay
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic() if self._should_wait() else 0
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                item_tokens = estimate_tokens(item.text)
+                if tokens + item_tokens > self.max_batch_tokens:
+                    # 예산 초과 항목은 다음 배치의 첫 항목으로 처리
+                    self._executor.submit(self._run_batch, batch)
+                    batch, tokens = [item], item_tokens
+                    deadline = item.enqueued_at + self.max_delay
+                    continue
+                batch.append(item)
+                tokens += item_tokens
+
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_single(self, item: _PendingItem) -> None:
+        try:
+            with llm_priority(item.priority):
+                result = self.llm_detector.detect_pii_sync(item.text)
+            item.future.set_result(result)
+        except Exception as e:
+            item.future.set_exception(e)
+
+    def _run_batch(self, batch: List[_PendingItem]) -> None:
+        if len(batch) == 1:
+            self._run_single(batch[0])
+            return
+
+        items: List[Tuple[str, str]] = [(str(index + 1), item.text) for index, item in enumerate(batch)]
+        system_prompt, user_prompt = self.llm_detector.create_batch_pii_detection_prompt(items)
+        client = self.llm_detector.client
+        try:
+            # 배치 안에 대화형 요청이 있으면 배치 전체를 그 우선순위로 처리
+            response = client.generate_sync(user_prompt, system_prompt,
+                                            num_predict=client.num_predict * len(batch),
+                                            priority=min(item.priority for item in batch))
+            parsed = self.llm_detector._parse_batch_pii_response(response) or {}
+        except Exception as e:
+            logger.error(f"LLM batch request failed: {e}")
+            parsed = {}
+
+        self.batches += 1
+        for (item_id, _), item in zip(items, batch):
+            results = parsed.get(item_id)
+            if results is None:
+                # 배치 응답에서 빠진 항목은 개별 요청으로 재시도
+                self.fallback_items += 1
+                self._run_single(item)
+                continue
+            self.batched_items += 1
+            self.llm_detector._cache_set(item.cache_key, results, item.text)
+            item.future.set_result(results)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "batched_items": self.batched_items,
+            "fallback_items": self.fallback_items,
+            "queue_depth": self._queue.qsize(),
+            "avg_batch_size": round(self.batched_items / self.batches, 2) if self.batches else 0.0
+        }
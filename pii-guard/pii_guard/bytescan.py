@@ -0,0 +1,117 @@
+# pii_guard/bytescan.py
+import re
+from typing import List, Tuple, Union
+
+from .detector import PIIMatch
+
+# 바이트 엔진으로 탐지하는 ASCII 전용 PII 유형 (탐지 순서는 PIIDetector._detect_pii_regex와 동일)
+ASCII_TYPES = ('PHONE', 'EMAIL', 'CARD', 'RRN', 'ACCOUNT')
+
+# str 패턴의 \b는 한글 등 비ASCII 문자도 단어 문자로 보므로 비ASCII 바이트(0x80-0xFF)를 단어 문자로 취급
+_W = rb'[0-9A-Za-z_\x80-\xff]'
+
+# PIIDetector.patterns의 ASCII 유형 패턴과 같은 결과를 내는 bytes 패턴
+BYTE_PATTERNS = {
+    'PHONE': [
+        rb'01[016789]-?\d{3,4}-?\d{4}',
+        rb'0\d{1,2}-\d{3,4}-\d{4}',
+    ],
+    'EMAIL': [
+        rb'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
+    ],
+    'CARD': [
+        # \b[\d\s-]{13,25}\b (첫 글자를 먼저 소비한 뒤 경계를 확인해야 바이트 정규식이 느려지지 않음)
+        rb'[\d\s-](?:(?<=\d)(?<!' + _W + rb'\d)|(?<=[\s-])(?<=' + _W + rb'[\s-]))[\d\s-]{12,24}'
+        rb'(?:(?<=\d)(?!' + _W + rb')|(?<=[\s-])(?=' + _W + rb'))',
+    ],
+    'RRN': [
+        rb'(?<!' + _W + rb')\d{6}-[1-4]\d{6}(?!' + _W + rb')',
+    ],
+    'ACCOUNT': [
+        '(?:계좌|계좌번호|account|계좌\\s*번호)[\\s:]*([0-9-]{10,20})'.encode('utf-8'),
+        rb'(?<!' + _W + rb')\d{3}-\d{2,3}-\d{6,8}(?!' + _W + rb')',
+    ],
+}
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+class ByteScanner:
+    """
+    PHONE/EMAIL/CARD/RRN/ACCOUNT를 UTF-8 바이트에서 직접 탐지하는 엔진
+
+    - 요청 본문/파일 바이트를 디코드하지 않고 탐지 (검증/화이트리스트는 탐지된 값만 디코드)
+    - 보고할 매치의 바이트 위치만 문자 위치로 변환 (한 번의 순차 디코드로 계산)
+    - 비ASCII 공백/전각 숫자는 str 패턴과 달리 매치하지 않음
+    """
+
+    def __init__(self, detector):
+        self.detector = detector
+        self.patterns = {
+            pii_type: [re.compile(pattern) for pattern in BYTE_PATTERNS[pii_type]]
+            for pii_type in ASCII_TYPES
+        }
+
+    def _scan_bytes(self, data: BytesLike) -> List[Tuple[str, str, int, int, float]]:
+        """(유형, 값, byte_start, byte_end, 신뢰도) 리스트 (PIIDetector와 같은 검증 규칙)"""
+        detector = self.detector
+        found = []
+
+        for pattern in self.patterns['PHONE']:
+            for match in pattern.finditer(data):
+                value = match.group().decode('ascii')
+                if not detector._is_whitelisted('PHONE', value):
+                    found.append(('PHONE', value, match.start(), match.end(), 0.9))
+
+        for pattern in self.patterns['EMAIL']:
+            for match in pattern.finditer(data):
+                value = match.group().decode('ascii')
+                if not detector._is_whitelisted('EMAIL', value):
+                    found.append(('EMAIL', value, match.start(), match.end(), 0.95))
+
+        for pattern in self.patterns['CARD']:
+            for match in pattern.finditer(data):
+                value = match.group().strip().decode('ascii')
+                if detector._validate_luhn(value):
+                    found.append(('CARD', value, match.start(), match.end(), 0.98))
+
+        for pattern in self.patterns['RRN']:
+            for match in pattern.finditer(data):
+                value = match.group().decode('ascii')
+                if detector._validate_rrn(value):
+                    found.append(('RRN', value, match.start(), match.end(), 0.99))
+
+        for pattern in self.patterns['ACCOUNT']:
+            for match in pattern.finditer(data):
+                group = 1 if pattern.groups else 0
+                value = match.group(group).strip().decode('ascii')
+                digits_only = re.sub(r'\D', '', value)
+                if len(digits_only) >= 10 and not detector._is_whitelisted('ACCOUNT', value):
+                    found.append(('ACCOUNT', value, match.start(group), match.end(group), 0.85))
+
+        return found
+
+    def scan(self, data: BytesLike) -> List[Tuple[PIIMatch, int, int]]:
+        """
+        UTF-8 바이트에서 ASCII 유형 PII 탐지
+
+        Returns:
+            [(문자 위치 기준 PIIMatch, byte_start, byte_end)] (탐지 순서는 PIIDetector와 동일)
+        """
+        found = self._scan_bytes(data)
+        if not found:
+            return []
+
+        # 매치 경계 바이트 위치만 정렬하여 앞에서부터 한 번 디코드하며 문자 위치 계산
+        char_offsets = {0: 0}
+        previous_byte, previous_char = 0, 0
+        for position in sorted({position for _, _, start, end, _ in found for position in (start, end)}):
+            previous_char += len(str(data[previous_byte:position], 'utf-8', 'surrogateescape'))
+            previous_byte = position
+            char_offsets[position] = previous_char
+
+        return [
+            (PIIMatch(pii_type, value, char_offsets[start], char_offsets[end], confidence=confidence, source="regex"),
+             start, end)
+            for pii_type, value, start, end, confidence in found
+        ]
@@ -0,0 +1,176 @@
+# pii_guard/cache.py
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def to_offset_entries(text: str, results: List[Dict[str, Any]]) -> List[List[Any]]:
+    """LLM PII 결과를 [유형, start, end, 신뢰도]로 변환 (값 대신 text 안의 위치만 저장, text에 없는 값은 제외)"""
+    entries = []
+    for result in results:
+        value = result.get("value") if isinstance(result, dict) else None
+        if not isinstance(value, str) or not value:
+            continue
+        start = text.find(value)
+        if start < 0:
+            continue
+        entries.append([result.get("type"), start, start + len(value), result.get("confidence", 0.5)])
+    return entries
+
+
+def from_offset_entries(text: str, entries: List[List[Any]]) -> List[Dict[str, Any]]:
+    """to_offset_entries로 저장한 항목을 같은 text에서 값을 잘라 LLM 결과 형식으로 복원"""
+    return [{"type": pii_type, "value": text[start:end], "confidence": confidence}
+            for pii_type, start, end, confidence in entries]
+
+
+class VerdictCache:
+    """
+    SQLite 기반 LLM 판정 캐시 (여러 워커 프로세스가 같은 파일을 공유, 재시작 후에도 유지)
+
+    키는 입력 텍스트의 솔트 해시이고, PII 판정은 값 없이 유형/위치만 저장 (원문 PII를 파일에 남기지 않음)
+    인젝션 판정의 details는 LLM이 쓴 설명이라 그대로 저장되므로 파일은 내부 데이터로 취급해야 함
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000, max_age: float = 7 * 24 * 3600,
+                 max_bytes: int = 256 * 1024 * 1024, evict_interval: int = 500, salt: str = ""):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.evict_interval = evict_interval
+        self._salt = hashlib.sha256(salt.encode("utf-8")).digest()  # blake2b 키 길이 제한(64바이트) 안으로
+
+        self._local = threading.local()  # sqlite 연결은 스레드별로 유지
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            " key TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_verdicts_created ON verdicts(created_at)")
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """현재 스레드의 sqlite 연결 반환 (WAL 모드로 다중 프로세스 동시 읽기/쓰기)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def make_key(self, kind: str, text: str, model: str, prompt_version: Any) -> str:
+        """텍스트 솔트 해시 + 모델 + 프롬프트 버전으로 캐시 키 생성 (솔트 없이는 짧은 입력을 키로 역추적할 수 없음)"""
+        digest = hashlib.blake2b(text.encode("utf-8"), key=self._salt, digest_size=32).hexdigest()
+        return f"{kind}:{model}:{prompt_version}:{digest}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        try:
+            row = self._connect().execute(
+                "SELECT value, created_at FROM verdicts WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Verdict cache read failed: {e}")
+            return None
+
+        if row is None or (self.max_age and time.time() - row[1] > self.max_age):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """캐시 저장 (주기적으로 크기/기간 기준 정리)"""
+        payload = json.dumps(value, ensure_ascii=False)
+        kind = key.split(":", 1)[0]
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, kind, value, size, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, payload, len(payload.encode("utf-8")), time.time())
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Verdict cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._writes += 1
+            should_evict = self._writes % self.evict_interval == 0
+        if should_evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """만료 항목 삭제 후 항목 수/전체 크기 한도를 넘으면 오래된 순으로 삭제"""
+        removed = 0
+        try:
+            conn = self._connect()
+            if self.max_age:
+                cursor = conn.execute("DELETE FROM verdicts WHERE created_at < ?", (time.time() - self.max_age,))
+                removed += cursor.rowcount
+
+            count, total_size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM verdicts").fetchone()
+            if self.max_entries and count > self.max_entries:
+                cursor = conn.execute(
+                    "DELETE FROM verdicts WHERE key IN "
+                    "(SELECT key FROM verdicts ORDER BY created_at ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+                removed += cursor.rowcount
+
+            if self.max_bytes and total_size > self.max_bytes:
+                # 오래된 항목부터 누적 크기를 계산하여 초과분만큼 삭제
+                excess = total_size - self.max_bytes
+                freed = 0
+                stale_keys = []
+                for key, size in conn.execute("SELECT key, size FROM verdicts ORDER BY created_at ASC"):
+                    if freed >= excess:
+                        break
+                    stale_keys.append((key,))
+                    freed += size
+                conn.executemany("DELETE FROM verdicts WHERE key = ?", stale_keys)
+                removed += len(stale_keys)
+
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Verdict cache eviction failed: {e}")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        try:
+            count, total_size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM verdicts"
+            ).fetchone()
+        except sqlite3.Error:
+            count, total_size = -1, -1
+        return {
+            "path": self.path,
+            "entries": count,
+            "bytes": total_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,72 @@
+# pii_guard/compaction.py
+import re
+from typing import List, Tuple
+
+# LLM에 보낼 가치가 있는 구간을 찾기 위한 저비용 신호 (정규식 탐지 직전의 "근접 실패" 포함)
+SIGNAL_PATTERNS = {
+    # 숫자 묶음 (구분자/공백이 섞인 전화·계좌·카드 번호 후보)
+    'NUMBER': re.compile(r'\d[\d\s\-–‐.]{4,}\d'),
+    # 이메일 후보
+    'EMAIL': re.compile(r'@|＠|\(at\)|\[at\]'),
+    # 호칭/경칭이 붙은 이름 후보
+    'HONORIFIC': re.compile(r'[가-힣]{2,4}\s?(?:님|씨|선생님?|고객님?|과장|대리|부장|팀장|사원|교수)'),
+    # 이름 맥락 키워드
+    'NAME_CUE': re.compile(r'이름|성명|성함|담당자|본인|고객명|예금주|명의'),
+    # 영문 이름 후보
+    'LATIN_NAME': re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b'),
+    # 주소 키워드
+    'ADDRESS': re.compile(
+        r'주소|거주|번지|아파트|빌라|오피스텔|우편번호|'
+        r'(?:서울|부산|대구|인천|광주|대전|울산|세종|경기|강원|충북|충남|충청|전북|전남|전라|경북|경남|경상|제주)|'
+        r'[가-힣\d]+(?:로|길)\s*\d+|\d+\s*동\s*\d+\s*호'
+    ),
+    # 식별번호 키워드
+    'ID_CUE': re.compile(r'사번|학번|직번|회원번호|고객번호|여권|면허|주민|외국인등록|사업자'),
+}
+
+
+def find_suspicious_regions(text: str, radius: int = 80) -> List[Tuple[int, int]]:
+    """신호 주변 radius 문자 구간을 모아 겹치는 구간끼리 병합 (공백 경계에 맞춤)"""
+    spans = []
+    for pattern in SIGNAL_PATTERNS.values():
+        for match in pattern.finditer(text):
+            spans.append((max(0, match.start() - radius), min(len(text), match.end() + radius)))
+
+    if not spans:
+        return []
+
+    spans.sort()
+    merged = [list(spans[0])]
+    for start, end in spans[1:]:
+        if start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    regions = []
+    for start, end in merged:
+        # 단어 중간에서 자르지 않도록 바깥쪽 공백까지 확장
+        while start > 0 and not text[start - 1].isspace():
+            start -= 1
+        while end < len(text) and not text[end].isspace():
+            end += 1
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], max(regions[-1][1], end))
+        else:
+            regions.append((start, end))
+    return regions
+
+
+def compact_text(text: str, radius: int = 80, max_ratio: float = 0.7) -> List[Tuple[int, str]]:
+    """
+    LLM에 보낼 의심 구간만 추출
+
+    Returns:
+        (원문 기준 시작 위치, 구간 텍스트) 리스트. 신호가 없으면 빈 리스트,
+        의심 구간이 전체의 max_ratio를 넘으면 원문 전체 한 구간.
+    """
+    regions = find_suspicious_regions(text, radius)
+    covered = sum(end - start for start, end in regions)
+    if text and covered > len(text) * max_ratio:
+        return [(0, text)]
+    return [(start, text[start:end]) for start, end in regions]
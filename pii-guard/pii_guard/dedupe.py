@@ -0,0 +1,162 @@
+# pii_guard/dedupe.py
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+from .detector import PIIDetector, PIIMatch
+from .scheduler import llm_skipped
+
+# 빈 줄(공백만 있는 줄 포함)을 문단 경계로 사용
+PARAGRAPH_BREAK = re.compile(r'\n(?:[ \t]*\n)+')
+
+
+def split_chunks(text: str) -> List[Tuple[int, int]]:
+    """텍스트를 문단 단위 (start, end) 구간으로 분할 (문단 사이 빈 줄은 제외)"""
+    chunks = []
+    position = 0
+    for separator in PARAGRAPH_BREAK.finditer(text):
+        if separator.start() > position:
+            chunks.append((position, separator.start()))
+        position = separator.end()
+    if position < len(text):
+        chunks.append((position, len(text)))
+    return chunks
+
+
+class ChunkCache:
+    """문단 해시 → 탐지 결과 캐시 (배치 내/배치 간 반복 문단 재사용, LRU)"""
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[Tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(chunk: str) -> str:
+        return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Tuple]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    @staticmethod
+    def to_entry(matches: List[PIIMatch]) -> List[Tuple]:
+        return [(m.type, m.value, m.start, m.end, m.confidence, m.source) for m in matches]
+
+    def set(self, key: str, matches: List[PIIMatch]) -> List[Tuple]:
+        """문단 기준 상대 위치로 저장"""
+        entry = self.to_entry(matches)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+def _emit(matches: List[PIIMatch], entry: List[Tuple], offset: int) -> None:
+    """문단 기준 상대 위치의 캐시 항목을 문서 기준 매치로 추가"""
+    for pii_type, value, rel_start, rel_end, confidence, source in entry:
+        matches.append(PIIMatch(pii_type, value, offset + rel_start, offset + rel_end,
+                                confidence=confidence, source=source))
+
+
+def _detect_pending(text: str, detector: PIIDetector, cache: ChunkCache,
+                    pending: List[Tuple[int, int, str]], matches: List[PIIMatch]) -> None:
+    """
+    연속된 캐시 미스 문단을 한 번의 detect_pii로 탐지하고 매치를 위치로 문단에 나눠 캐시
+
+    문단 경계를 넘는 매치는 결과에는 넣고, 그 매치가 시작한 문단은 캐시하지 않음
+    """
+    if not pending:
+        return
+    group_start, group_end = pending[0][0], pending[-1][1]
+    group_matches = detector.detect_pii(text[group_start:group_end])
+    # RegEx 전용(성능 저하) 결과는 캐시하지 않음 (이후 요청은 LLM 결과를 받아야 함)
+    cacheable = not llm_skipped()
+
+    index = 0
+    for start, end, key in pending:
+        chunk_matches = []
+        crossing = False
+        while index < len(group_matches) and group_start + group_matches[index].start < end:
+            match = group_matches[index]
+            index += 1
+            if group_start + match.end > end:
+                crossing = True
+            chunk_matches.append(PIIMatch(match.type, match.value, group_start + match.start - start,
+                                          group_start + match.end - start,
+                                          confidence=match.confidence, source=match.source))
+        entry = cache.set(key, chunk_matches) if cacheable and not crossing else cache.to_entry(chunk_matches)
+        _emit(matches, entry, start)
+    pending.clear()
+
+
+def detect_pii_deduplicated(text: str, detector: PIIDetector, cache: ChunkCache,
+                            stats: Optional[Dict[str, int]] = None) -> List[PIIMatch]:
+    """
+    문단별로 해시하여 이미 처리한 문단은 캐시된 결과를 재사용하는 PII 탐지
+
+    캐시에 없는 문단은 연속 구간끼리 묶어 한 번에 탐지 (문단마다 LLM을 호출하지 않도록,
+    문단이 모두 새로운 단일 문서는 detect_pii 한 번)
+    stats가 주어지면 chunks/reused_chunks/chars/reused_chars 값을 누적합니다.
+    """
+    matches = []
+    pending: List[Tuple[int, int, str]] = []
+    for start, end in split_chunks(text):
+        chunk = text[start:end]
+        key = cache.make_key(chunk)
+        # 같은 문서 안의 반복 문단은 앞 구간을 먼저 탐지해 캐시 결과를 재사용
+        if any(key == pending_key for _, _, pending_key in pending):
+            _detect_pending(text, detector, cache, pending, matches)
+        entry = cache.get(key)
+        reused = entry is not None
+        if entry is None:
+            pending.append((start, end, key))
+        else:
+            _detect_pending(text, detector, cache, pending, matches)
+            _emit(matches, entry, start)
+
+        if stats is not None:
+            stats["chunks"] = stats.get("chunks", 0) + 1
+            stats["chars"] = stats.get("chars", 0) + len(chunk)
+            if reused:
+                stats["reused_chunks"] = stats.get("reused_chunks", 0) + 1
+                stats["reused_chars"] = stats.get("reused_chars", 0) + len(chunk)
+
+    _detect_pending(text, detector, cache, pending, matches)
+    return matches
+
+
+def summarize_dedupe(stats: Dict[str, int]) -> Dict[str, Any]:
+    """중복 제거 통계 요약 (dedupe_ratio: 캐시로 처리한 문단 비율)"""
+    chunks = stats.get("chunks", 0)
+    reused = stats.get("reused_chunks", 0)
+    chars = stats.get("chars", 0)
+    reused_chars = stats.get("reused_chars", 0)
+    return {
+        "chunks": chunks,
+        "unique_chunks": chunks - reused,
+        "reused_chunks": reused,
+        "dedupe_ratio": round(reused / chunks, 4) if chunks else 0.0,
+        "reused_char_ratio": round(reused_chars / chars, 4) if chars else 0.0
+    }
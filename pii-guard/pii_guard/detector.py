@@ -6,9 +6,83 @@ import logging
 from pathlib import Path
 from typing import List, Dict, Tuple, Any, Optional
 
+from .scheduler import llm_skipped
+from .tracing import span
+from .normalize import NormalizedText, normalize
+
 logger = logging.getLogger(__name__)
 
 
+class RegexBackend:
+    """RegEx 엔진 (기본: 표준 라이브러리 re)"""
+
+    name = "re"
+
+    def compile(self, pattern: str):
+        return re.compile(pattern)
+
+    def finditer(self, compiled, text: str):
+        return compiled.finditer(text)
+
+
+class TimeoutRegexBackend(RegexBackend):
+    """regex 모듈 엔진 (패턴별 검색 시간 제한, 초과시 그 패턴의 남은 매치는 생략)"""
+
+    name = "regex"
+
+    def __init__(self, timeout: float = 0.1):
+        import regex
+        self._regex = regex
+        self.timeout = timeout
+        self.timeouts = 0  # 시간 제한 초과 횟수
+
+    def compile(self, pattern: str):
+        return self._regex.compile(pattern)
+
+    def finditer(self, compiled, text: str):
+        try:
+            yield from compiled.finditer(text, timeout=self.timeout)
+        except TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"Regex timeout ({self.timeout}s) on pattern {compiled.pattern!r}, {len(text)} chars")
+
+
+class RE2Backend(RegexBackend):
+    """
+    RE2 선형 시간 엔진 (google-re2)
+
+    RE2가 지원하지 않는 패턴(전후방 탐색 등)은 re로 컴파일
+    RE2의 \\b, \\d, \\s는 ASCII 기준이므로 한글과 붙은 숫자 경계 등에서 re와 결과가 다를 수 있음
+    """
+
+    name = "re2"
+
+    def __init__(self):
+        import re2
+        self._re2 = re2
+
+    def compile(self, pattern: str):
+        try:
+            return self._re2.compile(pattern)
+        except self._re2.error:
+            logger.warning(f"RE2 does not support pattern {pattern!r}, using re")
+            return re.compile(pattern)
+
+
+def create_regex_backend(name: str = "re", timeout: float = 0.1) -> RegexBackend:
+    """설정 이름으로 RegEx 엔진 생성 (선택한 모듈이 설치되어 있지 않으면 re 사용)"""
+    if name not in ("re", "regex", "re2"):
+        raise ValueError(f"Unknown regex backend: {name}")
+    try:
+        if name == "regex":
+            return TimeoutRegexBackend(timeout)
+        if name == "re2":
+            return RE2Backend()
+    except ImportError:
+        logger.warning(f"Regex backend '{name}' is not installed, using re")
+    return RegexBackend()
+
+
 class PIIMatch:
     def __init__(self, type: str, value: str, start: int, end: int, confidence: float = 1.0, source: str = "regex"):
         self.type = type
@@ -30,9 +104,26 @@ class PIIMatch:
 
 
 class PIIDetector:
-    def __init__(self, whitelist_path: str = None, use_llm: bool = True, ollama_url: str = "http://localhost:11434"):
-        """PII 탐지기 초기화"""
+    def __init__(self, whitelist_path: str = None, use_llm: bool = True, ollama_url: str = "http://localhost:11434",
+                 verdict_cache=None, llm_options: Optional[Dict[str, Any]] = None,
+                 client_options: Optional[Dict[str, Any]] = None, injection_prefilter: bool = True,
+                 regex_engine: str = "str", regex_backend: str = "re", regex_timeout: float = 0.1,
+                 address_gazetteer: Optional[str] = None, normalize: bool = True):
+        """
+        PII 탐지기 초기화
+
+        verdict_cache: 선택적 LLM 판정 영구 캐시
+        llm_options: LLMPIIDetector 옵션 (window_tokens, window_overlap_tokens, max_concurrency)
+        client_options: OllamaClient 옵션 (model, num_predict, max_concurrency)
+        injection_prefilter: 규칙 기반 인젝션 사전 필터 사용 (확실한 경우 LLM 호출 생략)
+        regex_engine: ASCII 유형(PHONE/EMAIL/CARD/RRN/ACCOUNT) RegEx 엔진 ("str" 또는 UTF-8 바이트에서 탐지하는 "bytes")
+        regex_backend: str 패턴 엔진 ("re", 시간 제한이 있는 "regex", 선형 시간 "re2")
+        regex_timeout: regex_backend="regex"일 때 패턴별 검색 시간 제한(초)
+        address_gazetteer: 내장 지명 사전에 더할 지명 파일 경로 (한 줄에 하나)
+        normalize: 탐지 전 전각 숫자/여러 대시/띄운 숫자를 정규화 (매치 위치는 원문 기준으로 되돌림)
+        """
         self.use_llm = use_llm
+        self.normalize_input = normalize
         self.weights = {
             'RRN': 1.0,           # 주민등록번호
             'CARD': 0.9,          # 신용카드번호
@@ -44,6 +135,10 @@ class PIIDetector:
             'ID_NUMBER': 0.4,     # 기타 식별번호 (새로 추가)
         }
 
+        # 프롬프트 인젝션 규칙 사전 필터 (LLM 사용 여부와 무관하게 동작)
+        from .injection import InjectionPrefilter
+        self.injection_prefilter = InjectionPrefilter() if injection_prefilter else None
+
         # LLM 클라이언트 초기화
         self.llm_client = None
         self.llm_detector = None
@@ -51,9 +146,9 @@ class PIIDetector:
             try:
                 logger.info(f"Initializing LLM detector with URL: {ollama_url}")
                 from .llm_client import OllamaClient, LLMPIIDetector
-                self.llm_client = OllamaClient(base_url=ollama_url)
+                self.llm_client = OllamaClient(base_url=ollama_url, **(client_options or {}))
                 logger.info("OllamaClient created successfully")
-                self.llm_detector = LLMPIIDetector(self.llm_client)
+                self.llm_detector = LLMPIIDetector(self.llm_client, cache=verdict_cache, **(llm_options or {}))
                 logger.info("LLM PII detector initialized successfully")
 
                 # 연결 테스트
@@ -95,19 +190,8 @@ class PIIDetector:
                 # 단독 계좌 형태 (XXX-XX-XXXXXX)
                 r'\b\d{3}-\d{2,3}-\d{6,8}\b'
             ],
-            'NAME': [
-                # 한국 이름 패턴 - 이름 맥락에서만 탐지
-                r'(?:이름은?|성명은?|성함은?|이름이)\s*([김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구원태선설마길연방명기반왕금옥육인맹제갈선우남궁독고황보제][가-힣]{1,2})',
-                r'([김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구원태선설마길연방명기반왕금옥육인맹제갈선우남궁독고황보제][가-힣]{1,2})(?:님|씨|선생|군|양|학생|고객|손님)',
-                # 영어 이름 패턴 (First Last)
-                r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b'
-            ],
-            'ADDRESS': [
-                # 한국 주소 패턴
-                r'(?:서울|부산|대구|인천|광주|대전|울산|경기|강원|충북|충남|전북|전남|경북|경남|제주)[시도군구]?\s*[가-힣\s\d-]+(?:동|로|가|길|번지|호)',
-                # 우편번호 패턴
-                r'\b\d{5}\b'
-            ],
+            # NAME은 성씨 트라이 기반 KoreanNameDetector로 탐지 (names.py)
+            # ADDRESS는 지명 사전 트라이 기반 KoreanAddressDetector로 탐지 (address.py)
             'ID_NUMBER': [
                 # 사번, 학번 등 (숫자+문자 조합)
                 r'(?:사번|학번|직번|회원번호|고객번호)[\s:]*[A-Z0-9-]{4,15}',
@@ -116,9 +200,32 @@ class PIIDetector:
             ]
         }
 
+        # 패턴은 선택한 엔진으로 한 번만 컴파일
+        self.regex_backend = create_regex_backend(regex_backend, regex_timeout)
+        self.compiled_patterns = {
+            pii_type: [self.regex_backend.compile(pattern) for pattern in patterns]
+            for pii_type, patterns in self.patterns.items()
+        }
+
+        # 한국어 이름 탐지기 (성씨/호칭 트라이는 프로세스 공용)
+        from .names import default_name_detector
+        self.name_detector = default_name_detector()
+
+        # 한국어 주소 탐지기 (추가 지명 사전이 없으면 프로세스 공용)
+        from .address import address_detector
+        self.address_detector = address_detector(address_gazetteer)
+
         # 화이트리스트 로드
         self.whitelist = self._load_whitelist(whitelist_path)
 
+        # ASCII 유형 바이트 엔진 (regex_engine="bytes"일 때만 사용)
+        if regex_engine not in ("str", "bytes"):
+            raise ValueError(f"Unknown regex engine: {regex_engine}")
+        self.byte_scanner = None
+        if regex_engine == "bytes":
+            from .bytescan import ByteScanner
+            self.byte_scanner = ByteScanner(self)
+
     def _load_whitelist(self, whitelist_path: str = None) -> Dict[str, List[str]]:
         """화이트리스트 YAML 파일 로드"""
         if whitelist_path is None:
@@ -198,65 +305,109 @@ class PIIDetector:
             return value in self.whitelist['accounts']
         return False
 
-    def detect_pii(self, text: str) -> List[PIIMatch]:
-        """하이브리드 PII 탐지 (RegEx + LLM)"""
+    def llm_active(self) -> bool:
+        """현재 실행 흐름에서 LLM 탐지를 수행하는지 여부 (LLM 사용 중이고 RegEx 전용 처리 중이 아님)"""
+        return bool(self.use_llm and self.llm_detector and not llm_skipped())
+
+    def normalize_text(self, text: str) -> NormalizedText:
+        """탐지용 정규화 텍스트 (normalize=False면 원문 그대로)"""
+        if not self.normalize_input:
+            return NormalizedText(text, text)
+        with span("normalize"):
+            return normalize(text)
+
+    def detect_pii(self, text: str, normalized: Optional[NormalizedText] = None) -> List[PIIMatch]:
+        """하이브리드 PII 탐지 (RegEx + LLM, 정규화 텍스트에서 탐지하고 위치는 원문 기준, 이미 정규화했으면 normalized로 전달)"""
+        if normalized is None:
+            normalized = self.normalize_text(text)
+        text = normalized.text
         all_matches = []
 
         # 1단계: RegEx 기반 탐지 (빠른 스크리닝)
-        regex_matches = self._detect_pii_regex(text)
+        with span("regex"):
+            regex_matches = self._detect_pii_regex(text)
         all_matches.extend(regex_matches)
 
-        # 2단계: LLM 기반 탐지 (정밀 분석)
-        if self.use_llm and self.llm_detector:
+        # 2단계: LLM 기반 탐지 (정밀 분석, 과부하로 RegEx 전용 처리 중이면 생략)
+        if self.llm_active():
             try:
-                llm_matches = self._detect_pii_llm(text)
+                with span("llm_pii"):
+                    llm_matches = self._detect_pii_llm(text)
                 all_matches.extend(llm_matches)
             except Exception as e:
                 logger.error(f"LLM PII detection failed: {e}")
 
         # 3단계: 중복 제거 및 통합
-        return self._merge_and_deduplicate_matches(all_matches)
+        with span("merge"):
+            return normalized.restore(self._merge_and_deduplicate_matches(all_matches))
 
     def _detect_pii_regex(self, text: str) -> List[PIIMatch]:
         """RegEx 기반 PII 탐지"""
         matches = []
 
+        if self.byte_scanner is not None:
+            # ASCII 유형은 UTF-8 바이트에서 탐지 (문자 위치는 보고할 매치만 변환)
+            data = text.encode('utf-8', errors='surrogateescape')
+            matches.extend(match for match, _, _ in self.byte_scanner.scan(data))
+        else:
+            self._detect_ascii_pii_regex(text, matches)
+
+        # 새로운 PII 유형들
+        self._detect_names_regex(text, matches)
+        self._detect_addresses_regex(text, matches)
+        self._detect_id_numbers_regex(text, matches)
+
+        return matches
+
+    def detect_pii_bytes(self, data) -> List[Tuple[PIIMatch, int, int]]:
+        """
+        UTF-8 바이트(요청 본문, 파일 등)에서 디코드 없이 ASCII 유형 PII(PHONE/EMAIL/CARD/RRN/ACCOUNT) 탐지
+
+        Returns:
+            [(문자 위치 기준 PIIMatch, byte_start, byte_end)]
+        """
+        from .bytescan import ByteScanner
+        scanner = self.byte_scanner or ByteScanner(self)
+        return scanner.scan(data)
+
+    def _detect_ascii_pii_regex(self, text: str, matches: List[PIIMatch]):
+        """PHONE/EMAIL/CARD/RRN/ACCOUNT RegEx 탐지 (str 엔진)"""
         # PHONE 탐지
-        for pattern in self.patterns['PHONE']:
-            for match in re.finditer(pattern, text):
+        for pattern in self.compiled_patterns['PHONE']:
+            for match in self.regex_backend.finditer(pattern, text):
                 value = match.group()
                 if not self._is_whitelisted('PHONE', value):
                     matches.append(PIIMatch('PHONE', value, match.start(), match.end(),
                                           confidence=0.9, source="regex"))
 
         # EMAIL 탐지
-        for pattern in self.patterns['EMAIL']:
-            for match in re.finditer(pattern, text):
+        for pattern in self.compiled_patterns['EMAIL']:
+            for match in self.regex_backend.finditer(pattern, text):
                 value = match.group()
                 if not self._is_whitelisted('EMAIL', value):
                     matches.append(PIIMatch('EMAIL', value, match.start(), match.end(),
                                           confidence=0.95, source="regex"))
 
         # CARD 탐지 (Luhn 검증)
-        for pattern in self.patterns['CARD']:
-            for match in re.finditer(pattern, text):
+        for pattern in self.compiled_patterns['CARD']:
+            for match in self.regex_backend.finditer(pattern, text):
                 value = match.group().strip()
                 if self._validate_luhn(value):
                     matches.append(PIIMatch('CARD', value, match.start(), match.end(),
                                           confidence=0.98, source="regex"))
 
         # RRN 탐지 (주민등록번호 검증)
-        for pattern in self.patterns['RRN']:
-            for match in re.finditer(pattern, text):
+        for pattern in self.compiled_patterns['RRN']:
+            for match in self.regex_backend.finditer(pattern, text):
                 value = match.group()
                 if self._validate_rrn(value):
                     matches.append(PIIMatch('RRN', value, match.start(), match.end(),
                                           confidence=0.99, source="regex"))
 
         # ACCOUNT 탐지
-        for pattern in self.patterns['ACCOUNT']:
-            for match in re.finditer(pattern, text):
-                if '계좌' in pattern:
+        for pattern in self.compiled_patterns['ACCOUNT']:
+            for match in self.regex_backend.finditer(pattern, text):
+                if '계좌' in pattern.pattern:
                     if match.groups():
                         value = match.group(1).strip()
                         start = match.start(1)
@@ -273,41 +424,22 @@ class PIIDetector:
                     matches.append(PIIMatch('ACCOUNT', value, start, end,
                                           confidence=0.85, source="regex"))
 
-        # 새로운 PII 유형들
-        self._detect_names_regex(text, matches)
-        self._detect_addresses_regex(text, matches)
-        self._detect_id_numbers_regex(text, matches)
-
-        return matches
-
     def _detect_names_regex(self, text: str, matches: List[PIIMatch]):
-        """이름 RegEx 탐지"""
-        for pattern in self.patterns['NAME']:
-            for match in re.finditer(pattern, text):
-                if match.groups():
-                    # 그룹이 있는 패턴 (이름 맥락 패턴)
-                    value = match.group(1)
-                    start = match.start(1)
-                    end = match.end(1)
-                else:
-                    # 그룹이 없는 패턴 (영어 이름 등)
-                    value = match.group()
-                    start = match.start()
-                    end = match.end()
-
+        """한국어 이름 탐지 (성씨 트라이 + 호칭/맥락 표현, 한 번 순회)"""
+        for start, end, confidence in self.name_detector.find(text):
+            matches.append(PIIMatch('NAME', text[start:end], start, end,
+                                  confidence=confidence, source="regex"))
 
     def _detect_addresses_regex(self, text: str, matches: List[PIIMatch]):
-        """주소 RegEx 탐지"""
-        for pattern in self.patterns['ADDRESS']:
-            for match in re.finditer(pattern, text):
-                value = match.group()
-                matches.append(PIIMatch('ADDRESS', value, match.start(), match.end(),
-                                      confidence=0.8, source="regex"))
+        """한국어 주소/우편번호 탐지 (지명 사전 트라이 + 구성 단계 순서, 한 번 순회)"""
+        for start, end, confidence in self.address_detector.find(text):
+            matches.append(PIIMatch('ADDRESS', text[start:end], start, end,
+                                  confidence=confidence, source="regex"))
 
     def _detect_id_numbers_regex(self, text: str, matches: List[PIIMatch]):
         """ID 번호 RegEx 탐지"""
-        for pattern in self.patterns['ID_NUMBER']:
-            for match in re.finditer(pattern, text):
+        for pattern in self.compiled_patterns['ID_NUMBER']:
+            for match in self.regex_backend.finditer(pattern, text):
                 value = match.group()
                 matches.append(PIIMatch('ID_NUMBER', value, match.start(), match.end(),
                                       confidence=0.6, source="regex"))
@@ -318,15 +450,18 @@ class PIIDetector:
             return []
 
         try:
-            llm_results = self.llm_detector.detect_pii_sync(text)
+            # 긴 텍스트는 토큰 예산 윈도우로 나누어 동시 처리 (start/end는 원문에서 값을 찾아 보정한 위치)
+            llm_results = self.llm_detector.detect_pii_windows_sync(text)
             matches = []
 
             for result in llm_results:
-                pii_type = result.get('type', '').upper()
-                value = result.get('value', '')
-                start = result.get('start', 0)
-                end = result.get('end', len(value))
+                pii_type = str(result.get('type', '')).upper()
+                value = result['value']
+                start = result['start']
+                end = result['end']
                 confidence = result.get('confidence', 0.5)
+                if not isinstance(confidence, (int, float)):
+                    continue
 
                 # LLM 결과 검증
                 if pii_type and value and confidence > 0.3:
@@ -383,7 +518,16 @@ class PIIDetector:
         return not (match1.end <= match2.start or match2.end <= match1.start)
 
     def detect_prompt_injection(self, text: str) -> Dict[str, Any]:
-        """프롬프트 인젝션 탐지"""
+        """프롬프트 인젝션 탐지 (규칙으로 확실히 판정되면 LLM 생략, 애매한 경우만 LLM)"""
+        if self.injection_prefilter is not None:
+            with span("injection_rules"):
+                verdict = self.injection_prefilter.check(text)
+            if verdict is not None:
+                return verdict
+        return self._detect_prompt_injection_llm(text)
+
+    def _detect_prompt_injection_llm(self, text: str) -> Dict[str, Any]:
+        """LLM 프롬프트 인젝션 판정 (규칙 사전 필터 이후 단계)"""
         if not self.use_llm or not self.llm_detector:
             return {
                 "injection_detected": False,
@@ -391,9 +535,17 @@ class PIIDetector:
                 "confidence": 0.0,
                 "details": "LLM not available"
             }
+        if llm_skipped():
+            return {
+                "injection_detected": False,
+                "attack_types": [],
+                "confidence": 0.0,
+                "details": "LLM skipped under load"
+            }
 
         try:
-            return self.llm_detector.detect_prompt_injection_sync(text)
+            with span("llm_injection"):
+                return self.llm_detector.detect_prompt_injection_sync(text)
         except Exception as e:
             logger.error(f"Prompt injection detection error: {e}")
             return {
@@ -0,0 +1,141 @@
+# pii_guard/filescan.py
+import mmap
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .detector import PIIDetector, PIIMatch
+
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+DEFAULT_OVERLAP_BYTES = 4096
+
+
+class FileMatch:
+    """파일 스캔 결과 (바이트 위치와 문자 위치를 함께 보관)"""
+
+    def __init__(self, match: PIIMatch, byte_start: int, byte_end: int, char_start: int, char_end: int):
+        self.type = match.type
+        self.value = match.value
+        self.confidence = match.confidence
+        self.source = match.source
+        self.byte_span = (byte_start, byte_end)
+        self.span = (char_start, char_end)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "value": self.value,
+            "span": self.span,
+            "byte_span": self.byte_span,
+            "confidence": self.confidence,
+            "source": self.source
+        }
+
+
+def _char_boundary(data, position: int) -> int:
+    """position 이하의 가장 가까운 UTF-8 문자 시작 위치"""
+    while 0 < position < len(data) and (data[position] & 0xC0) == 0x80:
+        position -= 1
+    return position
+
+
+def _cut_position(data, start: int, chunk_bytes: int, overlap_bytes: int) -> int:
+    """청크 끝 위치 (가능하면 마지막 줄바꿈 직후, 아니면 문자 경계)"""
+    end = start + chunk_bytes
+    if end >= len(data):
+        return len(data)
+    newline = data.rfind(b"\n", max(start + 1, end - overlap_bytes), end)
+    if newline != -1:
+        return newline + 1
+    return max(start + 1, _char_boundary(data, end))
+
+
+def _byte_offsets(text: str, matches: List[PIIMatch]) -> Dict[int, int]:
+    """매치 시작/끝 문자 위치 → 텍스트 내 바이트 위치 (보고할 매치 위치만 한 번 순회로 계산)"""
+    offsets: Dict[int, int] = {0: 0}
+    positions = sorted({position for match in matches for position in (match.start, match.end)})
+    previous_char, previous_byte = 0, 0
+    for position in positions:
+        previous_byte += len(text[previous_char:position].encode("utf-8", errors="surrogateescape"))
+        previous_char = position
+        offsets[position] = previous_byte
+    return offsets
+
+
+def _scan_window(detector: PIIDetector, data, window_start: int, owned_start: int, owned_end: int,
+                 window_end: int) -> Tuple[List[Tuple[PIIMatch, int, int, int, int]], int]:
+    """
+    창 [window_start, window_end)를 디코드하여 RegEx 탐지 후 [owned_start, owned_end)에서 시작하는 매치만 반환
+
+    Returns:
+        ([(매치, 창 기준 byte_start, byte_end, 소유 구간 기준 char_start, char_end)], 소유 구간 문자 수)
+    """
+    # 잘못된 바이트는 바이트당 한 문자(대리 문자)로 디코드하여 바이트 위치를 정확히 되돌릴 수 있게 함
+    prefix = data[window_start:owned_start].decode("utf-8", errors="surrogateescape")
+    owned = data[owned_start:owned_end].decode("utf-8", errors="surrogateescape")
+    suffix = data[owned_end:window_end].decode("utf-8", errors="surrogateescape")
+    text = prefix + owned + suffix
+
+    normalized = detector.normalize_text(text)
+    matches = normalized.restore(detector._merge_and_deduplicate_matches(detector._detect_pii_regex(normalized.text)))
+    matches = [match for match in matches if len(prefix) <= match.start < len(prefix) + len(owned)]
+    offsets = _byte_offsets(text, matches)
+
+    results = []
+    for match in sorted(matches, key=lambda x: (x.start, x.end)):
+        results.append((match, window_start + offsets[match.start], window_start + offsets[match.end],
+                        match.start - len(prefix), match.end - len(prefix)))
+    return results, len(owned)
+
+
+def scan_file(path: str, detector: PIIDetector = None, chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+              overlap_bytes: int = DEFAULT_OVERLAP_BYTES) -> Iterator[FileMatch]:
+    """
+    대용량 UTF-8 파일을 메모리 매핑하여 RegEx 단계 PII 탐지
+
+    - 파일 전체를 str로 읽지 않고 chunk_bytes 단위(줄바꿈/문자 경계 정렬)로 디코드하여 탐지
+    - 청크 앞뒤 overlap_bytes를 함께 검사하여 경계에 걸친 매치도 탐지 (매치는 시작 위치의 청크에서만 보고)
+    - 메모리 사용량은 파일 크기와 무관하게 청크 크기에 비례
+    - LLM 탐지는 수행하지 않음
+
+    Yields:
+        파일 기준 byte_span과 문자 위치 span을 가진 FileMatch (위치 순)
+    """
+    if detector is None:
+        detector = PIIDetector(use_llm=False)
+
+    with open(path, "rb") as f:
+        if Path(path).stat().st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            start = 0
+            char_base = 0  # start 위치까지의 문자 수
+            # UTF-8 BOM은 문자 위치 계산에서 제외
+            if data[:3] == b"\xef\xbb\xbf":
+                start = 3
+
+            while start < size:
+                end = _cut_position(data, start, chunk_bytes, overlap_bytes)
+                window_start = _char_boundary(data, max(0, start - overlap_bytes))
+                window_end = _char_boundary(data, min(size, end + overlap_bytes))
+
+                results, owned_chars = _scan_window(detector, data, window_start, start, end, window_end)
+                for match, byte_start, byte_end, char_start, char_end in results:
+                    yield FileMatch(match, byte_start, byte_end, char_base + char_start, char_base + char_end)
+
+                char_base += owned_chars
+                start = end
+
+
+def scan_file_summary(path: str, detector: PIIDetector = None, **options) -> Dict[str, Any]:
+    """scan_file 결과를 유형별 개수와 함께 반환 (매치 목록은 메모리에 모임)"""
+    matches = [match.to_dict() for match in scan_file(path, detector, **options)]
+    counts: Dict[str, int] = {}
+    for match in matches:
+        counts[match["type"]] = counts.get(match["type"], 0) + 1
+    return {
+        "path": str(path),
+        "bytes": Path(path).stat().st_size,
+        "counts": counts,
+        "matches": matches
+    }
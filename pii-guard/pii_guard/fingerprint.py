@@ -0,0 +1,256 @@
+# pii_guard/fingerprint.py
+import os
+import re
+import time
+import struct
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .detector import PIIMatch
+from .names import PARTICLES, SUFFIX_CUES
+from .normalize import normalize
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# PII 유형 → 지문 종류 (같은 종류끼리 같은 정규화 규칙을 사용)
+KIND_BY_TYPE = {
+    'PHONE': 'digits',
+    'CARD': 'digits',
+    'RRN': 'digits',
+    'ACCOUNT': 'digits',
+    'EMAIL': 'email',
+    'NAME': 'name',
+    'ID_NUMBER': 'id',
+}
+
+TYPE_CODES = {pii_type: code for code, pii_type in enumerate(sorted(KIND_BY_TYPE), start=1)}
+TYPES_BY_CODE = {code: pii_type for pii_type, code in TYPE_CODES.items()}
+
+MIN_DIGITS = 7
+# 이름 지문의 최소 글자 수 (두 글자 값은 일반 단어와 겹치기 쉬워 정확 일치 인덱스에 넣지 않음)
+MIN_NAME_LENGTH = 3
+
+_MAGIC = b"PIIFP1"
+_HEADER = struct.Struct("<6s8sIIQ")  # magic, 솔트 확인값, 비트 수, 해시 수, 항목 수
+_DIGEST_SIZE = 16
+
+# 답변에서 지문을 조회할 후보 추출용 패턴
+_DIGIT_RUN = re.compile(r'\d(?:[\d\-–‐.]|\s(?=\d))*\d')
+_EMAIL = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+_HANGUL_RUN = re.compile(r'[가-힣]{2,}')
+_ID_TOKEN = re.compile(r'\b[A-Za-z0-9][A-Za-z0-9-]{3,}\b')
+
+
+_PARTICLES = frozenset(PARTICLES)
+
+
+def _is_name_tail(rest: str) -> bool:
+    """이름 뒤 나머지가 없거나 호칭/조사로만 이루어졌는지 (호칭 뒤 조사 허용: 님께, 고객님의)"""
+    if not rest or rest in _PARTICLES:
+        return True
+    for cue in SUFFIX_CUES:
+        if rest.startswith(cue) and (len(rest) == len(cue) or rest[len(cue):] in _PARTICLES):
+            return True
+    return False
+
+
+def normalize_value(kind: str, value: str) -> Optional[str]:
+    """
+    지문 종류별 정규화 (구분자/공백/대소문자 차이 제거, 지문으로 쓰기에 너무 짧으면 None)
+
+    탐지와 같은 입력 정규화(전각 → ASCII 등)를 먼저 적용해 적재/답변의 표기가 달라도 같은 지문이 되도록 함
+    """
+    value = normalize(value).text
+    if kind == 'digits':
+        normalized = re.sub(r'[^0-9]', '', value)
+        return normalized if len(normalized) >= MIN_DIGITS else None
+    if kind == 'email':
+        normalized = value.strip().lower()
+        return normalized if '@' in normalized else None
+    if kind == 'name':
+        normalized = re.sub(r'\s+', '', value)
+        return normalized if len(normalized) >= MIN_NAME_LENGTH else None
+    if kind == 'id':
+        normalized = re.sub(r'[^0-9A-Za-z]', '', value).upper()
+        return normalized if len(normalized) >= 4 else None
+    return None
+
+
+class FingerprintIndex:
+    """적재 시 마스킹한 PII 값의 솔트 해시 지문 인덱스 (Bloom 필터 + 정확 집합)"""
+
+    def __init__(self, salt: str, bloom_bits: int = 1 << 23, bloom_hashes: int = 4):
+        self._salt = salt.encode("utf-8")
+        self._salt_check = hashlib.blake2b(self._salt, digest_size=8, person=b"piifp-salt").digest()
+        self.bloom_bits = bloom_bits
+        self.bloom_hashes = bloom_hashes
+        self._bloom = bytearray((bloom_bits + 7) // 8)
+        self._exact: Dict[bytes, int] = {}  # 지문 → PII 유형 코드
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_sync = 0.0
+
+    def __len__(self):
+        return len(self._exact)
+
+    def _digest(self, kind: str, normalized: str) -> bytes:
+        return hashlib.blake2b(f"{kind}\0{normalized}".encode("utf-8"),
+                               key=self._salt, digest_size=_DIGEST_SIZE).digest()
+
+    def _bloom_positions(self, digest: bytes) -> Iterator[int]:
+        """이중 해싱으로 k개 비트 위치 생성"""
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.bloom_hashes):
+            yield (h1 + i * h2) % self.bloom_bits
+
+    def _bloom_add(self, digest: bytes) -> None:
+        for position in self._bloom_positions(digest):
+            self._bloom[position >> 3] |= 1 << (position & 7)
+
+    def _bloom_contains(self, digest: bytes) -> bool:
+        for position in self._bloom_positions(digest):
+            if not self._bloom[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, pii_type: str, value: str) -> bool:
+        """PII 값 지문 추가 (색인 대상이 아닌 유형이나 너무 짧은 값은 무시)"""
+        kind = KIND_BY_TYPE.get(pii_type)
+        if kind is None:
+            return False
+        normalized = normalize_value(kind, value)
+        if normalized is None:
+            return False
+        digest = self._digest(kind, normalized)
+        with self._lock:
+            if digest not in self._exact:
+                self._exact[digest] = TYPE_CODES[pii_type]
+                self._bloom_add(digest)
+                self._dirty = True
+        return True
+
+    def add_matches(self, matches: List[PIIMatch]) -> int:
+        """탐지 결과의 값들을 지문으로 등록"""
+        return sum(1 for match in matches if self.add(match.type, match.value))
+
+    def lookup(self, kind: str, value: str) -> Optional[str]:
+        """정규화된 값이 알려진 PII이면 원래 PII 유형 반환 (Bloom 필터로 대부분 즉시 배제)"""
+        normalized = normalize_value(kind, value)
+        if normalized is None:
+            return None
+        digest = self._digest(kind, normalized)
+        if not self._bloom_contains(digest):
+            return None
+        code = self._exact.get(digest)
+        return TYPES_BY_CODE.get(code) if code else None
+
+    def _candidates(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """(지문 종류, start, end) 후보 생성"""
+        for match in _DIGIT_RUN.finditer(text):
+            yield 'digits', match.start(), match.end()
+            # 공백으로 이어진 숫자 묶음은 토큰별로도 확인
+            if ' ' in match.group():
+                for token in re.finditer(r'\S+', match.group()):
+                    yield 'digits', match.start() + token.start(), match.start() + token.end()
+        for match in _EMAIL.finditer(text):
+            yield 'email', match.start(), match.end()
+        for match in _HANGUL_RUN.finditer(text):
+            # 어절 앞부분 3~4자 중 어절 끝이거나 뒤에 조사/호칭만 붙은 경우만 확인 ("박영희님께" ○, "박영희망" ×)
+            word = match.group()
+            for length in range(MIN_NAME_LENGTH, min(4, len(word)) + 1):
+                if _is_name_tail(word[length:]):
+                    yield 'name', match.start(), match.start() + length
+        for match in _ID_TOKEN.finditer(text):
+            yield 'id', match.start(), match.end()
+
+    def find_known(self, text: str) -> List[PIIMatch]:
+        """
+        텍스트에서 적재 시 이미 확인된 PII 값을 찾아 매치로 반환 (LLM 호출 없음)
+
+        정규화 텍스트에서 조회하는 경우 호출하는 쪽에서 NormalizedText.restore로 원문 위치로 되돌림
+        """
+        if not self._exact:
+            return []
+        matches = []
+        for kind, start, end in self._candidates(text):
+            pii_type = self.lookup(kind, text[start:end])
+            if pii_type is not None:
+                matches.append(PIIMatch(pii_type, text[start:end], start, end,
+                                        confidence=0.99, source="fingerprint"))
+        return matches
+
+    def _read_file(self, path: Path) -> Optional[Dict[bytes, int]]:
+        """지문 파일의 정확 집합 읽기 (형식/솔트가 다르면 None)"""
+        data = path.read_bytes()
+        if len(data) < _HEADER.size:
+            return None
+        magic, salt_check, bits, hashes, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or salt_check != self._salt_check:
+            logger.warning(f"Fingerprint index {path} has a different format or salt, ignoring")
+            return None
+        offset = _HEADER.size + (bits + 7) // 8
+        entries = {}
+        record = _DIGEST_SIZE + 1
+        for i in range(count):
+            start = offset + i * record
+            entries[data[start:start + _DIGEST_SIZE]] = data[start + _DIGEST_SIZE]
+        return entries
+
+    def _write_file(self, path: Path) -> None:
+        tmp_path = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self._salt_check, self.bloom_bits, self.bloom_hashes, len(self._exact)))
+            f.write(bytes(self._bloom))
+            for digest, code in self._exact.items():
+                f.write(digest)
+                f.write(bytes((code,)))
+        os.replace(tmp_path, path)
+
+    def sync(self, path: str) -> None:
+        """디스크의 지문과 합친 뒤 합집합을 다시 저장 (여러 워커가 같은 파일을 공유)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path.with_suffix(path.suffix + ".lock"), "a") as lock_file:
+            if HAS_FCNTL:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                on_disk = None
+                if path.exists():
+                    on_disk = self._read_file(path)
+                    if on_disk is None:
+                        # 솔트/형식이 다른 파일은 덮어쓰지 않음
+                        self._last_sync = time.monotonic()
+                        return
+                with self._lock:
+                    changed = self._dirty
+                    for digest, code in (on_disk or {}).items():
+                        if digest not in self._exact:
+                            self._exact[digest] = code
+                            self._bloom_add(digest)
+                    if changed or on_disk is None or len(on_disk) != len(self._exact):
+                        self._write_file(path)
+                    self._dirty = False
+                    self._last_sync = time.monotonic()
+            finally:
+                if HAS_FCNTL:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def maybe_sync(self, path: Optional[str], interval: float) -> None:
+        """마지막 동기화 후 interval초가 지났으면 동기화 (실패해도 탐지는 계속)"""
+        if not path or time.monotonic() - self._last_sync < interval:
+            return
+        try:
+            self.sync(path)
+        except OSError as e:
+            logger.warning(f"Fingerprint index sync failed: {e}")
+            self._last_sync = time.monotonic()
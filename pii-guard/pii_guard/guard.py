@@ -1,15 +1,115 @@
 # pii_guard/guard.py
-from typing import Dict, List, Any
-from .detector import PIIDetector
+import threading
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Optional, Tuple
+from .detector import PIIDetector, PIIMatch
+from .dedupe import ChunkCache, detect_pii_deduplicated, summarize_dedupe
+from .fingerprint import FingerprintIndex
+from .normalize import NormalizedText
+from .scheduler import PRIORITY_BACKGROUND, cancel_scope, llm_priority, skip_llm
+from .tracing import span
 
+# 차단 기준 PII 위험도 점수
+BLOCK_SCORE = 70
 
-def guard_answer(text: str, detector: PIIDetector = None) -> Dict[str, Any]:
+# 조기 종료 모드에서 LLM PII/인젝션 단계를 동시에 실행하는 스레드풀 (프로세스 공용, 처음 사용할 때 생성)
+_stage_executor: Optional[ThreadPoolExecutor] = None
+_stage_executor_lock = threading.Lock()
+STAGE_WORKERS = 32
+
+
+def _default_detector() -> PIIDetector:
+    """detector=None일 때 사용할 프로세스 공용 탐지기 (호출마다 새로 생성하지 않음)"""
+    from .sdk import default_detector
+    return default_detector()
+
+
+def _get_stage_executor() -> ThreadPoolExecutor:
+    global _stage_executor
+    if _stage_executor is None:
+        with _stage_executor_lock:
+            if _stage_executor is None:
+                _stage_executor = ThreadPoolExecutor(max_workers=STAGE_WORKERS, thread_name_prefix="pii-guard-stage")
+    return _stage_executor
+
+
+def _block_decided(detector: PIIDetector, matches: List[PIIMatch], injection_result: Optional[Dict[str, Any]]) -> bool:
+    """지금까지의 결과만으로 차단이 확정되었는지 (인젝션 탐지 또는 위험도 점수 기준 이상)"""
+    if injection_result is not None and injection_result.get("injection_detected", False):
+        return True
+    return detector.calculate_risk_score(matches) >= BLOCK_SCORE
+
+
+def _llm_pii_stage(detector: PIIDetector, normalized: NormalizedText) -> List[PIIMatch]:
+    with span("llm_pii"):
+        return normalized.restore(detector._detect_pii_llm(normalized.text))
+
+
+def _detect_with_early_exit(text: str, detector: PIIDetector, known_matches: List[PIIMatch],
+                            normalized: NormalizedText = None) -> Tuple[List[PIIMatch], Optional[Dict[str, Any]], bool]:
+    """
+    RegEx/규칙 단계 후 LLM PII·인젝션 단계를 동시에 실행하며 단계가 끝날 때마다 차단 여부를 다시 판단
+
+    차단이 확정되면 남은 LLM 단계를 취소하고 기다리지 않음
+    (슬롯 대기 중이거나 시작 전인 요청은 보내지 않고, 이미 보낸 요청의 결과는 버림)
+
+    Returns:
+        (매치 리스트, 인젝션 판정 (생략되었으면 None), 생략한 단계가 있는지 여부)
+    """
+    if normalized is None:
+        normalized = detector.normalize_text(text)
+    with span("regex"):
+        matches = normalized.restore(detector._detect_pii_regex(normalized.text))
+    with span("merge"):
+        matches = detector._merge_and_deduplicate_matches(matches + known_matches)
+
+    injection_result = None
+    if detector.injection_prefilter is not None:
+        with span("injection_rules"):
+            injection_result = detector.injection_prefilter.check(text)
+
+    stages = []
+    if detector.llm_active():
+        stages.append(("pii", _llm_pii_stage, (detector, normalized)))
+    if injection_result is None:
+        stages.append(("injection", detector._detect_prompt_injection_llm, (text,)))
+
+    if _block_decided(detector, matches, injection_result):
+        return matches, injection_result, bool(stages)
+
+    with cancel_scope() as cancel:
+        # 단계 스레드에도 현재 요청의 우선순위/추적/취소 컨텍스트 적용
+        executor = _get_stage_executor()
+        pending = {
+            executor.submit(contextvars.copy_context().run, stage, *args): name
+            for name, stage, args in stages
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if pending.pop(future) == "pii":
+                    with span("merge"):
+                        matches = detector._merge_and_deduplicate_matches(matches + future.result())
+                else:
+                    injection_result = future.result()
+            if pending and _block_decided(detector, matches, injection_result):
+                cancel.set()
+                return matches, injection_result, True
+
+    return matches, injection_result, False
+
+
+def guard_answer(text: str, detector: PIIDetector = None,
+                 fingerprint_index: FingerprintIndex = None, early_exit: bool = False) -> Dict[str, Any]:
     """
     LLM 답변을 가드하여 PII 체크 및 마스킹/차단 처리
 
     Args:
         text: LLM 답변 텍스트
-        detector: PII 탐지기 (None시 기본 생성)
+        detector: PII 탐지기 (None시 프로세스 공용 기본 탐지기)
+        fingerprint_index: 적재 시 기록한 PII 지문 인덱스 (주어지면 알려진 PII 유출을 즉시 탐지)
+        early_exit: 차단이 확정되면 남은 LLM 단계를 취소하고 바로 차단 (LLM 단계는 동시에 실행)
 
     Returns:
         {
@@ -17,23 +117,51 @@ def guard_answer(text: str, detector: PIIDetector = None) -> Dict[str, Any]:
             "pii_score": 위험도 점수(0-100),
             "blocked": 차단 여부,
             "matches": PII 매치 정보 리스트,
-            "prompt_injection": 프롬프트 인젝션 탐지 결과
+            "prompt_injection": 프롬프트 인젝션 탐지 결과,
+            "known_pii_leak": 적재 시 마스킹한 PII가 답변에 포함되었는지 여부,
+            "early_exit": 차단 확정으로 LLM 단계를 생략했는지 여부
         }
     """
     if detector is None:
-        detector = PIIDetector()
+        detector = _default_detector()
+
+    # 적재 시 확인된 PII 지문 조회 (LLM 없이 O(1) 조회, 탐지와 같은 정규화 텍스트에서 조회)
+    known_matches = []
+    normalized = None
+    if fingerprint_index is not None:
+        normalized = detector.normalize_text(text)
+        with span("fingerprint"):
+            known_matches = normalized.restore(fingerprint_index.find_known(normalized.text))
 
-    # PII 탐지
-    matches = detector.detect_pii(text)
+    exited_early = False
+    if early_exit:
+        matches, injection_result, exited_early = _detect_with_early_exit(text, detector, known_matches, normalized)
+        if injection_result is None:
+            injection_result = {
+                "injection_detected": False,
+                "attack_types": [],
+                "confidence": 0.0,
+                "details": "skipped: response already blocked"
+            }
+    else:
+        # PII 탐지 (알려진 PII만으로 차단이 확정되면 LLM PII 단계 생략)
+        if known_matches and detector.calculate_risk_score(known_matches) >= BLOCK_SCORE:
+            with skip_llm():
+                matches = detector.detect_pii(text, normalized)
+        else:
+            matches = detector.detect_pii(text, normalized)
+        if known_matches:
+            matches = detector._merge_and_deduplicate_matches(matches + known_matches)
 
-    # 프롬프트 인젝션 탐지
-    injection_result = detector.detect_prompt_injection(text)
+        # 프롬프트 인젝션 탐지
+        injection_result = detector.detect_prompt_injection(text)
 
     # 위험도 점수 계산
-    pii_score = detector.calculate_risk_score(matches)
+    with span("score"):
+        pii_score = detector.calculate_risk_score(matches)
 
     # 차단 여부 결정 (PII 70점 이상 또는 프롬프트 인젝션 탐지)
-    blocked = pii_score >= 70 or injection_result.get("injection_detected", False)
+    blocked = pii_score >= BLOCK_SCORE or injection_result.get("injection_detected", False)
 
     if blocked:
         # 차단된 경우
@@ -43,41 +171,103 @@ def guard_answer(text: str, detector: PIIDetector = None) -> Dict[str, Any]:
             answer = "죄송합니다. 개인정보가 포함된 내용으로 인해 응답을 제공할 수 없습니다."
     else:
         # 마스킹 처리
-        answer = detector.mask_pii(text, matches)
+        with span("mask"):
+            answer = detector.mask_pii(text, matches)
 
     return {
         "answer": answer,
         "pii_score": pii_score,
         "blocked": blocked,
         "matches": [match.to_dict() for match in matches],
-        "prompt_injection": injection_result
+        "prompt_injection": injection_result,
+        "known_pii_leak": bool(known_matches),
+        "early_exit": exited_early
     }
 
 
-def scrub_ingest(text: str, detector: PIIDetector = None) -> Dict[str, Any]:
+def scrub_ingest(text: str, detector: PIIDetector = None, chunk_cache: ChunkCache = None,
+                 fingerprint_index: FingerprintIndex = None) -> Dict[str, Any]:
     """
     데이터 적재 단계에서 PII 사전 마스킹 처리
 
     Args:
         text: 원본 콘텐츠 텍스트
-        detector: PII 탐지기 (None시 기본 생성)
+        detector: PII 탐지기 (None시 프로세스 공용 기본 탐지기)
+        chunk_cache: 문단 단위 결과 캐시 (주어지면 반복 문단의 탐지 결과 재사용)
+        fingerprint_index: 주어지면 마스킹한 PII 값의 솔트 해시 지문을 기록 (출력 가드에서 조회)
 
     Returns:
         {
             "scrubbed": 마스킹 처리된 텍스트,
-            "matches": PII 매치 정보 리스트
+            "matches": PII 매치 정보 리스트,
+            "dedupe": 문단 중복 제거 통계 (chunk_cache 사용시)
         }
     """
     if detector is None:
-        detector = PIIDetector()
+        detector = _default_detector()
 
-    # PII 탐지
-    matches = detector.detect_pii(text)
+    # PII 탐지 (적재는 백그라운드 작업이므로 LLM 대기열에서 /guard 뒤로 양보)
+    dedupe_stats = None
+    with llm_priority(PRIORITY_BACKGROUND):
+        if chunk_cache is not None:
+            dedupe_stats = {}
+            matches = detect_pii_deduplicated(text, detector, chunk_cache, dedupe_stats)
+        else:
+            matches = detector.detect_pii(text)
+
+    if fingerprint_index is not None:
+        with span("fingerprint"):
+            fingerprint_index.add_matches(matches)
 
     # 마스킹 처리
-    scrubbed_text = detector.mask_pii(text, matches)
+    with span("mask"):
+        scrubbed_text = detector.mask_pii(text, matches)
 
-    return {
+    result = {
         "scrubbed": scrubbed_text,
         "matches": [match.to_dict() for match in matches]
-    }
\ No newline at end of file
+    }
+    if dedupe_stats is not None:
+        result["dedupe"] = summarize_dedupe(dedupe_stats)
+    return result
+
+
+def scrub_ingest_batch(texts: List[str], detector: PIIDetector = None,
+                       chunk_cache: ChunkCache = None, fingerprint_index: FingerprintIndex = None) -> Dict[str, Any]:
+    """
+    여러 문서를 한 번에 사전 마스킹 (반복되는 머리말/꼬리말 등 문단은 한 번만 탐지)
+
+    Returns:
+        {
+            "results": 문서별 scrub_ingest 결과 리스트,
+            "dedupe": 배치 전체 문단 중복 제거 통계
+        }
+    """
+    if detector is None:
+        detector = _default_detector()
+    if chunk_cache is None:
+        chunk_cache = ChunkCache()
+
+    batch_stats = {}
+    results = []
+    for text in texts:
+        doc_stats = {}
+        with llm_priority(PRIORITY_BACKGROUND):
+            matches = detect_pii_deduplicated(text, detector, chunk_cache, doc_stats)
+        if fingerprint_index is not None:
+            with span("fingerprint"):
+                fingerprint_index.add_matches(matches)
+        with span("mask"):
+            scrubbed = detector.mask_pii(text, matches)
+        results.append({
+            "scrubbed": scrubbed,
+            "matches": [match.to_dict() for match in matches],
+            "dedupe": summarize_dedupe(doc_stats)
+        })
+        for key, value in doc_stats.items():
+            batch_stats[key] = batch_stats.get(key, 0) + value
+
+    return {
+        "results": results,
+        "dedupe": summarize_dedupe(batch_stats)
+    }
@@ -0,0 +1,98 @@
+# pii_guard/health.py
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+_PROBE_TEXT = "테스트 010-1234-5678"
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class HealthMonitor:
+    """
+    백그라운드 헬스 체크 결과 보관
+
+    /health는 probe()가 주기적으로 갱신한 결과를 즉시 반환하므로
+    프로브 요청마다 탐지/LLM 생성을 실행하지 않음
+    """
+
+    def __init__(self, detector, interval: float = 15.0, llm_timeout: float = 2.0):
+        self.detector = detector
+        self.interval = interval
+        self.llm_timeout = llm_timeout
+        self._lock = threading.Lock()
+        self._state: Optional[Dict[str, Any]] = None
+        self.consecutive_failures = 0
+
+    def probe(self) -> Dict[str, Any]:
+        """RegEx 탐지 동작과 Ollama 연결 상태를 확인하여 저장 (LLM 생성 없음)"""
+        started = time.monotonic()
+        try:
+            detector_status = "ready" if self.detector._detect_pii_regex(_PROBE_TEXT) else "warning"
+        except Exception as e:
+            logger.error(f"Health probe detector check failed: {e}")
+            detector_status = "error"
+
+        llm_status = "disabled"
+        if self.detector.use_llm and self.detector.llm_client is not None:
+            llm_status = "ready" if self.detector.llm_client.ping(self.llm_timeout) else "error"
+
+        state = {
+            "detector_status": detector_status,
+            "llm_status": llm_status,
+            "checked_at": _utc_now(),
+            "probe_ms": round(1000 * (time.monotonic() - started), 2),
+            "_checked_monotonic": time.monotonic()
+        }
+        with self._lock:
+            self.consecutive_failures = (
+                self.consecutive_failures + 1 if "error" in (detector_status, llm_status) else 0
+            )
+            self._state = state
+        return state
+
+    @staticmethod
+    def empty_snapshot() -> Dict[str, Any]:
+        """프로브 결과가 아직 없을 때의 상태"""
+        return {
+            "detector_status": "unknown",
+            "llm_status": "unknown",
+            "checked_at": None,
+            "age_seconds": None,
+            "probe_ms": None,
+            "consecutive_failures": 0
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """마지막 프로브 결과 (아직 없으면 unknown)"""
+        with self._lock:
+            state = self._state
+            failures = self.consecutive_failures
+        if state is None:
+            return self.empty_snapshot()
+        return {
+            "detector_status": state["detector_status"],
+            "llm_status": state["llm_status"],
+            "checked_at": state["checked_at"],
+            "age_seconds": round(time.monotonic() - state["_checked_monotonic"], 2),
+            "probe_ms": state["probe_ms"],
+            "consecutive_failures": failures
+        }
+
+    async def run(self) -> None:
+        """interval초마다 스레드풀에서 프로브 실행 (lifespan 태스크로 사용)"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await run_in_threadpool(self.probe)
+            except Exception as e:
+                logger.error(f"Health probe failed: {e}")
@@ -0,0 +1,175 @@
+# pii_guard/incremental.py
+import difflib
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+from .detector import PIIDetector, PIIMatch
+from .scheduler import PRIORITY_BACKGROUND, llm_priority, llm_skipped
+from .tracing import span
+
+
+class ScrubbedDocument:
+    def __init__(self, doc_id: str, text: str, matches: List[PIIMatch]):
+        self.doc_id = doc_id
+        self.text = text
+        self.matches = matches
+
+
+class DocumentStore:
+    """마지막으로 스크럽한 문서 버전 보관소 (워커 프로세스 메모리, LRU)"""
+
+    def __init__(self, max_documents: int = 10000):
+        self.max_documents = max_documents
+        self._documents: "OrderedDict[str, ScrubbedDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, doc_id: str) -> Optional[ScrubbedDocument]:
+        with self._lock:
+            document = self._documents.get(doc_id)
+            if document is not None:
+                self._documents.move_to_end(doc_id)
+            return document
+
+    def put(self, document: ScrubbedDocument) -> None:
+        with self._lock:
+            self._documents[document.doc_id] = document
+            self._documents.move_to_end(document.doc_id)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+    def delete(self, doc_id: str) -> bool:
+        with self._lock:
+            return self._documents.pop(doc_id, None) is not None
+
+    def __len__(self):
+        return len(self._documents)
+
+
+def _line_offsets(lines: List[str]) -> List[int]:
+    """각 줄의 시작 문자 위치 (마지막 원소는 전체 길이)"""
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+    return offsets
+
+
+def _merge_regions(regions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """겹치거나 맞닿은 구간 병합"""
+    merged = []
+    for start, end in sorted(regions):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _diff_document(old_text: str, new_text: str, margin_lines: int):
+    """줄 단위 diff로 재탐지 구간(새 텍스트 기준)과 변경 없는 구간의 오프셋 이동량 계산"""
+    old_lines = old_text.splitlines(keepends=True)
+    new_lines = new_text.splitlines(keepends=True)
+    old_offsets = _line_offsets(old_lines)
+    new_offsets = _line_offsets(new_lines)
+
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+
+    regions = []
+    equal_blocks = []  # (old_start, old_end, shift) 문자 단위
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            equal_blocks.append((old_offsets[i1], old_offsets[i2], new_offsets[j1] - old_offsets[i1]))
+            continue
+        # 변경 구간 앞뒤로 margin_lines 줄만큼 여유를 두어 경계에 걸친 PII도 다시 탐지
+        start_line = max(0, j1 - margin_lines)
+        end_line = min(len(new_lines), j2 + margin_lines)
+        regions.append((new_offsets[start_line], new_offsets[end_line]))
+
+    return _merge_regions(regions), equal_blocks
+
+
+def _shift_unchanged_matches(matches: List[PIIMatch], equal_blocks, regions) -> List[PIIMatch]:
+    """변경되지 않은 블록에 온전히 포함된 기존 매치를 새 위치로 이동 (재탐지 구간과 겹치면 제외)"""
+    block_starts = [block[0] for block in equal_blocks]
+    region_starts = [region[0] for region in regions]
+    shifted = []
+
+    for match in matches:
+        index = bisect_right(block_starts, match.start) - 1
+        if index < 0:
+            continue
+        old_start, old_end, shift = equal_blocks[index]
+        if match.end > old_end:
+            continue
+
+        start, end = match.start + shift, match.end + shift
+        region_index = bisect_left(region_starts, end) - 1
+        if region_index >= 0 and regions[region_index][1] > start:
+            continue  # 재탐지 구간이 새 결과를 제공
+
+        shifted.append(PIIMatch(match.type, match.value, start, end,
+                                confidence=match.confidence, source=match.source))
+    return shifted
+
+
+def rescrub_ingest(doc_id: str, text: str, detector: PIIDetector, store: DocumentStore,
+                   margin_lines: int = 1, fingerprint_index=None) -> Dict[str, Any]:
+    """
+    이전에 스크럽한 문서 버전과 비교하여 변경된 부분만 다시 탐지
+
+    Args:
+        doc_id: 문서 식별자
+        text: 수정된 문서 전체 텍스트
+        detector: PII 탐지기
+        store: 이전 버전 보관소 (없으면 전체 스크럽 후 저장)
+        margin_lines: 변경 구간 앞뒤로 함께 재탐지할 줄 수
+        fingerprint_index: 주어지면 마스킹한 PII 값의 지문을 기록
+
+    Returns:
+        {
+            "doc_id": 문서 식별자,
+            "scrubbed": 마스킹 처리된 텍스트,
+            "matches": PII 매치 정보 리스트 (새 텍스트 기준 위치),
+            "incremental": 이전 버전 기준 증분 처리 여부,
+            "redetected_spans": 다시 탐지한 구간 리스트,
+            "redetected_chars": 다시 탐지한 문자 수
+        }
+    """
+    previous = store.get(doc_id)
+
+    with llm_priority(PRIORITY_BACKGROUND):
+        if previous is None:
+            matches = detector.detect_pii(text)
+            regions = [(0, len(text))] if text else []
+            incremental = False
+        else:
+            with span("diff"):
+                regions, equal_blocks = _diff_document(previous.text, text, margin_lines)
+                matches = _shift_unchanged_matches(previous.matches, equal_blocks, regions)
+            for start, end in regions:
+                for match in detector.detect_pii(text[start:end]):
+                    matches.append(PIIMatch(match.type, match.value, match.start + start, match.end + start,
+                                            confidence=match.confidence, source=match.source))
+            matches = detector._merge_and_deduplicate_matches(matches)
+            incremental = True
+
+    matches.sort(key=lambda x: (x.start, x.end))
+    if fingerprint_index is not None:
+        with span("fingerprint"):
+            fingerprint_index.add_matches(matches)
+    if not llm_skipped():
+        # RegEx 전용 결과는 보관하지 않아 다음 재스크럽이 LLM 결과 기준으로 이루어지게 함
+        store.put(ScrubbedDocument(doc_id, text, matches))
+
+    with span("mask"):
+        scrubbed = detector.mask_pii(text, matches)
+
+    return {
+        "doc_id": doc_id,
+        "scrubbed": scrubbed,
+        "matches": [match.to_dict() for match in matches],
+        "incremental": incremental,
+        "redetected_spans": [list(region) for region in regions],
+        "redetected_chars": sum(end - start for start, end in regions)
+    }
@@ -0,0 +1,155 @@
+# pii_guard/injection.py
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+# 공격 유형별 확실한 공격 패턴 (하나라도 맞으면 LLM 없이 인젝션으로 판정)
+ATTACK_RULES = {
+    'IGNORE_COMMANDS': [
+        r'(이전|위|앞|기존|지금까지)[의에서]*\s*(모든\s*)?(지시|명령|지침|규칙|프롬프트|대화)[가-힣]*\s*(모두\s*|전부\s*)?(무시|잊어|잊고|취소)',
+        r'\b(ignore|disregard|forget|skip)\s+(all\s+|any\s+)?(of\s+)?(the\s+|your\s+)?(previous|prior|above|earlier|preceding|original)\s+'
+        r'(instructions?|prompts?|rules|directions|commands|context)',
+        r'\bforget\s+(everything|all)\s+(you\s+were\s+told|above|before)',
+    ],
+    'SYSTEM_OVERRIDE': [
+        r'시스템\s*(프롬프트|지시|지침|설정|메시지|규칙)[가-힣]*\s*(을|를)?\s*(변경|무시|덮어|재정의|수정|교체)',
+        r'\b(system\s+override|override\s+(the\s+|your\s+)?(system|safety|instructions?)|new\s+system\s+prompt)\b',
+        r'(\[\s*system\s*\]|<\|?\s*system\s*\|?>|###\s*system\b)',
+    ],
+    'ROLE_MANIPULATION': [
+        r'(너|당신|넌)[는은]?\s*(이제(부터)?|지금부터)\s*.{0,20}?(이다|이야|야|입니다|이에요|예요|역할)',
+        # "You are now logged in." 같은 안내문은 제외 (AI/역할을 가리키는 경우만)
+        r'\byou\s+are\s+(now|no\s+longer)\s+(a\s+|an\s+|my\s+|the\s+)?([\w-]+\s+){0,3}'
+        r'(assistant|ai|chatbot|bot|model|gpt|persona|character)\b',
+        r'\byou\s+are\s+no\s+longer\s+(bound|restricted|limited|an?\s+ai)\b',
+        r'\b(pretend|imagine)\s+(to\s+be|you\s+are|that\s+you\s+are)\b',
+        r'\b(act|behave|respond)\s+as\s+(if\s+you\s+were\s+|a\s+|an\s+|my\s+)',
+        r'역할\s*(극|놀이)?[을를]?\s*(맡아|해\s*줘|하라|수행해|바꿔)',
+    ],
+    'JAILBREAK': [
+        r'\b(jailbreak|jail\s*broken|do\s+anything\s+now|developer\s+mode|god\s+mode)\b',
+        r'(?-i:\bDAN\b)',
+        r'탈옥|개발자\s*모드',
+        # "한도 제한 없이 이용 가능" 같은 안내문은 제외 (답변을 요구하거나 AI의 제약을 가리키는 경우만)
+        r'(제약|제한|규칙|필터|검열|안전\s*장치|가이드라인)[가-힣]*\s*(을|를|은|는|에)?\s*(모두\s*|전부\s*)?'
+        r'(우회|해제|풀어|벗어나|없이|무시)[가-힣]*\s*(대답|답변|응답|말해|출력|알려)',
+        r'(너|당신|네)[의가]?\s*(모든\s*)?(제약|제한|규칙|필터|검열|안전\s*장치|가이드라인)[가-힣]*\s*(을|를|은|는)?\s*'
+        r'(모두\s*|전부\s*)?(우회|해제|풀어|벗어나|무시)',
+        r'\bwithout\s+(any\s+)?(restrictions|limitations|filters|censorship|rules|guidelines)\b',
+        r'\b(bypass|disable|remove)\s+(all\s+|any\s+|your\s+|the\s+)?(restrictions|filters|safety|guardrails|guidelines)\b',
+    ],
+    'DATA_EXTRACTION': [
+        r'(시스템\s*프롬프트|내부\s*(지침|설정|규칙|정보|문서)|초기\s*(지시|프롬프트)|숨겨진\s*(지시|프롬프트))[가-힣]*\s*(을|를)?\s*'
+        r'(그대로\s*|전부\s*|모두\s*)?(알려|보여|출력|공개|말해|복사|반복)',
+        r'\b(reveal|show|print|repeat|output|display|leak|tell\s+me)\s+(me\s+)?(your|the)\s+'
+        r'(system\s+prompt|initial\s+prompt|hidden\s+prompt|instructions|internal\s+(rules|data|instructions)|configuration)',
+        r'\b(reveal|show|print|give|tell)\s+(me\s+)?(your|the\s+(system|admin|server))\s+'
+        r'(api\s*keys?|passwords?|secret\s+keys?|access\s+tokens?)\b',
+        # "비밀번호를 알려주지 마세요" 같은 안내문은 제외 (너/시스템/관리자의 비밀 정보를 요구하는 경우만)
+        r'(너|네|당신|시스템|관리자|서버|내부)[의가]?\s*(api\s*키|비밀번호|패스워드|토큰|관리자\s*계정)[가-힣]*\s*(을|를)?\s*'
+        r'(알려|출력|보여|말해)(?!\s*주지|지\s*마)',
+    ],
+    'INSTRUCTION_INJECTION': [
+        r'(새로운|다음의?|추가)\s*(지시|명령|지침)[가-힣]*\s*(을|를)?\s*(따르|수행|실행|이행)',
+        r'\b(new|updated|following|additional)\s+instructions?\s*:',
+        r'\bfrom\s+now\s+on\s*,?\s*(you\s+(are|will\s+(act|respond|answer|ignore))|respond|answer|ignore)\b',
+        # "이제부터 항상 OTP 인증이 필요합니다" 같은 안내문은 제외 (너/답변을 가리키는 경우만)
+        r'(지금|이제)부터\s*(너|당신|넌|모든\s*(답변|대답|응답))',
+    ],
+}
+
+# 공격일 수도 있는 단서 (확실한 패턴은 없지만 단서가 있으면 LLM으로 넘김)
+AMBIGUOUS_CUES = [
+    r'지시|명령|지침|프롬프트|무시|역할|우회|제약|필터|검열|규칙을|비밀|패스워드|관리자|너는|넌\s|당신은|이제부터|지금부터|'
+    r'제한\s*없이',
+    r'시스템\s*(메시지|설정|권한)',
+    # 앞 대화를 무르는 말투와 민감 정보 요구 ("앞에서 말한 건 다 잊어버리고", "비번 알려줘", "명단을 출력해")
+    r'잊어|잊고|잊으|없던\s*(걸|것)으로|신경\s*(쓰지|끄)|상관\s*없이|비번|접속\s*정보|계정\s*정보|명단|목록\s*전체|'
+    r'출력|알려\s*줘|보여\s*줘|말해\s*줘|덤프|\bDB\b',
+    r'\b(instruction|prompt|ignore|disregard|override|pretend|role|jailbreak|bypass|restriction|system|'
+    r'you\s+are|act\s+as|from\s+now|secret|password|confidential|admin|forget|credentials?|dump|database)',
+]
+
+# 문장 끝 반말 명령/요청 어미 (답변 안내문은 "~해 주세요/~하세요"를 쓰므로, 반말 명령은 단서가 없어도 LLM으로 넘김)
+REQUEST_ENDINGS = r'(해|줘|줘요|해라|하라|봐|봐라|내놔|하시오|할\s*것)\s*([.!?~]+|$)'
+
+
+_INVISIBLE = re.compile(r'[\u200b-\u200f\u2060\ufeff]')
+
+
+def normalize_for_rules(text: str) -> str:
+    """전각/호환 문자 정규화, 보이지 않는 문자 제거, 공백 통합"""
+    text = unicodedata.normalize('NFKC', text)
+    text = _INVISIBLE.sub('', text)
+    return re.sub(r'\s+', ' ', text)
+
+
+class InjectionPrefilter:
+    """
+    규칙 기반 프롬프트 인젝션 사전 필터
+
+    - 확실한 공격 패턴이 있으면 즉시 인젝션으로 판정
+    - 공격 단서도 반말 명령/요청 어미도 없는 평범한 안내문만 즉시 정상으로 판정 (확실하지 않으면 정상으로 넘기지 않음)
+    - 그 외(단서만 있는 애매한 텍스트)는 None을 반환하여 LLM 판정으로 넘김
+    """
+
+    def __init__(self):
+        self._rules = {
+            attack_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for attack_type, patterns in ATTACK_RULES.items()
+        }
+        self._cues = re.compile('|'.join(f'(?:{cue})' for cue in AMBIGUOUS_CUES + [REQUEST_ENDINGS]), re.IGNORECASE)
+        self._lock = threading.Lock()
+        self.flagged = 0
+        self.cleared = 0
+        self.escalated = 0
+
+    def check(self, text: str) -> Optional[Dict[str, Any]]:
+        """확실한 경우 detect_prompt_injection과 같은 형식의 결과, 애매하면 None"""
+        normalized = normalize_for_rules(text)
+
+        attack_types: List[str] = []
+        evidence = None
+        for attack_type, patterns in self._rules.items():
+            for pattern in patterns:
+                match = pattern.search(normalized)
+                if match:
+                    attack_types.append(attack_type)
+                    if evidence is None:
+                        evidence = match.group().strip()
+                    break
+
+        if attack_types:
+            self._count("flagged")
+            return {
+                "injection_detected": True,
+                "attack_types": attack_types,
+                "confidence": 0.95 if len(attack_types) > 1 else 0.9,
+                "details": f"Rule prefilter matched {', '.join(attack_types)}: '{evidence}'"
+            }
+
+        if self._cues.search(normalized) is None:
+            self._count("cleared")
+            return {
+                "injection_detected": False,
+                "attack_types": [],
+                "confidence": 0.9,
+                "details": "Rule prefilter: no injection cues"
+            }
+
+        self._count("escalated")
+        return None
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.flagged + self.cleared + self.escalated
+        return {
+            "flagged": self.flagged,
+            "cleared": self.cleared,
+            "escalated": self.escalated,
+            "escalation_ratio": round(self.escalated / total, 4) if total else 0.0
+        }
@@ -1,10 +1,18 @@
 # pii_guard/llm_client.py
 import json
+import time
 import requests
 import asyncio
-from typing import Dict, List, Any, Optional
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
+from .compaction import compact_text
+from .scheduler import LLMScheduler, LLMCancelled, current_priority
+from .anchor import anchor_llm_results
+from .cache import from_offset_entries, to_offset_entries
+
 logger = logging.getLogger(__name__)
 
 # aiohttp를 사용할 수 있는지 확인
@@ -19,16 +27,32 @@ except ImportError:
 class OllamaClient:
     """Ollama LLM 클라이언트"""
 
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "gemma3:12b-it-qat"):
+    def __init__(self, base_url: str = "http://localhost:11434", model: str = "gemma3:12b-it-qat",
+                 num_predict: int = 1024, max_concurrency: int = 2):
         self.base_url = base_url.rstrip('/')
         self.model = model
         self.timeout = 30
-
-    async def generate_async(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        self.num_predict = num_predict
+        # 백엔드 동시 요청 수 제한 + 우선순위 대기열 (가드 요청이 적재 요청보다 먼저 처리)
+        self.scheduler = LLMScheduler(max_concurrency=max_concurrency)
+        # 요청마다 새 연결을 맺지 않도록 동시 요청 수만큼 keep-alive 연결 풀 유지
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(max_concurrency, 1))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        """연결 풀 정리"""
+        self.session.close()
+
+    async def generate_async(self, prompt: str, system_prompt: Optional[str] = None,
+                             priority: Optional[int] = None) -> str:
         """비동기 텍스트 생성"""
         if not HAS_AIOHTTP:
             # aiohttp가 없으면 동기 방식으로 대체
-            return self.generate_sync(prompt, system_prompt)
+            return await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.generate_sync(prompt, system_prompt, priority=priority)
+            )
 
         messages = []
         if system_prompt:
@@ -42,10 +66,15 @@ class OllamaClient:
             "options": {
                 "temperature": 0.1,  # 일관된 응답을 위해 낮은 온도
                 "top_p": 0.9,
-                "num_predict": 1024
+                "num_predict": self.num_predict
             }
         }
 
+        if priority is None:
+            priority = current_priority()
+        # 슬롯 대기는 스레드에서 수행하여 이벤트 루프를 막지 않음
+        await asyncio.get_running_loop().run_in_executor(None, self.scheduler.acquire, priority)
+        started = time.monotonic()
         try:
             async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
                 async with session.post(f"{self.base_url}/api/chat", json=payload) as response:
@@ -58,9 +87,26 @@ class OllamaClient:
         except Exception as e:
             logger.error(f"Ollama connection error: {e}")
             return ""
+        finally:
+            self.scheduler.release(time.monotonic() - started)
 
-    def generate_sync(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        """동기 텍스트 생성"""
+    def ping(self, timeout: float = 2.0) -> bool:
+        """Ollama 서버 응답 여부 확인 (모델 목록 조회, 생성 없음)"""
+        try:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=timeout)
+            return response.status_code == 200
+        except Exception as e:
+            logger.warning(f"Ollama ping failed: {e}")
+            return False
+
+    def generate_sync(self, prompt: str, system_prompt: Optional[str] = None,
+                      num_predict: Optional[int] = None, priority: Optional[int] = None) -> str:
+        """
+        동기 텍스트 생성
+
+        num_predict: 이번 요청의 최대 생성 토큰 수 재정의
+        priority: 스케줄러 우선순위 (None이면 현재 실행 흐름의 llm_priority)
+        """
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -73,32 +119,127 @@ class OllamaClient:
             "options": {
                 "temperature": 0.1,
                 "top_p": 0.9,
-                "num_predict": 1024
+                "num_predict": num_predict or self.num_predict
             }
         }
 
         try:
-            response = requests.post(
-                f"{self.base_url}/api/chat",
-                json=payload,
-                timeout=self.timeout
-            )
+            with self.scheduler.slot(priority):
+                response = self.session.post(
+                    f"{self.base_url}/api/chat",
+                    json=payload,
+                    timeout=self.timeout
+                )
             if response.status_code == 200:
                 result = response.json()
                 return result.get("message", {}).get("content", "").strip()
             else:
                 logger.error(f"Ollama API error: {response.status_code}")
                 return ""
+        except LLMCancelled:
+            logger.debug("Ollama request cancelled before sending")
+            return ""
         except Exception as e:
             logger.error(f"Ollama connection error: {e}")
             return ""
 
 
+def estimate_tokens(text: str) -> float:
+    """토큰 수 근사치 (한글 등 비ASCII 문자 1자 ≈ 1토큰, ASCII 4자 ≈ 1토큰)"""
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return (len(text) - ascii_chars) + ascii_chars / 4
+
+
+def split_windows(text: str, max_tokens: int, overlap_tokens: int) -> List[Tuple[int, str]]:
+    """
+    텍스트를 토큰 예산 내의 겹치는 윈도우로 분할
+
+    Returns:
+        (원문 기준 시작 위치, 윈도우 텍스트) 리스트
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [(0, text)]
+
+    windows = []
+    start = 0
+    length = len(text)
+    while start < length:
+        # 토큰 예산을 채울 때까지 확장
+        budget = 0.0
+        end = start
+        while end < length:
+            cost = 1.0 if ord(text[end]) >= 128 else 0.25
+            if budget + cost > max_tokens:
+                break
+            budget += cost
+            end += 1
+        end = max(end, start + 1)
+
+        # 단어 중간에서 자르지 않도록 윈도우 후반부의 마지막 공백에서 끊음
+        if end < length:
+            cut = max(text.rfind('\n', start, end), text.rfind(' ', start, end))
+            if cut > start + (end - start) // 2:
+                end = cut + 1
+
+        windows.append((start, text[start:end]))
+        if end >= length:
+            break
+
+        # 다음 윈도우는 overlap_tokens만큼 뒤로 겹쳐서 시작
+        overlap_start = end
+        budget = 0.0
+        while overlap_start > start + 1:
+            cost = 1.0 if ord(text[overlap_start - 1]) >= 128 else 0.25
+            if budget + cost > overlap_tokens:
+                break
+            budget += cost
+            overlap_start -= 1
+        space = text.find(' ', overlap_start, end)
+        start = space + 1 if space != -1 else overlap_start
+
+    return windows
+
+
 class LLMPIIDetector:
     """LLM 기반 PII 탐지기"""
 
-    def __init__(self, ollama_client: OllamaClient):
+    # 프롬프트 내용이 바뀌면 올려서 이전 캐시 결과를 무효화
+    PROMPT_VERSION = 1
+
+    def __init__(self, ollama_client: OllamaClient, cache=None, window_tokens: int = 1500,
+                 window_overlap_tokens: int = 100, max_concurrency: int = 4, compaction_radius: int = 0,
+                 batch_max_size: int = 1, batch_max_delay: float = 0.01):
         self.client = ollama_client
+        self.cache = cache  # 선택적 VerdictCache (워커 간 공유 영구 캐시)
+        self.window_tokens = window_tokens  # 윈도우당 입력 토큰 예산
+        self.window_overlap_tokens = window_overlap_tokens  # 윈도우 간 겹침 (경계에 걸친 PII 보호)
+        self.max_concurrency = max_concurrency  # 윈도우 동시 요청 수
+        self.compaction_radius = compaction_radius  # 0보다 크면 의심 신호 주변 구간만 LLM에 전송
+        self.batcher = None  # 선택적 LLMBatcher (동시 요청을 다중 항목 프롬프트로 묶음)
+        if batch_max_size > 1:
+            from .batching import LLMBatcher
+            self.batcher = LLMBatcher(self, max_batch_size=batch_max_size, max_delay=batch_max_delay,
+                                      max_batch_tokens=window_tokens * 2, max_concurrency=max_concurrency)
+
+    def _cache_key(self, kind: str, text: str) -> Optional[str]:
+        """캐시 키 생성 (캐시 미사용시 None)"""
+        if self.cache is None:
+            return None
+        return self.cache.make_key(kind, text, self.client.model, self.PROMPT_VERSION)
+
+    def _cache_get(self, key: Optional[str], text: Optional[str] = None):
+        """캐시 조회 (text가 주어지면 위치만 저장한 PII 결과를 text에서 값을 잘라 복원)"""
+        if key is None:
+            return None
+        cached = self.cache.get(key)
+        if cached is not None and text is not None:
+            return from_offset_entries(text, cached)
+        return cached
+
+    def _cache_set(self, key: Optional[str], value, text: Optional[str] = None) -> None:
+        """캐시 저장 (text가 주어지면 PII 결과는 값 없이 text 기준 위치로 저장)"""
+        if key is not None:
+            self.cache.set(key, to_offset_entries(text, value) if text is not None else value)
 
     def create_pii_detection_prompt(self, text: str) -> tuple[str, str]:
         """PII 탐지용 프롬프트 생성"""
@@ -138,6 +279,23 @@ class LLMPIIDetector:
 
         return system_prompt, user_prompt
 
+    def create_batch_pii_detection_prompt(self, items: List[Tuple[str, str]]) -> tuple[str, str]:
+        """여러 텍스트를 항목 ID와 함께 하나의 프롬프트로 묶은 PII 탐지 프롬프트 생성"""
+        system_prompt, _ = self.create_pii_detection_prompt("")
+        system_prompt += """
+여러 개의 텍스트 항목이 [ITEM id=...] ... [/ITEM] 형태로 주어집니다.
+각 항목을 독립적으로 분석하고 모든 항목에 대해 아래 형식으로 응답하세요 (PII가 없으면 빈 배열):
+{
+  "results": [
+    {"id": "item_id", "pii_detected": [ ... 위와 같은 형식 ... ]}
+  ]
+}
+"""
+        blocks = "\n\n".join(f"[ITEM id={item_id}]\n{text}\n[/ITEM]" for item_id, text in items)
+        user_prompt = f"다음 {len(items)}개 텍스트 항목에서 각각 PII를 탐지하세요:\n\n{blocks}"
+
+        return system_prompt, user_prompt
+
     def create_prompt_injection_detection_prompt(self, text: str) -> tuple[str, str]:
         """프롬프트 인젝션 탐지용 프롬프트 생성"""
         system_prompt = """
@@ -164,96 +322,173 @@ class LLMPIIDetector:
 
         return system_prompt, user_prompt
 
-    async def detect_pii_async(self, text: str) -> List[Dict[str, Any]]:
-        """비동기 PII 탐지"""
-        system_prompt, user_prompt = self.create_pii_detection_prompt(text)
-
-        response = await self.client.generate_async(user_prompt, system_prompt)
-
+    @staticmethod
+    def _load_json_response(response: str) -> Dict[str, Any]:
+        """코드 블록을 제거하고 JSON 응답 파싱"""
+        if response.startswith('```json'):
+            response = response.replace('```json', '').replace('```', '').strip()
+        elif response.startswith('```'):
+            response = response.replace('```', '').strip()
+        return json.loads(response)
+
+    def _parse_pii_response(self, response: str) -> Optional[List[Dict[str, Any]]]:
+        """PII 탐지 응답 파싱 (실패시 None)"""
         try:
-            # JSON 파싱 시도
-            if response.startswith('```json'):
-                response = response.replace('```json', '').replace('```', '').strip()
-            elif response.startswith('```'):
-                response = response.replace('```', '').strip()
-
-            result = json.loads(response)
+            result = self._load_json_response(response)
             return result.get("pii_detected", [])
-        except (json.JSONDecodeError, KeyError) as e:
+        except (json.JSONDecodeError, KeyError, AttributeError) as e:
             logger.error(f"LLM PII detection parsing error: {e}, response: {response}")
-            return []
-
-    async def detect_prompt_injection_async(self, text: str) -> Dict[str, Any]:
-        """비동기 프롬프트 인젝션 탐지"""
-        system_prompt, user_prompt = self.create_prompt_injection_detection_prompt(text)
-
-        response = await self.client.generate_async(user_prompt, system_prompt)
+            return None
 
+    def _parse_batch_pii_response(self, response: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """배치 PII 탐지 응답을 항목 ID별 결과로 파싱 (실패시 None)"""
         try:
-            # JSON 파싱 시도
-            if response.startswith('```json'):
-                response = response.replace('```json', '').replace('```', '').strip()
-            elif response.startswith('```'):
-                response = response.replace('```', '').strip()
-
-            result = json.loads(response)
+            result = self._load_json_response(response)
+            parsed = {}
+            for item in result.get("results", []):
+                if isinstance(item, dict) and isinstance(item.get("pii_detected", []), list):
+                    parsed[str(item.get("id"))] = item.get("pii_detected", [])
+            return parsed
+        except (json.JSONDecodeError, KeyError, AttributeError) as e:
+            logger.error(f"LLM batch PII detection parsing error: {e}, response: {response}")
+            return None
+
+    def _parse_injection_response(self, response: str) -> Optional[Dict[str, Any]]:
+        """프롬프트 인젝션 탐지 응답 파싱 (실패시 None)"""
+        try:
+            result = self._load_json_response(response)
             return {
                 "injection_detected": result.get("injection_detected", False),
                 "attack_types": result.get("attack_types", []),
                 "confidence": result.get("confidence", 0.0),
                 "details": result.get("details", "")
             }
-        except (json.JSONDecodeError, KeyError) as e:
+        except (json.JSONDecodeError, KeyError, AttributeError) as e:
             logger.error(f"LLM injection detection parsing error: {e}, response: {response}")
-            return {
-                "injection_detected": False,
-                "attack_types": [],
-                "confidence": 0.0,
-                "details": "parsing_error"
-            }
+            return None
+
+    @staticmethod
+    def _injection_parsing_error() -> Dict[str, Any]:
+        return {
+            "injection_detected": False,
+            "attack_types": [],
+            "confidence": 0.0,
+            "details": "parsing_error"
+        }
+
+    async def detect_pii_async(self, text: str) -> List[Dict[str, Any]]:
+        """비동기 PII 탐지"""
+        cache_key = self._cache_key("pii", text)
+        cached = self._cache_get(cache_key, text)
+        if cached is not None:
+            return cached
+
+        system_prompt, user_prompt = self.create_pii_detection_prompt(text)
+        response = await self.client.generate_async(user_prompt, system_prompt)
+
+        result = self._parse_pii_response(response)
+        if result is None:
+            return []
+        self._cache_set(cache_key, result, text)
+        return result
+
+    async def detect_prompt_injection_async(self, text: str) -> Dict[str, Any]:
+        """비동기 프롬프트 인젝션 탐지"""
+        cache_key = self._cache_key("injection", text)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        system_prompt, user_prompt = self.create_prompt_injection_detection_prompt(text)
+        response = await self.client.generate_async(user_prompt, system_prompt)
+
+        result = self._parse_injection_response(response)
+        if result is None:
+            return self._injection_parsing_error()
+        self._cache_set(cache_key, result)
+        return result
 
     def detect_pii_sync(self, text: str) -> List[Dict[str, Any]]:
         """동기 PII 탐지 (호환성용)"""
+        cache_key = self._cache_key("pii", text)
+        cached = self._cache_get(cache_key, text)
+        if cached is not None:
+            return cached
+
         # FastAPI 환경에서는 동기 방식으로 직접 LLM 호출
         system_prompt, user_prompt = self.create_pii_detection_prompt(text)
         response = self.client.generate_sync(user_prompt, system_prompt)
 
-        try:
-            if response.startswith('```json'):
-                response = response.replace('```json', '').replace('```', '').strip()
-            elif response.startswith('```'):
-                response = response.replace('```', '').strip()
-
-            result = json.loads(response)
-            return result.get("pii_detected", [])
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.error(f"LLM PII detection parsing error: {e}, response: {response}")
+        result = self._parse_pii_response(response)
+        if result is None:
             return []
+        self._cache_set(cache_key, result, text)
+        return result
+
+    def _build_windows(self, text: str) -> List[Tuple[int, str]]:
+        """LLM에 보낼 (원문 기준 시작 위치, 텍스트) 윈도우 목록 (압축 사용시 의심 구간만)"""
+        if self.compaction_radius > 0:
+            segments = compact_text(text, self.compaction_radius)
+            sent_chars = sum(len(segment) for _, segment in segments)
+            logger.debug(f"LLM prompt compaction: {sent_chars}/{len(text)} chars in {len(segments)} segments")
+        else:
+            segments = [(0, text)]
+
+        windows = []
+        for offset, segment in segments:
+            for window_offset, window in split_windows(segment, self.window_tokens, self.window_overlap_tokens):
+                windows.append((offset + window_offset, window))
+        return windows
+
+    def detect_pii_windows_sync(self, text: str) -> List[Dict[str, Any]]:
+        """
+        긴 텍스트를 토큰 예산 윈도우로 나누어 동시에 PII 탐지 후 원문 기준 위치로 통합
+
+        compaction_radius가 설정되면 의심 신호 주변 구간만 윈도우로 만들며, 신호가 없으면 LLM을 호출하지 않습니다.
+        각 결과의 start/end는 LLM 보고 위치가 아니라 그 결과를 보고한 윈도우 안에서 값을 직접 찾은 위치(+ 윈도우 시작 위치)이며,
+        윈도우 안에서 값이 여러 번 나오면 출현마다 결과를 만들고 윈도우 겹침 구간의 중복은 제거됩니다.
+        (다른 윈도우에 같은 값이 있어도 그 윈도우의 LLM이 보고하지 않았으면 표시하지 않음)
+        """
+        windows = self._build_windows(text)
+        if not windows:
+            return []
+        detect = self.batcher.submit if self.batcher is not None else self.detect_pii_sync
+        if len(windows) == 1:
+            window_results = [detect(windows[0][1])]
+        else:
+            logger.info(f"LLM PII detection split into {len(windows)} windows")
+            # 윈도우 스레드에도 호출자의 LLM 우선순위가 적용되도록 컨텍스트 복사
+            context = contextvars.copy_context()
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(windows)))) as executor:
+                window_results = list(executor.map(
+                    lambda window: context.copy().run(detect, window[1]), windows
+                ))
+
+        # 윈도우별로 보고된 값을 그 윈도우 안에서 찾아 원문 위치로 변환 (윈도우에 없는 값은 제외)
+        merged: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+        for (offset, window), results in zip(windows, window_results):
+            for result in anchor_llm_results(window, results):
+                result["start"] += offset
+                result["end"] += offset
+                key = (str(result.get('type', '')).upper(), result["start"], result["end"])
+                existing = merged.get(key)
+                if existing is None or result.get('confidence', 0) > existing.get('confidence', 0):
+                    merged[key] = result
+        return sorted(merged.values(), key=lambda x: (x["start"], x["end"]))
 
     def detect_prompt_injection_sync(self, text: str) -> Dict[str, Any]:
         """동기 프롬프트 인젝션 탐지 (호환성용)"""
+        cache_key = self._cache_key("injection", text)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         # FastAPI 환경에서는 동기 방식으로 직접 LLM 호출
         system_prompt, user_prompt = self.create_prompt_injection_detection_prompt(text)
         response = self.client.generate_sync(user_prompt, system_prompt)
 
-        try:
-            if response.startswith('```json'):
-                response = response.replace('```json', '').replace('```', '').strip()
-            elif response.startswith('```'):
-                response = response.replace('```', '').strip()
-
-            result = json.loads(response)
-            return {
-                "injection_detected": result.get("injection_detected", False),
-                "attack_types": result.get("attack_types", []),
-                "confidence": result.get("confidence", 0.0),
-                "details": result.get("details", "")
-            }
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.error(f"LLM injection detection parsing error: {e}, response: {response}")
-            return {
-                "injection_detected": False,
-                "attack_types": [],
-                "confidence": 0.0,
-                "details": "parsing_error"
-            }
\ No newline at end of file
+        result = self._parse_injection_response(response)
+        if result is None:
+            return self._injection_parsing_error()
+        self._cache_set(cache_key, result)
+        return result
\ No newline at end of file
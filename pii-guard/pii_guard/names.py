@@ -0,0 +1,220 @@
+# pii_guard/names.py
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 한 글자 성씨 (인구 순 상위 + 이름 맥락에서 자주 나오는 성)
+SINGLE_SURNAMES = (
+    "김이박최정강조윤장임한오서신권황안송류유전홍고문양손배백허남심노하곽성차주우구민원나진지엄채"
+    "변염여추도소석선설마길연방위표명기반라왕금옥육인맹제모탁국어은편용예경봉사부가복태목형계피두"
+    "감음빈동온호범좌팽승간상시갈단견당화창옹순빙종풍근묵해궁평판초점"
+)
+
+# 두 글자 성씨
+COMPOUND_SURNAMES = ("남궁", "제갈", "선우", "황보", "독고", "사공", "서문", "동방", "어금", "망절", "황목")
+
+# 이름(성 제외)에 흔히 쓰이는 음절
+GIVEN_NAME_SYLLABLES = (
+    "가각간갑강개건걸검겸경계고곤공관광교구국군권규균근금기길나남녀년노누늘다단담당대덕도돈동두득라란람랑래량"
+    "려련렬령례로록룡류륜률리린림마만명모목무문미민바반방배백범법변별병보복본봉부분비빈사산삼상새서석선설섭성"
+    "세소솔송수숙순술숭슬승시식신실심아안애야양어언업연열염영예오옥온완왕요용우욱운웅원월위유육윤율은을음의"
+    "이익인일임자작잔장재전점정제조종주준중지직진찬창채천철청초총추춘충치칠탁태택필하학한해행향헌혁현형혜호홍"
+    "화환활황회효후훈휘흠희"
+)
+
+# 이름 앞에 오는 맥락 표현 (뒤에 공백/콜론 허용)
+PREFIX_CUES = (
+    "이름은", "이름이", "이름", "성명은", "성명이", "성명", "성함은", "성함이", "성함", "고객명", "환자명",
+)
+
+# 사람을 가리키는 역할 표현 - 일반 명사가 뒤따르는 경우가 많아(보호자 동의서) 콜론이 있을 때만 이름 앞 맥락으로 인정
+ROLE_PREFIX_CUES = ("고객", "예금주", "수취인", "보호자", "담당자", "신청인")
+
+# 이름 바로 뒤(또는 공백 하나 뒤)에 오는 호칭/직함
+SUFFIX_CUES = (
+    "님", "씨", "고객님", "고객", "선생님", "선생", "군", "양", "학생", "손님", "회원님", "회원", "과장", "대리",
+    "부장", "차장", "팀장", "사원", "주임", "실장", "원장", "교수", "담당자", "환자", "어머님", "아버님",
+)
+
+# 두 글자 후보(성 + 이름 한 글자)를 이름으로 인정하는 호칭 - 직함/역할(고객, 담당자, 팀장)은
+# "신규고객님", "민원담당자", "지원팀장"처럼 일반 명사 뒤에도 붙으므로 님/씨만 인정
+SHORT_SUFFIX_CUES = ("님", "씨")
+
+# 이름 바로 뒤에 붙는 조사/서술격 어미 (맥락 표현이 앞에 있을 때 이름 끝으로 인정)
+PARTICLES = (
+    "이", "가", "은", "는", "을", "를", "의", "에게", "께", "께서", "와", "과", "도", "만", "한테", "이고", "이며",
+    "이다", "입니다", "이에요", "예요", "이라고", "라고", "이랑", "랑", "이야", "야",
+)
+
+# 성씨 + 이름 음절로 이루어졌지만 이름이 아닌 호칭/직함/역할/일반 명사 (호칭이 붙어도 이름 후보에서 제외)
+NON_NAMES = frozenset((
+    # 두 글자
+    "사장", "부장", "차장", "소장", "반장", "이장", "시장", "회장", "원장", "기장", "선장", "국장", "조장", "동장",
+    "상무", "전무", "주임", "선배", "후배", "하나", "모두", "고문", "방장", "지점", "위원", "가장", "의원", "기사",
+    "이사", "감사", "부모", "고객", "회원", "사원", "직원", "교수", "선생", "반원", "조원", "주인", "손님", "형님",
+    "누님", "아버", "어머", "임원", "대표", "고객님",
+    # 직함/역할 앞에 붙는 두 글자 업무 명사 (신규고객님, 민원담당자, 지원팀장, 전산실장, 인사과장)
+    "신규", "우수", "기존", "일반", "우대", "민원", "여신", "수신", "지원", "전산", "인사", "홍보", "상담", "영업",
+    "기업", "기획", "보안", "총무", "전담", "정기", "연체", "안내", "문의", "계약", "대출", "예금", "창구", "심사",
+    "마감", "운영", "관리", "감정",
+    # 세 글자
+    "상담원", "상담사", "은행원", "회사원", "공무원", "연구원", "직원분", "지점장", "부지점장", "센터장", "사용자",
+    "이용자", "가입자", "신청자", "소유자", "보호자", "담당자", "관리자", "운영자", "주인공", "기사분", "설계사",
+    "부모님", "선생님", "사모님", "사장님", "이사장", "조합원", "수령인", "대리인", "상속인", "보증인", "명의자",
+    "예금주", "수취인", "신청인", "거래처", "동의서", "신청서", "확인서", "증명서", "안내문", "계약서",
+))
+
+# 관형형 어미 (소중한 고객님, 바쁘신 손님 - 공백 뒤 호칭으로 이름을 인정하지 않음)
+MODIFIER_ENDINGS = frozenset("한운던할될된는신의")
+
+PREFIX_CONFIDENCE = 0.85
+SUFFIX_CONFIDENCE = 0.9
+BOTH_CONFIDENCE = 0.95
+
+
+def _is_hangul(char: str) -> bool:
+    """완성형 한글 음절 여부"""
+    return "가" <= char <= "힣"
+
+
+class Trie:
+    """문자 단위 트라이 (위치에서 시작하는 모든 키의 끝 위치를 한 번의 순회로 탐색)"""
+
+    _END = ""
+
+    def __init__(self, keys: Iterable[str]):
+        self.root: Dict[str, dict] = {}
+        self.max_length = 0
+        for key in keys:
+            node = self.root
+            for char in key:
+                node = node.setdefault(char, {})
+            node[self._END] = True
+            self.max_length = max(self.max_length, len(key))
+
+    def match_ends(self, text: str, start: int) -> Iterator[int]:
+        """text[start:end]가 키인 end를 짧은 것부터 반환"""
+        node = self.root
+        for position in range(start, min(len(text), start + self.max_length)):
+            node = node.get(text[position])
+            if node is None:
+                return
+            if self._END in node:
+                yield position + 1
+
+
+class KoreanNameDetector:
+    """
+    성씨 트라이 + 이름 음절 사전 + 호칭/맥락 표현으로 한국어 이름 탐지
+
+    - 어절 첫 글자가 성씨인 후보 위치만 컴파일된 문자 클래스로 찾고, 후보에서 짧은 범위(성 2자 + 이름 2자 + 호칭)만 확인
+    - 호칭(님, 씨, 고객 등)이 뒤에 오거나 맥락 표현(이름은, 성함 등)이 앞에 있을 때만 보고 (단어 속 성씨 오탐 방지)
+    - 이름 음절은 GIVEN_NAME_SYLLABLES에 있는 음절만 인정
+    - 두 글자 후보(김수 등)는 님/씨가 바로 붙은 경우만 인정 (일반 단어와 구별하기 어렵고, 직함은 업무 명사 뒤에도 붙음)
+    - 직함/역할 명사(NON_NAMES)는 길이와 관계없이 제외, 띄어 쓴 호칭 앞의 관형형("소중한 고객님")도 제외
+    - 역할 표현(보호자, 담당자 등)은 콜론이 있을 때만 맥락으로 인정 ("보호자: 김철수" ○, "보호자 동의서" ×)
+    """
+
+    def __init__(self, surnames: Iterable[str] = (), given_syllables: Optional[str] = None,
+                 prefix_cues: Iterable[str] = PREFIX_CUES, suffix_cues: Iterable[str] = SUFFIX_CUES,
+                 role_prefix_cues: Iterable[str] = ROLE_PREFIX_CUES,
+                 short_suffix_cues: Iterable[str] = SHORT_SUFFIX_CUES,
+                 particles: Iterable[str] = PARTICLES):
+        surnames = list(surnames) or list(SINGLE_SURNAMES) + list(COMPOUND_SURNAMES)
+        self.surnames = Trie(surnames)
+        self.given_syllables = frozenset(given_syllables or GIVEN_NAME_SYLLABLES)
+        self.suffix_cues = tuple(suffix_cues)
+        self.short_suffix_cues = tuple(short_suffix_cues)
+        self.non_names = NON_NAMES
+        prefix_cues, role_prefix_cues = tuple(prefix_cues), tuple(role_prefix_cues)
+
+        def alternation(words: Iterable[str]) -> str:
+            return "|".join(re.escape(word) for word in sorted(set(words), key=len, reverse=True))
+
+        # 후보 위치: 앞이 한글이 아니고 성씨 + 이름 음절로 시작하는 곳 (두 글자 성씨는 그대로, 한 글자 성씨는 문자 클래스)
+        single = "".join(sorted(surname for surname in set(surnames) if len(surname) == 1))
+        compound = [surname for surname in set(surnames) if len(surname) > 1]
+        self._candidates = re.compile(
+            "(?<![가-힣])(?=(?:" + "|".join([re.escape(surname) for surname in sorted(compound)] + ["[" + single + "]"])
+            + ")[" + "".join(sorted(self.given_syllables)) + "])"
+        )
+        # 이름 앞 맥락 표현 (더 긴 단어의 일부가 아니어야 하고, 이름과는 공백/콜론 최대 3자, 역할 표현은 콜론 필수)
+        self._prefix = re.compile(
+            "(?<![가-힣])(?:(?:" + alternation(prefix_cues) + ")[ \t:：]{0,3}|(?:" + alternation(role_prefix_cues)
+            + ")[ \t]?[:：][ \t]{0,2})$"
+        )
+        self._prefix_window = max(len(cue) for cue in prefix_cues + role_prefix_cues) + 4
+        # 이름 뒤 조사 (조사 뒤는 한글이 아니어야 함)
+        self._particle = re.compile("(?:" + alternation(particles) + ")(?![가-힣])")
+
+    def _has_prefix_cue(self, text: str, start: int) -> bool:
+        """start 앞이 맥락 표현(+ 공백/콜론) 또는 역할 표현 + 콜론으로 끝나는지"""
+        return self._prefix.search(text, max(0, start - self._prefix_window), start) is not None
+
+    def _has_suffix_cue(self, text: str, end: int, allow_space: bool) -> bool:
+        """end 위치(allow_space면 공백 하나 뒤도)에서 호칭이 시작하는지"""
+        if text.startswith(self.suffix_cues, end):
+            return True
+        # 띄어 쓴 호칭 앞의 관형형 ("소중한 고객님")은 이름이 아님
+        return (allow_space and text[end - 1] not in MODIFIER_ENDINGS and text.startswith(" ", end)
+                and text.startswith(self.suffix_cues, end + 1))
+
+    def _ends_word(self, text: str, end: int) -> bool:
+        """이름 뒤가 한글이 아니거나 조사로 이어지는지"""
+        if end >= len(text) or not _is_hangul(text[end]):
+            return True
+        return self._particle.match(text, end) is not None
+
+    def find(self, text: str) -> List[Tuple[int, int, float]]:
+        """(start, end, confidence) 리스트 (위치 순, 겹치지 않음)"""
+        results = []
+        length = len(text)
+        given_syllables = self.given_syllables
+        last_end = 0
+        for candidate in self._candidates.finditer(text):
+            position = candidate.start()
+            if position < last_end:
+                continue
+            found = None
+            prefix = None
+            # 두 글자 성씨부터 확인
+            for surname_end in reversed(list(self.surnames.match_ends(text, position))):
+                for given_length in (2, 1):
+                    end = surname_end + given_length
+                    if end > length or text[surname_end] not in given_syllables or (
+                            given_length == 2 and text[surname_end + 1] not in given_syllables):
+                        continue
+                    full_name = end - position >= 3
+                    if text[position:end] in self.non_names:
+                        continue
+                    suffix = (self._has_suffix_cue(text, end, allow_space=True) if full_name
+                              else text.startswith(self.short_suffix_cues, end))
+                    if not suffix:
+                        if not full_name:
+                            continue
+                        if prefix is None:
+                            prefix = self._has_prefix_cue(text, position)
+                        if not (prefix and self._ends_word(text, end)):
+                            continue
+                    if prefix is None:
+                        prefix = self._has_prefix_cue(text, position)
+                    confidence = BOTH_CONFIDENCE if suffix and prefix else (
+                        SUFFIX_CONFIDENCE if suffix else PREFIX_CONFIDENCE)
+                    found = (position, end, confidence)
+                    break
+                if found:
+                    break
+            if found:
+                results.append(found)
+                last_end = found[1]
+        return results
+
+
+_default_detector: Optional[KoreanNameDetector] = None
+
+
+def default_name_detector() -> KoreanNameDetector:
+    """기본 사전으로 만든 공용 이름 탐지기 (트라이는 읽기 전용이라 스레드 간 공유)"""
+    global _default_detector
+    if _default_detector is None:
+        _default_detector = KoreanNameDetector()
+    return _default_detector
@@ -0,0 +1,92 @@
+# pii_guard/normalize.py
+import re
+from typing import List, Optional, Tuple
+
+# 전각 ASCII(！~～) → ASCII (０１０ → 010, ＠ → @)
+_FOLD_TABLE = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+# 여러 가지 대시/하이픈 → "-"
+_FOLD_TABLE.update({ord(char): "-" for char in "‐‑‒–—―−ーｰ﹣﹘"})
+# 전각/특수 공백 → " "
+_FOLD_TABLE.update({ord(char): " " for char in "\u00a0\u2002\u2003\u2009\u200a\u202f\u3000"})
+
+# 접을 문자가 있는지 확인 (대부분의 입력은 translate 없이 통과)
+_FOLDABLE = re.compile("[" + re.escape("".join(chr(code) for code in _FOLD_TABLE)) + "]")
+
+# 공백으로 벌린 숫자 (한 자리씩 띄운 6자리 이상: "0 1 0 - 1 2 3 4") 또는 숫자 사이 하이픈 앞뒤 공백 ("010 - 1234")
+_SPACED_DIGITS = re.compile(r'(?<![\dA-Za-z])\d(?:(?: | ?- ?)\d){5,}(?![\dA-Za-z])|(?<=\d) +- *(?=\d)|(?<=\d)- +(?=\d)')
+_SPACES = re.compile(r' +')
+# 공백으로 떨어진 숫자가 있는지 확인 (없으면 위 정규식을 실행하지 않음)
+_SPACED_TRIGGER = re.compile(r'\d(?: +-? *|- +)\d')
+
+
+class NormalizedText:
+    """
+    정규화된 텍스트와 원문 위치 대응
+
+    정규화 텍스트의 문자 i는 원문의 문자 offsets[i]에서 온 것 (offsets가 None이면 위치가 원문과 같음)
+    """
+
+    __slots__ = ("original", "text", "offsets")
+
+    def __init__(self, original: str, text: str, offsets: Optional[List[int]] = None):
+        self.original = original
+        self.text = text
+        self.offsets = offsets
+
+    @property
+    def changed(self) -> bool:
+        return self.text is not self.original
+
+    def to_original(self, start: int, end: int) -> Tuple[int, int]:
+        """정규화 텍스트의 [start, end) → 원문의 [start, end)"""
+        if self.offsets is None or start >= end:
+            return start, end
+        return self.offsets[start], self.offsets[end - 1] + 1
+
+    def restore(self, matches: list) -> list:
+        """정규화 텍스트 기준 매치의 위치/값을 원문 기준으로 되돌림 (마스킹은 원문에 적용)"""
+        if not self.changed:
+            return matches
+        for match in matches:
+            match.start, match.end = self.to_original(match.start, match.end)
+            match.span = (match.start, match.end)
+            match.value = self.original[match.start:match.end]
+        return matches
+
+
+def normalize(text: str) -> NormalizedText:
+    """
+    숫자 패턴을 피해 가는 표기를 한 번에 정규화 (정규식마다 변형을 추가하지 않도록 탐지 전에 한 번만 수행)
+
+    - 전각 숫자/영문/기호 → ASCII, 여러 대시 → "-", 특수 공백 → " " (글자 수가 바뀌지 않는 1:1 치환)
+    - 한 자리씩 띄운 숫자와 숫자 사이 하이픈 앞뒤 공백 제거 (제거한 문자만큼 위치 대응표 생성)
+    """
+    folded = text.translate(_FOLD_TABLE) if _FOLDABLE.search(text) else text
+
+    trigger = _SPACED_TRIGGER.search(folded)
+    if trigger is None:
+        return NormalizedText(text, folded)
+
+    pieces = []
+    offsets: Optional[List[int]] = None
+    position = 0
+    for match in _SPACED_DIGITS.finditer(folded, trigger.start()):
+        if offsets is None:
+            offsets = []
+        pieces.append(folded[position:match.start()])
+        offsets.extend(range(position, match.start()))
+        # 구간 안의 공백만 제거하고 남은 문자의 원문 위치 기록
+        kept = match.start()
+        for space in _SPACES.finditer(folded, match.start(), match.end()):
+            pieces.append(folded[kept:space.start()])
+            offsets.extend(range(kept, space.start()))
+            kept = space.end()
+        pieces.append(folded[kept:match.end()])
+        offsets.extend(range(kept, match.end()))
+        position = match.end()
+
+    if offsets is None:
+        return NormalizedText(text, folded)
+    pieces.append(folded[position:])
+    offsets.extend(range(position, len(folded)))
+    return NormalizedText(text, "".join(pieces), offsets)
@@ -0,0 +1,179 @@
+# pii_guard/scheduler.py
+import time
+import heapq
+import itertools
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+# 우선순위 등급 (값이 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0   # 사용자 응답 대기 중인 /guard
+PRIORITY_BACKGROUND = 10   # 대량 적재 /ingest/*
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BACKGROUND: "background",
+}
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+_llm_skipped: contextvars.ContextVar = contextvars.ContextVar("llm_skipped", default=False)
+_llm_cancel: contextvars.ContextVar = contextvars.ContextVar("llm_cancel", default=None)
+
+# 취소 가능한 요청이 슬롯을 기다릴 때 취소 여부를 확인하는 주기(초)
+CANCEL_POLL_INTERVAL = 0.02
+
+
+class LLMCancelled(Exception):
+    """결과가 더 이상 필요 없어 대기 중인 LLM 요청을 보내지 않음"""
+
+
+def current_priority() -> int:
+    """현재 실행 흐름의 LLM 요청 우선순위"""
+    return _current_priority.get()
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """블록 안에서 발생하는 LLM 요청의 우선순위 지정"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def llm_skipped() -> bool:
+    """현재 실행 흐름이 LLM 없이 RegEx만으로 처리 중인지 여부"""
+    return _llm_skipped.get()
+
+
+@contextmanager
+def skip_llm():
+    """블록 안의 탐지를 LLM 없이 RegEx만으로 수행 (과부하 시 성능 저하 모드)"""
+    token = _llm_skipped.set(True)
+    try:
+        yield
+    finally:
+        _llm_skipped.reset(token)
+
+
+def llm_cancelled() -> bool:
+    """현재 실행 흐름의 LLM 요청이 취소되었는지 여부"""
+    event = _llm_cancel.get()
+    return event is not None and event.is_set()
+
+
+@contextmanager
+def cancel_scope():
+    """
+    블록 안(및 여기서 복사한 컨텍스트)의 LLM 요청을 취소할 수 있는 threading.Event 제공
+
+    event.set() 이후 슬롯을 기다리던 요청과 아직 시작하지 않은 요청은 LLMCancelled로 끝남
+    (이미 백엔드로 보낸 요청은 끝날 때까지 실행되지만 결과는 버려짐)
+    """
+    event = threading.Event()
+    token = _llm_cancel.set(event)
+    try:
+        yield event
+    finally:
+        _llm_cancel.reset(token)
+
+
+class LLMScheduler:
+    """공유 LLM 백엔드 요청의 동시 실행 수 제한 + 우선순위 대기열"""
+
+    def __init__(self, max_concurrency: int = 2, history: int = 1000):
+        self.max_concurrency = max_concurrency
+        self._condition = threading.Condition()
+        self._waiting = []  # (priority, seq) 힙
+        self._sequence = itertools.count()
+        self._active = 0
+        self._waits: Dict[int, deque] = {}
+        self._history = history
+        self.completed = 0
+        self.latency = 0.0  # LLM 요청 처리 시간 EWMA(초)
+
+    def acquire(self, priority: Optional[int] = None) -> float:
+        """실행 슬롯을 얻을 때까지 대기 (우선순위가 높은 요청부터, 같은 등급은 도착 순). 대기 시간(초) 반환"""
+        if priority is None:
+            priority = current_priority()
+        cancel = _llm_cancel.get()
+        if cancel is not None and cancel.is_set():
+            raise LLMCancelled()
+        entry = (priority, next(self._sequence))
+        started = time.monotonic()
+        with self._condition:
+            heapq.heappush(self._waiting, entry)
+            while self._waiting[0] != entry or self._active >= self.max_concurrency:
+                if cancel is None:
+                    self._condition.wait()
+                    continue
+                self._condition.wait(CANCEL_POLL_INTERVAL)
+                if cancel.is_set():
+                    # 대기열에서 빼고 다음 대기자가 진행할 수 있게 깨움
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._condition.notify_all()
+                    raise LLMCancelled()
+            heapq.heappop(self._waiting)
+            self._active += 1
+            waited = time.monotonic() - started
+            self._waits.setdefault(priority, deque(maxlen=self._history)).append(waited)
+            # 슬롯이 남아 있으면 다음 대기자도 깨움
+            self._condition.notify_all()
+        return waited
+
+    def release(self, service_time: Optional[float] = None) -> None:
+        """슬롯 반환 (service_time: 슬롯을 점유한 시간, 지연 EWMA 갱신용)"""
+        with self._condition:
+            self._active -= 1
+            self.completed += 1
+            if service_time is not None:
+                self.latency = service_time if self.completed == 1 else 0.8 * self.latency + 0.2 * service_time
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority: Optional[int] = None):
+        """with 블록 동안 실행 슬롯 점유"""
+        self.acquire(priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    def queue_depth(self, priority: Optional[int] = None) -> int:
+        """대기 중인 요청 수 (priority 지정시 해당 등급 이상 우선순위만)"""
+        with self._condition:
+            if priority is None:
+                return len(self._waiting)
+            return sum(1 for waiting_priority, _ in self._waiting if waiting_priority <= priority)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            depth_by_class: Dict[str, int] = {}
+            for waiting_priority, _ in self._waiting:
+                name = PRIORITY_NAMES.get(waiting_priority, str(waiting_priority))
+                depth_by_class[name] = depth_by_class.get(name, 0) + 1
+
+            wait_by_class = {}
+            for waiting_priority, waits in self._waits.items():
+                ordered = sorted(waits)
+                wait_by_class[PRIORITY_NAMES.get(waiting_priority, str(waiting_priority))] = {
+                    "samples": len(ordered),
+                    "avg_ms": round(1000 * sum(ordered) / len(ordered), 2) if ordered else 0.0,
+                    "p95_ms": round(1000 * ordered[int(0.95 * (len(ordered) - 1))], 2) if ordered else 0.0,
+                    "max_ms": round(1000 * ordered[-1], 2) if ordered else 0.0,
+                }
+
+            return {
+                "max_concurrency": self.max_concurrency,
+                "active": self._active,
+                "queue_depth": len(self._waiting),
+                "queue_depth_by_class": depth_by_class,
+                "latency_ms": round(1000 * self.latency, 2),
+                "wait_time": wait_by_class,
+                "completed": self.completed
+            }
@@ -0,0 +1,171 @@
+# pii_guard/sdk.py
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Union
+
+from .detector import PIIDetector
+from .cache import VerdictCache
+from .dedupe import ChunkCache
+from .fingerprint import FingerprintIndex
+from .guard import guard_answer, scrub_ingest, scrub_ingest_batch
+from .incremental import DocumentStore, rescrub_ingest
+from .settings import Settings, get_settings
+
+_default_detector: Optional[PIIDetector] = None
+_default_detector_lock = threading.Lock()
+
+
+def detector_from_settings(settings: Optional[Settings] = None) -> PIIDetector:
+    """설정(PII_GUARD_* 환경변수)으로 PII 탐지기 생성"""
+    settings = settings or get_settings()
+    verdict_cache = None
+    if settings.cache_path:
+        verdict_cache = VerdictCache(
+            settings.cache_path,
+            max_entries=settings.cache_max_entries,
+            max_age=settings.cache_max_age,
+            max_bytes=settings.cache_max_bytes,
+            salt=settings.cache_salt or ""
+        )
+    return PIIDetector(
+        whitelist_path=settings.whitelist_path,
+        use_llm=settings.use_llm,
+        ollama_url=settings.ollama_url,
+        verdict_cache=verdict_cache,
+        llm_options={
+            "window_tokens": settings.llm_window_tokens,
+            "window_overlap_tokens": settings.llm_window_overlap_tokens,
+            "max_concurrency": settings.llm_max_concurrency,
+            "compaction_radius": settings.llm_compaction_radius,
+            "batch_max_size": settings.llm_batch_max_size,
+            "batch_max_delay": settings.llm_batch_max_delay_ms / 1000
+        },
+        client_options={
+            "max_concurrency": settings.llm_backend_concurrency,
+            "num_predict": settings.llm_num_predict
+        },
+        injection_prefilter=settings.injection_prefilter,
+        regex_engine=settings.regex_engine,
+        regex_backend=settings.regex_backend,
+        regex_timeout=settings.regex_timeout_ms / 1000,
+        address_gazetteer=settings.address_gazetteer,
+        normalize=settings.normalize
+    )
+
+
+def default_detector() -> PIIDetector:
+    """프로세스 공용 기본 탐지기 (detector=None 호출마다 탐지기와 LLM 연결 테스트를 새로 만들지 않음)"""
+    global _default_detector
+    if _default_detector is None:
+        with _default_detector_lock:
+            if _default_detector is None:
+                _default_detector = detector_from_settings()
+    return _default_detector
+
+
+class PIIGuard:
+    """
+    프로세스 내 비동기 PII 가드 (HTTP/직렬화 없이 RAG 오케스트레이터에 직접 임베드)
+
+    - 탐지기, 문단 결과 캐시, PII 지문 인덱스, 문서 보관소를 인스턴스 전체에서 공유
+    - 동기 탐지는 전용 스레드풀에서 실행하여 이벤트 루프를 막지 않음 (max_concurrency로 동시 탐지 수 제한)
+    - LLM 호출은 탐지기의 OllamaClient 하나(연결 풀 + 우선순위 스케줄러)를 공유
+
+    사용 예:
+        async with PIIGuard.from_settings() as guard:
+            result = await guard.guard(answer)
+    """
+
+    def __init__(self, detector: Optional[PIIDetector] = None, chunk_cache: Optional[ChunkCache] = None,
+                 fingerprint_index: Optional[FingerprintIndex] = None,
+                 document_store: Optional[DocumentStore] = None, max_concurrency: int = 8,
+                 early_exit: bool = False):
+        self.detector = detector if detector is not None else default_detector()
+        self.chunk_cache = chunk_cache if chunk_cache is not None else ChunkCache()
+        self.fingerprint_index = fingerprint_index
+        self.document_store = document_store if document_store is not None else DocumentStore()
+        self.max_concurrency = max_concurrency
+        self.early_exit = early_exit
+        self._owns_detector = False
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="pii-guard")
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Settings] = None, **options) -> "PIIGuard":
+        """설정으로 탐지기/캐시를 구성한 PIIGuard 생성 (API 서버와 같은 구성)"""
+        settings = settings or get_settings()
+        if settings.ingest_dedupe:
+            options.setdefault("chunk_cache", ChunkCache(max_entries=settings.chunk_cache_max_entries))
+        options.setdefault("document_store", DocumentStore(max_documents=settings.rescrub_max_documents))
+        options.setdefault("max_concurrency", settings.max_concurrent_requests)
+        options.setdefault("early_exit", settings.guard_early_exit)
+        guard = cls(detector=detector_from_settings(settings), **options)
+        guard._owns_detector = True
+        return guard
+
+    async def _run(self, func, *args) -> Any:
+        """동기 함수를 전용 스레드풀에서 실행 (호출자의 llm_priority/skip_llm 컨텍스트 유지)"""
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, context.run, func, *args)
+
+    async def guard(self, text: str) -> Dict[str, Any]:
+        """LLM 답변 가드 (guard_answer와 같은 결과)"""
+        return await self._run(guard_answer, text, self.detector, self.fingerprint_index, self.early_exit)
+
+    async def scrub(self, text: str) -> Dict[str, Any]:
+        """적재 텍스트 사전 마스킹 (scrub_ingest와 같은 결과, 공유 문단 캐시 사용)"""
+        return await self._run(scrub_ingest, text, self.detector, self.chunk_cache, self.fingerprint_index)
+
+    async def scrub_batch(self, texts: List[str]) -> Dict[str, Any]:
+        """여러 문서 일괄 사전 마스킹 (scrub_ingest_batch와 같은 결과)"""
+        return await self._run(scrub_ingest_batch, texts, self.detector, self.chunk_cache, self.fingerprint_index)
+
+    async def rescrub(self, doc_id: str, text: str) -> Dict[str, Any]:
+        """수정된 문서의 변경 구간만 재탐지 (rescrub_ingest와 같은 결과)"""
+        return await self._run(rescrub_ingest, doc_id, text, self.detector, self.document_store,
+                               1, self.fingerprint_index)
+
+    async def guard_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """여러 답변을 동시에 가드 (입력 순서대로 반환)"""
+        return list(await asyncio.gather(*(self.guard(text) for text in texts)))
+
+    async def _stream(self, method, texts: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[Dict[str, Any]]:
+        """입력을 최대 max_concurrency개씩 미리 처리하며 입력 순서대로 결과 산출"""
+        pending: List[asyncio.Task] = []
+        try:
+            if hasattr(texts, "__aiter__"):
+                async for text in texts:
+                    pending.append(asyncio.ensure_future(method(text)))
+                    if len(pending) >= self.max_concurrency:
+                        yield await pending.pop(0)
+            else:
+                for text in texts:
+                    pending.append(asyncio.ensure_future(method(text)))
+                    if len(pending) >= self.max_concurrency:
+                        yield await pending.pop(0)
+            while pending:
+                yield await pending.pop(0)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def guard_stream(self, texts: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[Dict[str, Any]]:
+        """답변 스트림을 가드하여 입력 순서대로 결과 산출"""
+        return self._stream(self.guard, texts)
+
+    def scrub_stream(self, texts: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[Dict[str, Any]]:
+        """적재 문서 스트림을 마스킹하여 입력 순서대로 결과 산출 (전체 문서를 메모리에 모으지 않음)"""
+        return self._stream(self.scrub, texts)
+
+    def close(self) -> None:
+        """스레드풀 정리 (from_settings로 만든 탐지기는 LLM 연결 풀도 정리)"""
+        self._executor.shutdown(wait=True)
+        if self._owns_detector and self.detector.llm_client is not None:
+            self.detector.llm_client.close()
+
+    async def __aenter__(self) -> "PIIGuard":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
@@ -0,0 +1,102 @@
+# pii_guard/serialization.py
+import json
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from .tracing import span
+
+# 선택적 빠른 인코더
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+MEDIA_JSON = "application/json"
+MEDIA_COLUMNAR = "application/vnd.pii-guard.columnar+json"
+MEDIA_MSGPACK = "application/msgpack"
+
+
+def dumps_json(obj: Any) -> bytes:
+    """JSON 직렬화 (orjson이 있으면 사용)"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Accept 헤더에서 지원하는 응답 형식 선택 (msgpack은 설치된 경우만, 기본 JSON)"""
+    if not accept:
+        return MEDIA_JSON
+    for item in accept.split(","):
+        media_type = item.split(";", 1)[0].strip().lower()
+        if media_type == MEDIA_COLUMNAR:
+            return MEDIA_COLUMNAR
+        if media_type in (MEDIA_MSGPACK, "application/x-msgpack") and HAS_MSGPACK:
+            return MEDIA_MSGPACK
+        if media_type in (MEDIA_JSON, "application/*", "*/*"):
+            return MEDIA_JSON
+    return MEDIA_JSON
+
+
+def columnar_matches(matches: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """매치 dict 리스트 → 열 배열 (types, values, starts, ends, confidences, sources)"""
+    return {
+        "types": [match["type"] for match in matches],
+        "values": [match["value"] for match in matches],
+        "starts": [match["span"][0] for match in matches],
+        "ends": [match["span"][1] for match in matches],
+        "confidences": [match["confidence"] for match in matches],
+        "sources": [match["source"] for match in matches],
+    }
+
+
+def to_columnar(result: Dict[str, Any]) -> Dict[str, Any]:
+    """응답의 matches(배치는 문서별 matches)를 열 배열로 바꾼 새 dict (원본은 변경하지 않음)"""
+    converted = dict(result)
+    if isinstance(result.get("matches"), list):
+        converted["matches"] = columnar_matches(result["matches"])
+    if isinstance(result.get("results"), list):
+        converted["results"] = [to_columnar(item) for item in result["results"]]
+    return converted
+
+
+def with_defaults(result: Dict[str, Any], model: Type[BaseModel]) -> Dict[str, Any]:
+    """모델 검증 없이 생략된 선택 필드만 기본값으로 채움 (응답 형태를 모델과 동일하게 유지)"""
+    missing = [name for name in model.model_fields if name not in result]
+    if not missing:
+        return result
+    filled = dict(result)
+    for name in missing:
+        field = model.model_fields[name]
+        if not field.is_required():
+            filled[name] = field.get_default(call_default_factory=True)
+    return filled
+
+
+def render(result: Dict[str, Any], accept: Optional[str], model: Optional[Type[BaseModel]] = None) -> Response:
+    """
+    탐지 결과 dict를 협상된 형식으로 바로 직렬화
+
+    결과는 탐지 코드가 만든 신뢰할 수 있는 dict이므로 pydantic 모델 재검증을 생략함
+    (response_model은 OpenAPI 문서용으로만 사용)
+    """
+    if model is not None:
+        result = with_defaults(result, model)
+    media_type = negotiate(accept)
+    with span("serialize"):
+        if media_type == MEDIA_COLUMNAR:
+            body = dumps_json(to_columnar(result))
+        elif media_type == MEDIA_MSGPACK:
+            body = msgpack.packb(result, use_bin_type=True)
+        else:
+            body = dumps_json(result)
+    return Response(content=body, media_type=media_type, headers={"Vary": "Accept"})
@@ -0,0 +1,70 @@
+# pii_guard/server.py - 운영용 멀티 워커 실행기
+import os
+import logging
+
+import yaml
+import uvicorn
+
+from .settings import ENV_PREFIX, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _export_settings(settings) -> None:
+    """부모 프로세스에서 확정된 설정을 환경변수로 내보내 워커가 동일한 설정을 읽도록 함"""
+    for key, value in settings.to_dict().items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        os.environ[ENV_PREFIX + key.upper()] = str(value)
+
+
+def _preflight(settings) -> None:
+    """
+    워커 기동 전 읽기 전용 설정(화이트리스트) 파일 검증
+
+    탐지기는 만들지 않음 (각 워커가 lifespan에서 자체 탐지기를 생성하므로 부모에서 만들면 기동 비용만 늘어남)
+    지정한 화이트리스트를 읽을 수 없으면 워커를 띄우기 전에 종료 (탐지기는 로드 실패시 빈 화이트리스트로 조용히 동작)
+    """
+    if not settings.whitelist_path:
+        return
+    try:
+        with open(settings.whitelist_path, 'r', encoding='utf-8') as f:
+            whitelist = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise SystemExit(f"Invalid PII_GUARD_WHITELIST_PATH {settings.whitelist_path}: {e}")
+    if not isinstance(whitelist, dict):
+        raise SystemExit(f"Invalid PII_GUARD_WHITELIST_PATH {settings.whitelist_path}: expected a mapping")
+    entries = sum(len(whitelist.get(key) or []) for key in ('phones', 'emails', 'accounts'))
+    logger.info(f"Preflight ok: {entries} whitelist entries")
+
+
+def main() -> None:
+    """설정된 워커 수로 uvicorn 실행 (각 워커는 lifespan에서 자체 탐지기 생성)"""
+    settings = get_settings()
+    logging.basicConfig(level=settings.log_level.upper())
+
+    _preflight(settings)
+    _export_settings(settings)
+
+    logger.info(
+        f"Starting PII Guard on {settings.host}:{settings.port} "
+        f"with {settings.workers} workers (max {settings.max_concurrent_requests} concurrent requests/worker)"
+    )
+    uvicorn.run(
+        "pii_guard.api:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        reload=False,
+        log_level=settings.log_level,
+        backlog=settings.backlog,
+        limit_concurrency=settings.limit_concurrency,
+        limit_max_requests=settings.limit_max_requests,
+        timeout_keep_alive=settings.timeout_keep_alive,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# pii_guard/settings.py
+import os
+import logging
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+ENV_PREFIX = "PII_GUARD_"
+
+
+def _env_str(name: str, default: Optional[str]) -> Optional[str]:
+    """문자열 환경변수 조회"""
+    value = os.getenv(ENV_PREFIX + name)
+    if value is None or value == "":
+        return default
+    return value
+
+
+def _env_int(name: str, default: int) -> int:
+    """정수 환경변수 조회 (파싱 실패시 기본값)"""
+    value = os.getenv(ENV_PREFIX + name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Invalid integer for {ENV_PREFIX + name}: {value!r}, using {default}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """실수 환경변수 조회 (파싱 실패시 기본값)"""
+    value = os.getenv(ENV_PREFIX + name)
+    if value is None or value == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Invalid number for {ENV_PREFIX + name}: {value!r}, using {default}")
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """불리언 환경변수 조회 (1/true/yes/on)"""
+    value = os.getenv(ENV_PREFIX + name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class Settings:
+    """PII Guard 실행 설정 (환경변수 PII_GUARD_* 로 재정의 가능)"""
+
+    def __init__(self):
+        # 서버 설정
+        self.host = _env_str("HOST", "0.0.0.0")
+        self.port = _env_int("PORT", 3000)
+        self.workers = max(1, _env_int("WORKERS", os.cpu_count() or 1))
+        self.log_level = _env_str("LOG_LEVEL", "info")
+
+        # 동시성 제한
+        self.limit_concurrency = _env_int("LIMIT_CONCURRENCY", 0) or None  # 워커당 최대 동시 연결 (초과시 503)
+        self.max_concurrent_requests = max(1, _env_int("MAX_CONCURRENT_REQUESTS", 8))  # 워커당 동시 탐지 작업 수
+        self.backlog = _env_int("BACKLOG", 2048)
+        self.timeout_keep_alive = _env_int("TIMEOUT_KEEP_ALIVE", 5)
+        self.limit_max_requests = _env_int("LIMIT_MAX_REQUESTS", 0) or None  # 워커 재시작 주기 (요청 수)
+
+        # 과부하 제어: 대기 요청 한도 초과시 429, LLM 대기열/지연 임계값 초과시 RegEx 전용 처리
+        self.max_pending_requests = max(1, _env_int("MAX_PENDING_REQUESTS", 64))
+        self.degrade_queue_depth = max(0, _env_int("DEGRADE_QUEUE_DEPTH", 8))
+        # 적재 요청의 LLM 대기열 임계값 (/guard는 자기보다 낮은 우선순위의 적재 대기열로 저하되지 않음)
+        self.degrade_background_queue_depth = max(0, _env_int("DEGRADE_BACKGROUND_QUEUE_DEPTH", 32))
+        self.degrade_latency_ms = max(0.0, _env_float("DEGRADE_LATENCY_MS", 5000.0))
+        # 지연 기준 RegEx 전용 중 LLM 지연을 다시 측정할 시험 요청 간격 (0이면 사용 안 함)
+        self.degrade_probe_interval_ms = max(0.0, _env_float("DEGRADE_PROBE_INTERVAL_MS", 2000.0))
+        self.retry_after = max(1.0, _env_float("RETRY_AFTER", 1.0))
+
+        # 탐지기 설정
+        self.use_llm = _env_bool("USE_LLM", True)
+        self.ollama_url = _env_str("OLLAMA_URL", "http://localhost:11434")
+        self.whitelist_path = _env_str("WHITELIST_PATH", None)
+
+        # LLM 윈도우 분할 (긴 텍스트를 토큰 예산 윈도우로 나누어 동시 요청)
+        self.llm_window_tokens = _env_int("LLM_WINDOW_TOKENS", 1500)
+        self.llm_window_overlap_tokens = _env_int("LLM_WINDOW_OVERLAP_TOKENS", 100)
+        self.llm_max_concurrency = max(1, _env_int("LLM_MAX_CONCURRENCY", 4))
+        # PHONE/EMAIL/CARD/RRN/ACCOUNT RegEx 엔진 (str 또는 UTF-8 바이트에서 탐지하는 bytes)
+        self.regex_engine = _env_str("REGEX_ENGINE", "str")
+        # str 패턴 RegEx 엔진 (re, 패턴별 시간 제한이 있는 regex, 선형 시간 re2 - 미설치시 re)
+        self.regex_backend = _env_str("REGEX_BACKEND", "re")
+        self.regex_timeout_ms = max(1.0, _env_float("REGEX_TIMEOUT_MS", 100.0))
+        # 탐지 전 전각 숫자/여러 대시/띄운 숫자 정규화 (매치 위치는 원문 기준)
+        self.normalize = _env_bool("NORMALIZE", True)
+        # 내장 지명 사전(시/도, 시/군/구, 주요 도로명)에 더할 지명 파일 (한 줄에 하나)
+        self.address_gazetteer = _env_str("ADDRESS_GAZETTEER", None)
+        # 프롬프트 인젝션 규칙 사전 필터 (확실한 정상/공격은 LLM 없이 판정)
+        self.injection_prefilter = _env_bool("INJECTION_PREFILTER", True)
+        # /guard 조기 종료: LLM PII/인젝션 단계를 동시에 실행하고 차단이 확정되면 남은 단계 취소
+        self.guard_early_exit = _env_bool("GUARD_EARLY_EXIT", False)
+        # 공유 LLM 백엔드 동시 요청 수 (대기 요청은 /guard → /ingest 우선순위로 처리)
+        self.llm_backend_concurrency = max(1, _env_int("LLM_BACKEND_CONCURRENCY", 2))
+        # LLM 응답 최대 생성 토큰 수 (탐지 결과 JSON이 잘리지 않을 만큼, 클수록 느린 응답의 상한이 늘어남)
+        self.llm_num_predict = max(1, _env_int("LLM_NUM_PREDICT", 1024))
+        # 마이크로 배치: 짧은 시간 창 안의 탐지 요청을 하나의 프롬프트로 묶음 (1이면 비활성)
+        self.llm_batch_max_size = max(1, _env_int("LLM_BATCH_MAX_SIZE", 1))
+        self.llm_batch_max_delay_ms = max(0.0, _env_float("LLM_BATCH_MAX_DELAY_MS", 10.0))
+        # 프롬프트 압축: 의심 신호 주변 N자만 LLM에 전송 (0이면 전체 텍스트 전송 - 신호 없는 PII도 LLM이 보도록 기본값은 끔)
+        self.llm_compaction_radius = max(0, _env_int("LLM_COMPACTION_RADIUS", 0))
+
+        # 백그라운드 헬스 체크 주기(초)와 Ollama 확인 타임아웃(초)
+        self.health_interval = max(1.0, _env_float("HEALTH_INTERVAL", 15.0))
+        self.health_timeout = max(0.1, _env_float("HEALTH_TIMEOUT", 2.0))
+
+        # 요청별 단계 처리 시간: Server-Timing 응답 헤더, 추적 파일(JSON Lines, 경로 지정시 기록)
+        self.server_timing = _env_bool("SERVER_TIMING", False)
+        self.trace_path = _env_str("TRACE_PATH", None)
+
+        # LLM 판정 영구 캐시 (경로 지정시 활성화, 모든 워커가 같은 파일 공유)
+        self.cache_path = _env_str("CACHE_PATH", None)
+        self.cache_max_entries = _env_int("CACHE_MAX_ENTRIES", 100000)
+        self.cache_max_age = _env_float("CACHE_MAX_AGE", 7 * 24 * 3600)
+        self.cache_max_bytes = _env_int("CACHE_MAX_BYTES", 256 * 1024 * 1024)
+        self.cache_salt = _env_str("CACHE_SALT", None)
+
+        # 적재 문단 중복 제거 (워커당 캐시할 문단 결과 수)
+        self.ingest_dedupe = _env_bool("INGEST_DEDUPE", True)
+        self.chunk_cache_max_entries = _env_int("CHUNK_CACHE_MAX_ENTRIES", 50000)
+
+        # 적재 PII 지문 인덱스 (출력 가드에서 알려진 PII 즉시 탐지)
+        self.fingerprint_enabled = _env_bool("FINGERPRINT_ENABLED", False)
+        self.fingerprint_salt = _env_str("FINGERPRINT_SALT", None)
+        self.fingerprint_path = _env_str("FINGERPRINT_PATH", None)  # 워커 간 공유/재시작 후 유지용 파일
+        self.fingerprint_sync_interval = _env_float("FINGERPRINT_SYNC_INTERVAL", 30.0)
+
+        # 증분 재스크럽 (워커당 보관할 이전 문서 버전 수)
+        self.rescrub_max_documents = _env_int("RESCRUB_MAX_DOCUMENTS", 10000)
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    """프로세스 단위로 한 번만 읽는 설정 인스턴스 반환"""
+    return Settings()
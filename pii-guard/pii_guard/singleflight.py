@@ -0,0 +1,48 @@
+# pii_guard/singleflight.py
+import json
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 요청을 하나의 실행으로 합치고 결과를 모두에게 전달"""
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """요청 텍스트와 옵션으로 키 생성"""
+        payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """진행 중인 같은 키의 실행이 있으면 그 결과를 기다리고, 없으면 새로 실행"""
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # 별도 태스크로 실행하여 최초 요청자가 연결을 끊어도 공유 실행은 계속됨
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            self.executions += 1
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "coalesced_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0
+        }
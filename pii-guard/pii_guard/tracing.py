@@ -0,0 +1,106 @@
+# pii_guard/tracing.py
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# 현재 요청의 Trace (스레드 팬아웃은 copy_context로 같은 Trace에 기록)
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("pii_guard_trace", default=None)
+
+
+class Trace:
+    """요청 하나의 단계별 처리 시간 구간 기록"""
+
+    def __init__(self, name: str = "request"):
+        self.name = name
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: List[Dict[str, Any]] = []
+
+    def record(self, name: str, started: float, ended: float) -> None:
+        """perf_counter 기준 시작/끝 시각으로 구간 추가 (여러 스레드에서 호출 가능)"""
+        span = {
+            "name": name,
+            "start_ms": round((started - self._origin) * 1000, 3),
+            "duration_ms": round((ended - started) * 1000, 3),
+            "thread": threading.current_thread().name
+        }
+        with self._lock:
+            self.spans.append(span)
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._origin) * 1000, 3)
+
+    def timings(self) -> Dict[str, float]:
+        """단계 이름별 처리 시간 합계(ms, 기록 순서 유지) - 같은 이름이 여러 번이면 합산 (병렬 구간은 벽시계 시간보다 클 수 있음)"""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            totals[span["name"]] = round(totals.get(span["name"], 0.0) + span["duration_ms"], 3)
+        return totals
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (단계별 합계 + total)"""
+        metrics = [f"{name};dur={duration}" for name, duration in self.timings().items()]
+        metrics.append(f"total;dur={self.elapsed_ms()}")
+        return ", ".join(metrics)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "total_ms": self.elapsed_ms(),
+            "spans": spans
+        }
+
+
+def current_trace() -> Optional[Trace]:
+    """현재 실행 흐름의 Trace (기록 중이 아니면 None)"""
+    return _current_trace.get()
+
+
+@contextmanager
+def start_trace(name: str = "request") -> Iterator[Trace]:
+    """이 블록 안(및 여기서 복사한 컨텍스트)의 span을 새 Trace에 기록"""
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """처리 단계 시간 기록 (Trace가 없으면 아무것도 하지 않음)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.record(name, started, time.perf_counter())
+
+
+class TraceExporter:
+    """Trace를 로컬 JSON Lines 파일에 추가 기록 (오프라인 분석용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace, **attributes) -> None:
+        record = trace.to_dict()
+        record.update(attributes)
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
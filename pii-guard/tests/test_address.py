@@ -0,0 +1,54 @@
+# tests/test_address.py
+import sys
+import time
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+from pii_guard.address import KoreanAddressDetector, load_gazetteer
+
+
+def addresses(text, detector=None):
+    return [text[start:end] for start, end, _ in (detector or KoreanAddressDetector()).find(text)]
+
+
+def test_structured_addresses_and_postal_codes():
+    """시/도부터 동/호까지 이어지는 주소와 주소 옆 우편번호 탐지"""
+    assert addresses("서울시 강남구 역삼동에 거주합니다.") == ["서울시 강남구 역삼동"]
+    assert addresses("서울특별시 강남구 테헤란로 152 (역삼동), 강남파이낸스센터 10층") == \
+        ["서울특별시 강남구 테헤란로 152 (역삼동)"]
+    assert addresses("경기도 성남시 분당구 정자동 178-1") == ["경기도 성남시 분당구 정자동 178-1"]
+    assert addresses("서울 강남구 테헤란로4길 5 101동 202호로 보내주세요") == ["서울 강남구 테헤란로4길 5 101동 202호"]
+    assert addresses("충청남도 예산군 덕산면 사동리 123") == ["충청남도 예산군 덕산면 사동리 123"]
+    assert addresses("우편번호 06236, 서울시강남구역삼동 123-45") == ["06236", "서울시강남구역삼동 123-45"]
+    assert addresses("부산 해운대구 우동 1408 (48060)") == ["부산 해운대구 우동 1408 (48060)"]
+
+
+def test_region_mentions_and_plain_numbers_are_not_addresses():
+    """지역명만 언급하거나 5자리 숫자만 있는 문장은 탐지하지 않음"""
+    for text in ["서울에서 부산까지", "서울 강남구에 있는 지점", "서울대학교 졸업", "서울 본사로 이동합니다",
+                 "주문번호 12345 처리", "2023년 매출 50000원", "테헤란로에서 만나요"]:
+        assert addresses(text) == [], text
+
+    # 역추적 없이 길이에 선형 (지명/숫자가 반복되는 긴 입력)
+    started = time.perf_counter()
+    KoreanAddressDetector().find("서울 강남구 " * 5000 + "1 " * 5000)
+    assert time.perf_counter() - started < 2.0
+
+
+def test_detector_masks_addresses_and_extra_gazetteer(tmp_path):
+    """RegEx 단계에서 ADDRESS 매치를 내고, 추가 지명 사전으로 읍/면/동에서 시작하는 주소도 탐지"""
+    detector = PIIDetector(use_llm=False)
+    text = "고객 연락처는 010-9876-5432이며, 서울시 강남구 역삼동에 거주합니다. 주문번호 12345"
+
+    matches = detector.detect_pii(text)
+
+    assert detector.mask_pii(text, matches) == "고객 연락처는 <PHONE>이며, <ADDRESS>에 거주합니다. 주문번호 12345"
+
+    gazetteer = tmp_path / "gazetteer.txt"
+    gazetteer.write_text("# 추가 지명\n역삼동\n", encoding="utf-8")
+    custom = KoreanAddressDetector(load_gazetteer(str(gazetteer)))
+    assert addresses("역삼동 823-1 방문", custom) == ["역삼동 823-1"]
+    assert addresses("역삼동 823-1 방문") == []
@@ -0,0 +1,126 @@
+# tests/test_admission.py
+import sys
+import time
+import threading
+from pathlib import Path
+
+import pytest
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.admission import AdmissionController, OverloadedError, MODE_FULL, MODE_REGEX_ONLY
+from pii_guard.detector import PIIDetector
+from pii_guard.scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, LLMScheduler, skip_llm
+
+
+class CountingLLMDetector:
+    """호출 횟수만 세는 가짜 LLM 탐지기"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def detect_pii_windows_sync(self, text):
+        self.calls += 1
+        return []
+
+    def detect_prompt_injection_sync(self, text):
+        self.calls += 1
+        return {"injection_detected": False, "attack_types": [], "confidence": 0.0, "details": ""}
+
+
+def test_degrades_to_regex_only_when_llm_is_backed_up():
+    """LLM 대기열/지연이 임계값을 넘으면 RegEx 전용으로 처리"""
+    admission = AdmissionController(max_pending=4, degrade_queue_depth=3, degrade_latency=2.0)
+
+    assert admission.decide(llm_queue_depth=2, llm_latency=0.5) == MODE_FULL
+    assert admission.decide(llm_queue_depth=3, llm_latency=0.5) == MODE_REGEX_ONLY
+    assert admission.decide(llm_queue_depth=0, llm_latency=2.5) == MODE_REGEX_ONLY
+
+
+def test_rejects_beyond_pending_limit_with_retry_after():
+    """대기 요청이 한도에 도달하면 거절하고 Retry-After를 알려줌"""
+    admission = AdmissionController(max_pending=2, retry_after=1.0)
+
+    with admission.admit():
+        with admission.admit():
+            with pytest.raises(OverloadedError) as excinfo:
+                with admission.admit(llm_latency=2.4):
+                    pass
+    assert excinfo.value.retry_after == 3
+
+    # 처리가 끝나면 다시 수락
+    with admission.admit() as mode:
+        assert mode == MODE_FULL
+    assert admission.stats()["rejected"] == 1
+    assert admission.stats()["pending"] == 0
+
+
+def test_background_queue_does_not_degrade_guard(monkeypatch):
+    """적재 요청이 LLM 대기열에 많이 쌓여 있어도 /guard는 LLM으로 처리하고, 적재는 별도 임계값으로 저하"""
+    from pii_guard import api
+
+    class FakeDetector:
+        llm_client = type("FakeClient", (), {"scheduler": LLMScheduler(max_concurrency=1)})()
+
+    scheduler = FakeDetector.llm_client.scheduler
+    monkeypatch.setattr(api, "detector", FakeDetector())
+    scheduler.acquire(PRIORITY_INTERACTIVE)
+    waiters = [threading.Thread(target=lambda: (scheduler.acquire(PRIORITY_BACKGROUND), scheduler.release()))
+               for _ in range(12)]
+    for waiter in waiters:
+        waiter.start()
+    while scheduler.queue_depth() < 12:
+        time.sleep(0.001)
+
+    try:
+        admission = AdmissionController(degrade_queue_depth=8, degrade_background_queue_depth=10)
+        assert api._llm_load(PRIORITY_INTERACTIVE)[0] == 0
+        assert admission.decide(*api._llm_load(PRIORITY_INTERACTIVE)) == MODE_FULL
+        assert admission.decide(*api._llm_load(PRIORITY_BACKGROUND), background=True) == MODE_REGEX_ONLY
+    finally:
+        scheduler.release()
+        for waiter in waiters:
+            waiter.join()
+
+
+def test_latency_degradation_recovers_through_probes():
+    """지연 기준 RegEx 전용 중에도 간격마다 시험 요청을 LLM으로 보내 백엔드가 빨라지면 회복"""
+    admission = AdmissionController(degrade_latency=2.0, probe_interval=0.01)
+    scheduler = LLMScheduler()
+    scheduler.acquire()
+    scheduler.release(10.0)  # 느린 백엔드
+
+    modes = []
+    for _ in range(50):
+        mode = admission.decide(llm_latency=scheduler.latency)
+        modes.append(mode)
+        if mode == MODE_FULL:
+            # 빨라진 백엔드로 시험 요청 처리
+            scheduler.acquire()
+            scheduler.release(0.05)
+        if scheduler.latency < 2.0:
+            break
+        time.sleep(0.015)
+
+    assert modes[0] == MODE_REGEX_ONLY
+    assert admission.stats()["probes"] >= 1
+    assert scheduler.latency < 2.0
+    assert admission.decide(llm_latency=scheduler.latency) == MODE_FULL
+
+
+def test_skip_llm_bypasses_llm_detection():
+    """RegEx 전용 블록 안에서는 LLM을 호출하지 않음"""
+    detector = PIIDetector(use_llm=False)
+    detector.use_llm = True
+    detector.llm_detector = CountingLLMDetector()
+
+    with skip_llm():
+        matches = detector.detect_pii("연락처는 010-1234-5678입니다")
+        injection = detector.detect_prompt_injection("담당자 지시에 따라 처리하세요")
+    assert detector.llm_detector.calls == 0
+    assert [match.type for match in matches] == ["PHONE"]
+    assert injection["injection_detected"] is False
+
+    detector.detect_pii("연락처는 010-1234-5678입니다")
+    assert detector.llm_detector.calls == 1
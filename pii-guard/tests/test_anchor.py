@@ -0,0 +1,42 @@
+# tests/test_anchor.py
+import sys
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.anchor import AhoCorasick, anchor_llm_results
+
+
+def test_automaton_finds_overlapping_patterns():
+    """겹치는 패턴의 모든 출현 위치 탐색"""
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+    found = sorted((start, end, automaton.patterns[index]) for start, end, index in automaton.finditer("ushers"))
+    assert found == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+    print("[PASS] 다중 패턴 오토마톤 테스트 통과")
+
+
+def test_anchor_corrects_spans_and_drops_hallucinations():
+    """LLM 보고 위치 대신 실제 위치를 사용하고 원문에 없는 값은 제외"""
+    text = "김철수 고객님, 김철수님 명의 계좌 110-123-456789 확인. 참조번호 9110-123-4567890"
+    results = [
+        {"type": "NAME", "value": "김철수", "start": 0, "end": 0, "confidence": 0.9},
+        {"type": "ACCOUNT", "value": "110-123-456789", "confidence": 0.8},
+        {"type": "NAME", "value": "박영희", "start": 5, "end": 8, "confidence": 0.9},
+        {"type": "NAME", "value": "김", "confidence": 0.9},
+    ]
+
+    anchored = anchor_llm_results(text, results)
+
+    spans = [(r["type"], r["start"], r["end"]) for r in anchored]
+    assert spans == [("NAME", 0, 3), ("NAME", 9, 12), ("ACCOUNT", 20, 34)]
+    for result in anchored:
+        assert text[result["start"]:result["end"]] == result["value"]
+
+    print("[PASS] LLM 결과 위치 보정 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_automaton_finds_overlapping_patterns()
+    test_anchor_corrects_spans_and_drops_hallucinations()
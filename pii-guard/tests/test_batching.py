@@ -0,0 +1,79 @@
+# tests/test_batching.py
+import re
+import sys
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.llm_client import LLMPIIDetector
+
+
+class _BatchAwareClient:
+    """배치 프롬프트의 항목별로 '홍길동'을 보고하는 가짜 LLM 클라이언트"""
+
+    def __init__(self, drop_ids=()):
+        self.model = "fake-model"
+        self.num_predict = 256
+        self.calls = []
+        self.drop_ids = set(drop_ids)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _found(text):
+        return [{"type": "NAME", "value": "홍길동", "confidence": 0.9}] if "홍길동" in text else []
+
+    def generate_sync(self, prompt, system_prompt=None, num_predict=None, priority=None):
+        items = re.findall(r'\[ITEM id=(\S+)\]\n(.*?)\n\[/ITEM\]', prompt, re.S)
+        with self._lock:
+            self.calls.append(len(items) or 1)
+        if not items:
+            return json.dumps({"pii_detected": self._found(prompt.split("\n\n", 1)[1])}, ensure_ascii=False)
+        results = [{"id": item_id, "pii_detected": self._found(text)}
+                   for item_id, text in items if item_id not in self.drop_ids]
+        return json.dumps({"results": results}, ensure_ascii=False)
+
+
+def _submit_concurrently(detector, texts):
+    with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+        return list(executor.map(detector.batcher.submit, texts))
+
+
+def test_concurrent_requests_share_one_llm_call():
+    """동시에 들어온 요청들이 하나의 배치 프롬프트로 처리되고 결과가 각자에게 돌아감"""
+    client = _BatchAwareClient()
+    detector = LLMPIIDetector(client, batch_max_size=8, batch_max_delay=0.2)
+    detector.batcher._arrival_interval = 0.0  # 부하 상황 가정: 배치를 채우도록 대기
+
+    texts = [f"고객 홍길동 {i}" if i % 2 == 0 else f"일반 문의 {i}" for i in range(6)]
+    results = _submit_concurrently(detector, texts)
+
+    assert len(client.calls) < len(texts)
+    assert max(client.calls) > 1
+    for text, result in zip(texts, results):
+        assert bool(result) == ("홍길동" in text)
+
+    print("[PASS] 마이크로 배치 테스트 통과")
+    print(f"   - LLM 호출별 항목 수: {client.calls}")
+
+
+def test_missing_batch_items_fall_back_to_single_requests():
+    """배치 응답에서 빠진 항목은 개별 요청으로 다시 처리"""
+    client = _BatchAwareClient(drop_ids={"1"})
+    detector = LLMPIIDetector(client, batch_max_size=4, batch_max_delay=0.2)
+    detector.batcher._arrival_interval = 0.0
+
+    results = _submit_concurrently(detector, ["홍길동 A", "홍길동 B", "홍길동 C"])
+
+    assert all(results)
+    assert detector.batcher.stats()["fallback_items"] >= 1
+
+    print("[PASS] 배치 누락 항목 재시도 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_one_llm_call()
+    test_missing_batch_items_fall_back_to_single_requests()
@@ -0,0 +1,44 @@
+# tests/test_bytescan.py
+import sys
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+
+SAMPLE = (
+    "고객 연락처는 010-1234-5678이고 메일 user@example.com 입니다.\n"
+    "카드 4111 1111 1111 1111 결제, 주민 900101-1234567 확인.\n"
+    "계좌번호: 110-123-456789, 환불 계좌 123-45-678901\n"
+    "번호900101-1234567입니다 (한글에 붙은 값은 경계가 아님)\n"
+    "유선 02-123-4567, 기타 5555-5555-5555-4444"
+)
+
+
+def test_byte_engine_matches_str_engine():
+    """바이트 엔진은 str 엔진과 같은 유형/위치/값을 보고"""
+    str_detector = PIIDetector(use_llm=False)
+    byte_detector = PIIDetector(use_llm=False, regex_engine="bytes")
+
+    expected = [(m.type, m.start, m.end, m.value) for m in str_detector._detect_pii_regex(SAMPLE)]
+    actual = [(m.type, m.start, m.end, m.value) for m in byte_detector._detect_pii_regex(SAMPLE)]
+
+    assert actual == expected
+    assert {"PHONE", "EMAIL", "CARD", "ACCOUNT"} <= {m[0] for m in actual}
+    # 한글에 붙은 숫자는 두 엔진 모두 \b 경계로 보지 않음
+    glued = SAMPLE.index("번호900101") + 2
+    assert not any(m[1] == glued for m in actual)
+
+
+def test_detect_pii_bytes_reports_byte_and_char_offsets():
+    """바이트 입력에서 바이트 위치와 문자 위치를 함께 반환 (memoryview도 허용)"""
+    detector = PIIDetector(use_llm=False)
+    data = SAMPLE.encode("utf-8")
+
+    results = detector.detect_pii_bytes(memoryview(data))
+
+    assert results
+    for match, byte_start, byte_end in results:
+        assert SAMPLE[match.start:match.end] == data[byte_start:byte_end].decode("utf-8")
+        assert match.value in SAMPLE[match.start:match.end]
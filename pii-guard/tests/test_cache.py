@@ -0,0 +1,109 @@
+# tests/test_cache.py
+import sys
+import time
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.cache import VerdictCache
+from pii_guard.llm_client import LLMPIIDetector
+
+
+class _CountingClient:
+    """LLM 호출 횟수를 세는 가짜 클라이언트"""
+
+    def __init__(self, response: str):
+        self.model = "fake-model"
+        self.response = response
+        self.calls = 0
+
+    def generate_sync(self, prompt, system_prompt=None):
+        self.calls += 1
+        return self.response
+
+
+def test_cache_shared_across_instances():
+    """같은 파일을 쓰는 다른 캐시 인스턴스(워커)가 결과를 공유"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "verdicts.db"
+        response = '{"pii_detected": [{"type": "NAME", "value": "김철수", "confidence": 0.9}]}'
+
+        client_a = _CountingClient(response)
+        detector_a = LLMPIIDetector(client_a, cache=VerdictCache(path))
+        first = detector_a.detect_pii_sync("고객 김철수님")
+
+        client_b = _CountingClient(response)
+        detector_b = LLMPIIDetector(client_b, cache=VerdictCache(path))
+        second = detector_b.detect_pii_sync("고객 김철수님")
+
+        assert first == second
+        assert client_a.calls == 1
+        assert client_b.calls == 0, "두 번째 워커가 LLM을 다시 호출했습니다"
+
+        print("[PASS] 워커 간 판정 캐시 공유 테스트 통과")
+
+
+def test_cache_skips_parsing_errors():
+    """파싱 실패한 응답은 캐시하지 않음"""
+    with tempfile.TemporaryDirectory() as tmp:
+        client = _CountingClient("not json")
+        detector = LLMPIIDetector(client, cache=VerdictCache(Path(tmp) / "verdicts.db"))
+
+        assert detector.detect_prompt_injection_sync("안녕하세요")["details"] == "parsing_error"
+        detector.detect_prompt_injection_sync("안녕하세요")
+        assert client.calls == 2
+
+        print("[PASS] 파싱 오류 미캐시 테스트 통과")
+
+
+def test_cache_eviction():
+    """항목 수 및 기간 기준 정리"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = VerdictCache(Path(tmp) / "verdicts.db", max_entries=3, max_age=3600)
+        for i in range(5):
+            cache.set(cache.make_key("pii", f"text-{i}", "m", 1), [i])
+        cache.evict()
+        assert cache.stats()["entries"] == 3
+        assert cache.get(cache.make_key("pii", "text-0", "m", 1)) is None
+        assert cache.get(cache.make_key("pii", "text-4", "m", 1)) == [4]
+
+        cache.max_age = 0.01
+        time.sleep(0.02)
+        cache.evict()
+        assert cache.stats()["entries"] == 0
+
+        print("[PASS] 캐시 정리 테스트 통과")
+
+
+def test_cache_file_has_no_plaintext_pii():
+    """PII 판정은 값 없이 솔트 해시 키와 유형/위치만 파일에 저장하고, 조회 시 텍스트에서 값을 복원"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "verdicts.db"
+        response = '{"pii_detected": [{"type": "PHONE", "value": "010-1234-5678", "confidence": 0.9}]}'
+        text = "고객 연락처 010-1234-5678"
+
+        client = _CountingClient(response)
+        detector = LLMPIIDetector(client, cache=VerdictCache(path, salt="test-salt"))
+        first = detector.detect_pii_sync(text)
+        other_client = _CountingClient(response)
+        second = LLMPIIDetector(other_client, cache=VerdictCache(path, salt="test-salt")).detect_pii_sync(text)
+
+        assert second == first and other_client.calls == 0
+        rows = sqlite3.connect(str(path)).execute("SELECT key, value FROM verdicts").fetchall()
+        assert rows and all("010-1234-5678" not in key + value and "5678" not in value for key, value in rows)
+
+        # 솔트가 다르면 같은 텍스트도 다른 키
+        assert VerdictCache(path, salt="other").make_key("pii", text, "m", 1) != \
+            VerdictCache(path, salt="test-salt").make_key("pii", text, "m", 1)
+
+        print("[PASS] 캐시 파일 평문 PII 미저장 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_cache_shared_across_instances()
+    test_cache_skips_parsing_errors()
+    test_cache_eviction()
+    test_cache_file_has_no_plaintext_pii()
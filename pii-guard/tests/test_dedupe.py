@@ -0,0 +1,70 @@
+# tests/test_dedupe.py
+import sys
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+from pii_guard.guard import scrub_ingest, scrub_ingest_batch
+from pii_guard.dedupe import ChunkCache, split_chunks
+
+
+FOOTER = "문의: 담당자 010-1234-5678 / owner@example.com\n본 문서는 대외비입니다."
+
+
+def test_split_chunks():
+    """빈 줄 기준 문단 분할"""
+    text = "첫 문단\n계속\n\n  \n둘째 문단\n\n셋째"
+    chunks = [text[start:end] for start, end in split_chunks(text)]
+    assert chunks == ["첫 문단\n계속", "둘째 문단", "셋째"]
+
+    print("[PASS] 문단 분할 테스트 통과")
+
+
+def test_dedupe_reuses_repeated_chunks():
+    """반복 문단은 캐시 결과를 재사용하며 위치는 문서 기준으로 보정"""
+    detector = PIIDetector(use_llm=False)
+    texts = [f"본문 {i}번 카드 4532148803436467\n\n{FOOTER}" for i in range(3)]
+
+    batch = scrub_ingest_batch(texts, detector, ChunkCache())
+
+    assert batch["dedupe"]["chunks"] == 6
+    assert batch["dedupe"]["unique_chunks"] == 4
+    for text, result in zip(texts, batch["results"]):
+        assert result == {**scrub_ingest(text, detector), "dedupe": result["dedupe"]}
+
+    print("[PASS] 반복 문단 재사용 테스트 통과")
+    print(f"   - 중복 제거율: {batch['dedupe']['dedupe_ratio']}")
+
+
+def test_cache_misses_are_detected_in_one_call():
+    """캐시에 없는 연속 문단은 detect_pii 한 번으로 탐지하고 문단별로 나눠 캐시"""
+    calls = []
+
+    class CountingDetector(PIIDetector):
+        def detect_pii(self, text, normalized=None):
+            calls.append(text)
+            return super().detect_pii(text, normalized)
+
+    detector = CountingDetector(use_llm=False)
+    cache = ChunkCache()
+    text = "\n\n".join(f"{i}번 고객 카드 4532148803436467" for i in range(5)) + "\n\n" + FOOTER
+
+    result = scrub_ingest_batch([text], detector, cache)["results"][0]
+
+    assert len(calls) == 1
+    assert result["scrubbed"] == detector.mask_pii(text, PIIDetector(use_llm=False).detect_pii(text))
+    assert cache.stats()["entries"] == 6
+
+    # 캐시된 문단 사이의 새 문단만 묶어서 탐지
+    calls.clear()
+    edited = text.replace("2번 고객", "이번 고객").replace("3번 고객", "삼번 고객")
+    scrub_ingest_batch([edited], detector, cache)
+    assert calls == [edited[edited.index("이번"):edited.index("\n\n4번")]]
+
+
+if __name__ == "__main__":
+    test_split_chunks()
+    test_dedupe_reuses_repeated_chunks()
+    test_cache_misses_are_detected_in_one_call()
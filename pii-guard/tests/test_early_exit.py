@@ -0,0 +1,114 @@
+# tests/test_early_exit.py
+import sys
+import time
+import threading
+import contextvars
+from pathlib import Path
+
+import pytest
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+from pii_guard.guard import guard_answer
+from pii_guard.scheduler import LLMCancelled, LLMScheduler, cancel_scope
+
+AMBIGUOUS = "담당자 지시에 따라 처리하세요."
+
+
+class SlowLLMDetector:
+    """단계별 지연과 결과를 지정할 수 있는 가짜 LLM 탐지기"""
+
+    def __init__(self, pii_delay=0.0, pii_results=None, injection_delay=0.0, injected=False):
+        self.pii_delay = pii_delay
+        self.pii_results = pii_results or []
+        self.injection_delay = injection_delay
+        self.injected = injected
+        self.calls = []
+
+    def detect_pii_windows_sync(self, text):
+        self.calls.append("pii")
+        time.sleep(self.pii_delay)
+        return self.pii_results
+
+    def detect_prompt_injection_sync(self, text):
+        self.calls.append("injection")
+        time.sleep(self.injection_delay)
+        return {"injection_detected": self.injected, "attack_types": ["IGNORE_COMMANDS"] if self.injected else [],
+                "confidence": 0.9 if self.injected else 0.1, "details": "fake"}
+
+
+def make_detector(llm):
+    detector = PIIDetector(use_llm=False)
+    detector.use_llm = True
+    detector.llm_detector = llm
+    return detector
+
+
+def test_regex_score_over_threshold_skips_llm():
+    """RegEx 결과만으로 차단 점수를 넘으면 LLM 단계를 시작하지 않음"""
+    llm = SlowLLMDetector()
+    text = ("카드 4111-1111-1111-1111, 5500-0000-0000-0004, 연락처 010-1234-5678, 010-2345-6789, "
+            "010-3456-7890, 메일 user@example.com " + AMBIGUOUS)
+
+    result = guard_answer(text, make_detector(llm), early_exit=True)
+
+    assert result["blocked"] and result["pii_score"] >= 70
+    assert result["early_exit"] is True
+    assert llm.calls == []
+    assert result["prompt_injection"]["details"].startswith("skipped")
+
+
+def test_injection_verdict_cancels_slow_pii_stage():
+    """LLM 인젝션 판정이 먼저 끝나 차단이 확정되면 느린 PII 단계를 기다리지 않음"""
+    llm = SlowLLMDetector(pii_delay=1.0, injected=True)
+
+    started = time.monotonic()
+    result = guard_answer(AMBIGUOUS, make_detector(llm), early_exit=True)
+
+    assert time.monotonic() - started < 0.8
+    assert result["blocked"] and result["early_exit"] is True
+    assert result["prompt_injection"]["injection_detected"] is True
+
+
+def test_waits_for_all_stages_when_not_blocked():
+    """차단되지 않으면 두 LLM 단계 결과를 모두 반영"""
+    llm = SlowLLMDetector(pii_delay=0.05, pii_results=[
+        {"type": "NAME", "value": "홍길동", "start": 0, "end": 3, "confidence": 0.9}
+    ])
+    text = "홍길동 " + AMBIGUOUS
+
+    result = guard_answer(text, make_detector(llm), early_exit=True)
+
+    assert not result["blocked"] and result["early_exit"] is False
+    assert sorted(llm.calls) == ["injection", "pii"]
+    assert result["answer"].startswith("<NAME>")
+
+
+def test_cancel_scope_releases_waiting_request():
+    """취소되면 슬롯을 기다리던 요청은 대기열에서 빠지고 LLMCancelled"""
+    scheduler = LLMScheduler(max_concurrency=1)
+    scheduler.acquire()
+    errors = []
+
+    with cancel_scope() as cancel:
+        def waiter():
+            try:
+                scheduler.acquire()
+            except LLMCancelled as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(waiter,))
+        thread.start()
+        time.sleep(0.05)
+        assert scheduler.queue_depth() == 1
+        cancel.set()
+        thread.join(timeout=1)
+
+    assert len(errors) == 1
+    assert scheduler.queue_depth() == 0
+    with cancel_scope() as cancel:
+        cancel.set()
+        with pytest.raises(LLMCancelled):
+            scheduler.acquire()
@@ -0,0 +1,66 @@
+# tests/test_filescan.py
+import sys
+import tempfile
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+from pii_guard.filescan import scan_file
+
+
+def _write(tmp, content: bytes) -> str:
+    path = Path(tmp) / "export.txt"
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_chunked_scan_matches_whole_text_detection():
+    """작은 청크로 나누어 스캔해도 전체 텍스트 탐지와 같은 결과와 정확한 바이트/문자 위치"""
+    lines = []
+    for i in range(40):
+        lines.append(f"상담 {i}번: 고객 연락처는 010-{1000 + i}-5678 입니다. 메일 user{i}@example.com")
+        lines.append("특이사항 없음. 한글로만 된 긴 상담 메모가 이어집니다.")
+    text = "\n".join(lines)
+    data = text.encode("utf-8")
+    detector = PIIDetector(use_llm=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write(tmp, data)
+        found = list(scan_file(path, detector, chunk_bytes=256, overlap_bytes=64))
+
+    expected = sorted((m.type, m.start, m.end) for m in
+                      detector._merge_and_deduplicate_matches(detector._detect_pii_regex(text)))
+    assert sorted((m.type, m.span[0], m.span[1]) for m in found) == expected
+    assert len([m for m in found if m.type == "PHONE"]) == 40
+    for match in found:
+        assert text[match.span[0]:match.span[1]].strip() == match.value
+        assert data[match.byte_span[0]:match.byte_span[1]].decode("utf-8").strip() == match.value
+
+
+def test_match_split_across_chunk_boundary_is_reported_once():
+    """청크 경계에 걸친 매치는 한 번만 보고"""
+    text = "가" * 30 + " 010-9876-5432 " + "나" * 30
+    data = text.encode("utf-8")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write(tmp, data)
+        # 전화번호 중간에서 청크가 나뉘도록 설정
+        found = [m for m in scan_file(path, chunk_bytes=95, overlap_bytes=32) if m.type == "PHONE"]
+
+    assert len(found) == 1
+    assert found[0].span == (31, 44)
+    assert found[0].byte_span == (91, 104)
+
+
+def test_invalid_bytes_keep_byte_offsets_exact():
+    """잘못된 UTF-8 바이트가 있어도 바이트 위치가 어긋나지 않음"""
+    data = b"\xff\xfe broken " + "연락처 010-1111-2222".encode("utf-8")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write(tmp, data)
+        found = [m for m in scan_file(path) if m.type == "PHONE"]
+
+    assert len(found) == 1
+    assert data[found[0].byte_span[0]:found[0].byte_span[1]] == b"010-1111-2222"
@@ -0,0 +1,125 @@
+# tests/test_fingerprint.py
+import sys
+import tempfile
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+from pii_guard.guard import guard_answer, scrub_ingest
+from pii_guard.fingerprint import FingerprintIndex
+
+
+def test_known_pii_flagged_in_answer():
+    """적재 시 마스킹한 값이 형식을 바꿔 답변에 나와도 지문으로 탐지"""
+    detector = PIIDetector(use_llm=False)
+    index = FingerprintIndex("test-salt", bloom_bits=1 << 16)
+
+    scrub_ingest("담당자 연락처 010-2345-6789, 메일 Kim.CS@Example.com", detector, fingerprint_index=index)
+    assert len(index) == 2
+
+    result = guard_answer("연락처는 010 2345 6789 이고 메일은 kim.cs@example.com 입니다.", detector, index)
+
+    fingerprint_matches = [m for m in result["matches"] if m["source"] == "fingerprint"]
+    assert result["known_pii_leak"] is True
+    assert {m["type"] for m in fingerprint_matches} == {"PHONE", "EMAIL"}
+    assert "010 2345 6789" not in result["answer"]
+
+    clean = guard_answer("영업시간은 09:00-18:00 입니다.", detector, index)
+    assert clean["known_pii_leak"] is False
+
+    print("[PASS] 알려진 PII 지문 탐지 테스트 통과")
+
+
+def test_known_pii_matches_across_normalized_forms():
+    """전각/띄운 숫자로 적재한 값과 답변의 일반 표기를 같은 지문으로 조회 (양방향), 위치는 원문 기준"""
+    detector = PIIDetector(use_llm=False)
+    index = FingerprintIndex("test-salt", bloom_bits=1 << 16)
+    scrub_ingest("연락처 ０１０－１２３４－５６７８", detector, fingerprint_index=index)
+
+    for answer in ["연락처는 010-1234-5678 입니다.", "연락처는 0 1 0 - 1 2 3 4 - 5 6 7 8 입니다."]:
+        result = guard_answer(answer, detector, index)
+        fingerprint_matches = [m for m in result["matches"] if m["source"] == "fingerprint"]
+        assert result["known_pii_leak"] is True, answer
+        assert [m["value"] for m in fingerprint_matches] == [answer[5:-5]]
+        assert [m["span"] for m in fingerprint_matches] == [(5, len(answer) - 5)]
+
+    reverse = FingerprintIndex("test-salt", bloom_bits=1 << 16)
+    scrub_ingest("연락처 010-1234-5678", detector, fingerprint_index=reverse)
+    for answer in ["연락처는 ０１０－１２３４－５６７８ 입니다.", "연락처는 0 1 0 - 1 2 3 4 - 5 6 7 8 입니다."]:
+        assert guard_answer(answer, detector, reverse, early_exit=True)["known_pii_leak"] is True, answer
+
+
+def test_known_pii_block_skips_llm_pii_stage():
+    """알려진 PII만으로 차단 점수를 넘으면 LLM PII 탐지를 호출하지 않음"""
+    calls = []
+
+    class FakeLLM:
+        def detect_pii_windows_sync(self, text):
+            calls.append("pii")
+            return []
+
+        def detect_prompt_injection_sync(self, text):
+            calls.append("injection")
+            return {"injection_detected": False, "attack_types": [], "confidence": 0.1, "details": "fake"}
+
+    detector = PIIDetector(use_llm=False)
+    index = FingerprintIndex("test-salt", bloom_bits=1 << 16)
+    for pii_type, value in [("RRN", "901201-1234567"), ("CARD", "4532-1488-0343-6467"), ("ACCOUNT", "110-234-567890"),
+                            ("PHONE", "010-2345-6789"), ("PHONE", "010-3456-7890")]:
+        index.add(pii_type, value)
+    detector.use_llm = True
+    detector.llm_detector = FakeLLM()
+
+    result = guard_answer("고객 정보: 9012011234567 / 4532 1488 0343 6467 / 110234567890 / 01023456789 / 01034567890",
+                          detector, index)
+
+    assert result["blocked"] is True and result["known_pii_leak"] is True
+    assert "pii" not in calls
+
+
+def test_name_fingerprints_need_word_boundary():
+    """이름 지문은 3자 이상 값만 색인하고, 조사/호칭만 붙은 어절에서만 조회 (일반 단어는 표시하지 않음)"""
+    detector = PIIDetector(use_llm=False)
+    index = FingerprintIndex("test-salt", bloom_bits=1 << 16)
+    scrub_ingest("고객 박영희님의 연락처", detector, fingerprint_index=index)
+    for word in ["신규", "민원", "김수"]:
+        assert index.add("NAME", word) is False
+
+    clean = guard_answer("신규 가입 시 민원 접수는 박영희망 프로젝트 창구에서 받습니다.", detector, index)
+    assert clean["known_pii_leak"] is False
+    assert "<NAME>" not in clean["answer"]
+
+    leak = guard_answer("박영희님께 안내드렸습니다.", detector, index)
+    assert leak["known_pii_leak"] is True
+
+
+def test_fingerprint_sync_between_workers():
+    """같은 파일을 통해 다른 워커의 지문을 공유하고, 솔트가 다르면 무시"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "fingerprints.bin")
+
+        worker_a = FingerprintIndex("shared-salt", bloom_bits=1 << 16)
+        worker_a.add("RRN", "901201-1234567")
+        worker_a.sync(path)
+
+        worker_b = FingerprintIndex("shared-salt", bloom_bits=1 << 16)
+        worker_b.sync(path)
+        assert worker_b.lookup("digits", "9012011234567") == "RRN"
+
+        other_salt = FingerprintIndex("other-salt", bloom_bits=1 << 16)
+        other_salt.sync(path)
+        assert other_salt.lookup("digits", "9012011234567") is None
+        worker_b.sync(path)
+        assert worker_b.lookup("digits", "9012011234567") == "RRN"
+
+        print("[PASS] 지문 파일 동기화 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_known_pii_flagged_in_answer()
+    test_known_pii_matches_across_normalized_forms()
+    test_known_pii_block_skips_llm_pii_stage()
+    test_name_fingerprints_need_word_boundary()
+    test_fingerprint_sync_between_workers()
@@ -0,0 +1,61 @@
+# tests/test_health.py
+import sys
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+from pii_guard.health import HealthMonitor
+
+
+class FakeClient:
+    """ping 결과만 흉내내는 가짜 Ollama 클라이언트 (생성 호출시 실패)"""
+
+    def __init__(self, alive):
+        self.alive = alive
+        self.pings = 0
+
+    def ping(self, timeout=2.0):
+        self.pings += 1
+        return self.alive
+
+    def generate_sync(self, *args, **kwargs):
+        raise AssertionError("health probe must not generate")
+
+
+def test_snapshot_returns_cached_probe_result():
+    """snapshot은 프로브를 다시 실행하지 않고 마지막 결과를 반환"""
+    detector = PIIDetector(use_llm=False)
+    detector.use_llm = True
+    detector.llm_client = FakeClient(alive=True)
+    monitor = HealthMonitor(detector, interval=60)
+
+    assert monitor.snapshot()["detector_status"] == "unknown"
+
+    monitor.probe()
+    for _ in range(5):
+        state = monitor.snapshot()
+    assert detector.llm_client.pings == 1
+    assert state["detector_status"] == "ready"
+    assert state["llm_status"] == "ready"
+    assert state["checked_at"].endswith("Z")
+
+
+def test_llm_outage_is_reported_without_failing_detector():
+    """Ollama가 응답하지 않으면 llm_status만 error로 표시하고 연속 실패 수를 셈"""
+    detector = PIIDetector(use_llm=False)
+    detector.use_llm = True
+    detector.llm_client = FakeClient(alive=False)
+    monitor = HealthMonitor(detector)
+
+    monitor.probe()
+    monitor.probe()
+    state = monitor.snapshot()
+    assert state["detector_status"] == "ready"
+    assert state["llm_status"] == "error"
+    assert state["consecutive_failures"] == 2
+
+    detector.llm_client.alive = True
+    monitor.probe()
+    assert monitor.snapshot()["consecutive_failures"] == 0
@@ -0,0 +1,62 @@
+# tests/test_incremental.py
+import sys
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+from pii_guard.guard import scrub_ingest
+from pii_guard.incremental import DocumentStore, rescrub_ingest
+
+
+ORIGINAL = (
+    "1. 개요\n"
+    "담당자 연락처는 010-1234-5678입니다.\n"
+    "2. 내용\n"
+    "본문은 변경되지 않습니다.\n"
+    "3. 문의\n"
+    "메일: owner@example.com\n"
+)
+
+
+def test_incremental_rescrub_matches_full_scrub():
+    """증분 재스크럽 결과가 전체 스크럽 결과와 동일"""
+    detector = PIIDetector(use_llm=False)
+    store = DocumentStore()
+
+    first = rescrub_ingest("doc-1", ORIGINAL, detector, store)
+    assert first["incremental"] is False
+
+    edited = ORIGINAL.replace("2. 내용\n", "2. 내용 (수정)\n추가 연락처 010-2222-3333\n")
+    second = rescrub_ingest("doc-1", edited, detector, store)
+    full = scrub_ingest(edited, detector)
+
+    assert second["incremental"] is True
+    assert second["scrubbed"] == full["scrubbed"]
+    assert [(m["type"], tuple(m["span"])) for m in second["matches"]] == \
+        [(m["type"], tuple(m["span"])) for m in full["matches"]]
+    assert second["redetected_chars"] < len(edited)
+
+    print("[PASS] 증분 재스크럽 결과 일치 테스트 통과")
+    print(f"   - 재탐지 문자 수: {second['redetected_chars']} / {len(edited)}")
+
+
+def test_incremental_rescrub_drops_removed_pii():
+    """삭제된 줄의 PII는 결과에서 제거"""
+    detector = PIIDetector(use_llm=False)
+    store = DocumentStore()
+
+    rescrub_ingest("doc-2", ORIGINAL, detector, store)
+    edited = ORIGINAL.replace("메일: owner@example.com\n", "메일 문의는 받지 않습니다.\n")
+    result = rescrub_ingest("doc-2", edited, detector, store)
+
+    assert not [m for m in result["matches"] if m["type"] == "EMAIL"]
+    assert [m for m in result["matches"] if m["type"] == "PHONE"]
+
+    print("[PASS] 삭제된 PII 제거 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_incremental_rescrub_matches_full_scrub()
+    test_incremental_rescrub_drops_removed_pii()
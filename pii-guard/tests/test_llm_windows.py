@@ -0,0 +1,137 @@
+# tests/test_llm_windows.py
+import sys
+import json
+import threading
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.llm_client import LLMPIIDetector, estimate_tokens, split_windows
+from pii_guard.compaction import compact_text
+from pii_guard.settings import Settings
+
+
+class _FakeClient:
+    """윈도우에 포함된 '홍길동'을 윈도우 기준 위치로 보고하는 가짜 LLM 클라이언트"""
+
+    def __init__(self):
+        self.model = "fake-model"
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate_sync(self, prompt, system_prompt=None):
+        window = prompt.split("\n\n", 1)[1]
+        with self._lock:
+            self.prompts.append(window)
+        found = []
+        position = window.find("홍길동")
+        while position != -1:
+            found.append({"type": "NAME", "value": "홍길동", "start": position,
+                          "end": position + 3, "confidence": 0.9})
+            position = window.find("홍길동", position + 1)
+        return json.dumps({"pii_detected": found}, ensure_ascii=False)
+
+
+def test_split_windows_respects_budget_and_overlap():
+    """윈도우는 토큰 예산을 넘지 않고 서로 겹치며 원문 전체를 덮음"""
+    text = " ".join(f"문장{i}번입니다" for i in range(300))
+    windows = split_windows(text, max_tokens=200, overlap_tokens=20)
+
+    assert len(windows) > 1
+    covered_until = 0
+    for offset, window in windows:
+        assert text[offset:offset + len(window)] == window
+        assert estimate_tokens(window) <= 200
+        assert offset <= covered_until, "윈도우 사이에 빈 구간이 있습니다"
+        covered_until = offset + len(window)
+    assert covered_until == len(text)
+
+    print("[PASS] 윈도우 분할 테스트 통과")
+    print(f"   - 윈도우 수: {len(windows)}")
+
+
+def test_window_results_map_to_global_offsets():
+    """윈도우별 결과를 원문 위치로 변환하고 겹침 구간 중복 제거"""
+    filler = " ".join("일반 문장입니다" for _ in range(200))
+    text = f"담당 홍길동 {filler} 끝에 홍길동"
+    client = _FakeClient()
+    detector = LLMPIIDetector(client, window_tokens=300, window_overlap_tokens=50, max_concurrency=3)
+
+    results = detector.detect_pii_windows_sync(text)
+
+    assert len(client.prompts) > 1
+    assert [(r["start"], r["end"]) for r in results] == [
+        (3, 6), (len(text) - 3, len(text))
+    ]
+    for result in results:
+        assert text[result["start"]:result["end"]] == "홍길동"
+
+    print("[PASS] 윈도우 결과 위치 변환 테스트 통과")
+
+
+def test_window_results_stay_in_their_window():
+    """한 윈도우에서만 PII로 보고된 값은 다른 윈도우의 같은 값 위치에 표시하지 않음"""
+    class ContextClient(_FakeClient):
+        def generate_sync(self, prompt, system_prompt=None):
+            window = prompt.split("\n\n", 1)[1]
+            with self._lock:
+                self.prompts.append(window)
+            found = [{"type": "NAME", "value": "홍길동", "confidence": 0.9}] if "고객 홍길동" in window else []
+            return json.dumps({"pii_detected": found}, ensure_ascii=False)
+
+    filler = " ".join("일반 문장입니다" for _ in range(200))
+    text = f"고객 홍길동 {filler} 소설 주인공 홍길동"
+    client = ContextClient()
+    detector = LLMPIIDetector(client, window_tokens=300, window_overlap_tokens=50, max_concurrency=3)
+
+    results = detector.detect_pii_windows_sync(text)
+
+    assert len(client.prompts) > 1
+    assert [(r["start"], r["end"]) for r in results] == [(3, 6)]
+
+
+def test_compaction_sends_only_suspicious_regions():
+    """의심 신호 주변 구간만 LLM에 전송하고 결과는 원문 위치로 복원"""
+    filler = " ".join("지점 영업시간은 평일 아홉시부터입니다." for _ in range(40))
+    text = f"{filler} 담당자 홍길동님께 문의하세요. {filler}"
+    client = _FakeClient()
+    detector = LLMPIIDetector(client, compaction_radius=30)
+
+    results = detector.detect_pii_windows_sync(text)
+
+    sent_chars = sum(len(prompt) for prompt in client.prompts)
+    assert sent_chars < len(text) // 4
+    assert len(results) == 1
+    assert text[results[0]["start"]:results[0]["end"]] == "홍길동"
+
+    # 신호가 없는 텍스트는 LLM을 호출하지 않음
+    client.prompts.clear()
+    assert detector.detect_pii_windows_sync(filler) == []
+    assert client.prompts == []
+    assert compact_text(filler) == []
+
+    print("[PASS] 프롬프트 압축 테스트 통과")
+    print(f"   - 전송 문자 수: {sent_chars} / {len(text)}")
+
+
+def test_compaction_off_sends_full_text():
+    """compaction_radius=0(기본값)이면 신호가 없는 텍스트도 전체를 LLM에 보냄 (압축 전과 같은 동작)"""
+    text = "소설 속 홍길동 이야기는 지금도 널리 읽힌다"
+    client = _FakeClient()
+    detector = LLMPIIDetector(client)
+
+    results = detector.detect_pii_windows_sync(text)
+
+    assert compact_text(text) == []
+    assert client.prompts == [text]
+    assert [(r["start"], r["end"]) for r in results] == [(5, 8)]
+    assert Settings().llm_compaction_radius == 0
+
+
+if __name__ == "__main__":
+    test_split_windows_respects_budget_and_overlap()
+    test_window_results_map_to_global_offsets()
+    test_window_results_stay_in_their_window()
+    test_compaction_sends_only_suspicious_regions()
+    test_compaction_off_sends_full_text()
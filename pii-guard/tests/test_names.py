@@ -0,0 +1,46 @@
+# tests/test_names.py
+import sys
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+from pii_guard.names import KoreanNameDetector
+
+
+def names(text):
+    return [text[start:end] for start, end, _ in KoreanNameDetector().find(text)]
+
+
+def test_names_with_honorifics_and_context_cues():
+    """호칭이 뒤에 오거나 맥락 표현이 앞에 있는 이름 탐지 (두 글자 성씨 포함)"""
+    assert names("고객 박영희님의 연락처") == ["박영희"]
+    assert names("제 이름은 김철수이고 나이는 30세") == ["김철수"]
+    assert names("성함: 이영희") == ["이영희"]
+    assert names("남궁민수 고객님, 제갈공명씨, 선우재덕 과장에게") == ["남궁민수", "제갈공명", "선우재덕"]
+    assert names("김수님 안녕하세요") == ["김수"]
+    assert names("보호자: 김철수, 담당자 : 이영희") == ["김철수", "이영희"]
+
+
+def test_surname_words_without_cues_are_not_names():
+    """성씨로 시작하는 일반 단어/직함은 탐지하지 않음"""
+    for text in ["사장님께 보고드립니다", "고객 정보를 확인합니다", "정말 이상하다", "김민준이 왔다",
+                 "이번 정상 고객 안내", "하나님 감사합니다", "이름 변경 신청",
+                 "상담원님께 문의하시거나 지점장님 또는 담당 기사님이 방문합니다. 소중한 고객님 감사합니다.",
+                 "이사님", "부모님", "사용자님", "은행원 씨", "주인공님", "보호자 동의서", "담당자 변경 안내",
+                 "신규고객님", "우수고객님", "민원담당자", "여신담당자", "지원팀장", "전산실장", "인사과장",
+                 "홍보담당자", "상담고객"]:
+        assert names(text) == [], text
+
+
+def test_detector_emits_name_matches_and_masks():
+    """RegEx 단계에서 NAME 매치를 내고 마스킹"""
+    detector = PIIDetector(use_llm=False)
+    text = "고객 박영희님의 연락처는 010-9876-5432입니다."
+
+    matches = detector.detect_pii(text)
+
+    name = [match for match in matches if match.type == "NAME"]
+    assert [(match.value, match.start, match.end) for match in name] == [("박영희", 3, 6)]
+    assert detector.mask_pii(text, matches) == "고객 <NAME>님의 연락처는 <PHONE>입니다."
@@ -0,0 +1,48 @@
+# tests/test_normalize.py
+import sys
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+from pii_guard.normalize import normalize
+
+
+def test_normalize_folds_and_maps_offsets():
+    """전각 숫자/대시 접기와 띄운 숫자 제거, 정규화 위치 → 원문 위치 대응"""
+    assert normalize("전화 ０１０－１２３４－５６７８").text == "전화 010-1234-5678"
+    assert normalize("010 – 1234 ‐ 5678").text == "010-1234-5678"
+
+    normalized = normalize("번호 0 1 0 - 1 2 3 4 - 5 6 7 8로 연락")
+    assert normalized.text == "번호 010-1234-5678로 연락"
+    start = normalized.text.index("010")
+    assert normalized.to_original(start, start + 13) == (3, 28)
+    assert normalized.to_original(0, 2) == (0, 2)
+
+    # 일반 텍스트와 숫자 나열은 그대로 (같은 객체 반환)
+    for text in ["일반 텍스트 010-1234-5678", "2023 12 31", "1 2 3 명"]:
+        assert normalize(text).text is text
+
+
+def test_detector_masks_original_spans():
+    """정규화 텍스트에서 탐지하고 원문 위치/값으로 마스킹"""
+    detector = PIIDetector(use_llm=False)
+    text = "연락처 ０１０－１２３４－５６７８, 0 1 0 - 9 8 7 6 - 5 4 3 2로 연락주세요 user＠example.com"
+
+    matches = detector.detect_pii(text)
+
+    assert [(match.type, match.value) for match in matches] == [
+        ("PHONE", "０１０－１２３４－５６７８"),
+        ("PHONE", "0 1 0 - 9 8 7 6 - 5 4 3 2"),
+        ("EMAIL", "user＠example.com"),
+    ]
+    assert all(text[match.start:match.end] == match.value for match in matches)
+    assert detector.mask_pii(text, matches) == "연락처 <PHONE>, <PHONE>로 연락주세요 <EMAIL>"
+
+
+def test_normalize_can_be_disabled():
+    """normalize=False면 원문 그대로 탐지"""
+    detector = PIIDetector(use_llm=False, normalize=False)
+
+    assert detector.detect_pii("전화 ０１０－１２３４－５６７８") == []
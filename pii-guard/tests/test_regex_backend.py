@@ -0,0 +1,54 @@
+# tests/test_regex_backend.py
+import sys
+import builtins
+from pathlib import Path
+
+import pytest
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector, RegexBackend, create_regex_backend
+
+TEXT = ("제 번호는 010-1234-5678이고 이메일은 user@example.com, 카드 4111-1111-1111-1111, "
+        "계좌번호: 123-456-7890123, 사번: EMP-20231 담당자 John Smith")
+
+
+def keys(detector):
+    return [(match.type, match.value, match.start, match.end) for match in detector._detect_pii_regex(TEXT)]
+
+
+def test_regex_module_backend_matches_re():
+    """regex 모듈 엔진은 re와 같은 매치를 냄"""
+    pytest.importorskip("regex")
+    detector = PIIDetector(use_llm=False, regex_backend="regex")
+
+    assert detector.regex_backend.name == "regex"
+    assert keys(detector) == keys(PIIDetector(use_llm=False))
+
+
+def test_regex_timeout_skips_pattern_instead_of_hanging():
+    """시간 제한을 넘은 패턴은 남은 매치를 생략하고 횟수를 기록"""
+    pytest.importorskip("regex")
+    backend = create_regex_backend("regex", timeout=0.001)
+    pattern = backend.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+    assert list(backend.finditer(pattern, ("a." * 20000) + "@")) == []
+    assert backend.timeouts == 1
+
+
+def test_missing_backend_falls_back_to_re(monkeypatch):
+    """선택한 엔진 모듈이 없으면 re 사용, 알 수 없는 이름은 오류"""
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name in ("regex", "re2"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+
+    assert type(create_regex_backend("re2")) is RegexBackend
+    assert type(create_regex_backend("regex")) is RegexBackend
+    with pytest.raises(ValueError):
+        create_regex_backend("pcre")
@@ -0,0 +1,85 @@
+# tests/test_scheduler.py
+import sys
+import time
+import threading
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.scheduler import (
+    LLMScheduler, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, current_priority, llm_priority
+)
+
+
+def _wait_for_depth(scheduler, depth):
+    deadline = time.monotonic() + 2
+    while scheduler.queue_depth() < depth and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_interactive_requests_run_before_queued_background_requests():
+    """슬롯이 비면 먼저 대기한 적재 요청보다 가드 요청이 먼저 실행됨"""
+    scheduler = LLMScheduler(max_concurrency=1)
+    order = []
+
+    def worker(name, priority):
+        with scheduler.slot(priority):
+            order.append(name)
+
+    scheduler.acquire(PRIORITY_BACKGROUND)  # 실행 중인 요청으로 슬롯 점유
+    threads = []
+    for i in range(3):
+        thread = threading.Thread(target=worker, args=(f"ingest-{i}", PRIORITY_BACKGROUND))
+        thread.start()
+        threads.append(thread)
+        _wait_for_depth(scheduler, i + 1)
+    guard = threading.Thread(target=worker, args=("guard", PRIORITY_INTERACTIVE))
+    guard.start()
+    threads.append(guard)
+    _wait_for_depth(scheduler, 4)
+
+    assert scheduler.stats()["queue_depth_by_class"] == {"background": 3, "interactive": 1}
+    scheduler.release()
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert order == ["guard", "ingest-0", "ingest-1", "ingest-2"]
+    stats = scheduler.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["completed"] == 5
+    assert stats["wait_time"]["background"]["samples"] == 4
+
+
+def test_concurrency_is_bounded():
+    """동시에 실행되는 요청 수가 max_concurrency를 넘지 않음"""
+    scheduler = LLMScheduler(max_concurrency=2)
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def worker():
+        with scheduler.slot():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert peak[0] == 2
+    assert scheduler.stats()["active"] == 0
+
+
+def test_llm_priority_context():
+    """llm_priority 블록 안에서만 우선순위가 바뀜"""
+    assert current_priority() == PRIORITY_INTERACTIVE
+    with llm_priority(PRIORITY_BACKGROUND):
+        assert current_priority() == PRIORITY_BACKGROUND
+    assert current_priority() == PRIORITY_INTERACTIVE
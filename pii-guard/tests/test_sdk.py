@@ -0,0 +1,73 @@
+# tests/test_sdk.py
+import sys
+import asyncio
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard import PIIGuard, PIIDetector, guard_answer, scrub_ingest
+from pii_guard import sdk
+from pii_guard.settings import Settings
+
+
+def test_async_methods_match_sync_functions():
+    """PIIGuard 결과는 동기 guard/scrub 함수와 같음"""
+    detector = PIIDetector(use_llm=False)
+    text = "제 번호는 010-1234-5678이고 이메일은 user@example.com입니다."
+
+    async def run():
+        async with PIIGuard(detector=detector) as guard:
+            return await guard.guard(text), await guard.scrub(text), await guard.guard_many([text, "안녕하세요"])
+
+    guarded, scrubbed, many = asyncio.run(run())
+
+    assert guarded == guard_answer(text, detector)
+    assert scrubbed["scrubbed"] == scrub_ingest(text, detector)["scrubbed"]
+    assert [result["answer"] for result in many] == [guarded["answer"], "안녕하세요"]
+
+
+def test_scrub_stream_keeps_order_and_shares_chunk_cache():
+    """스트림 결과는 입력 순서대로 나오고 반복 문단은 공유 캐시에서 재사용"""
+    footer = "문의: help@bank.com"
+    texts = [f"문서 {index} 연락처 010-1234-567{index}\n\n{footer}" for index in range(6)]
+
+    async def source():
+        for text in texts:
+            yield text
+
+    async def run():
+        async with PIIGuard(detector=PIIDetector(use_llm=False), max_concurrency=2) as guard:
+            return [result async for result in guard.scrub_stream(source())]
+
+    results = asyncio.run(run())
+
+    assert [result["scrubbed"].split()[1] for result in results] == [str(index) for index in range(6)]
+    assert sum(result["dedupe"]["reused_chunks"] for result in results) >= 1
+
+
+def test_detector_none_reuses_shared_detector(monkeypatch):
+    """detector=None 호출마다 탐지기를 새로 만들지 않음"""
+    created = []
+
+    def fake_from_settings(settings=None):
+        created.append(PIIDetector(use_llm=False))
+        return created[-1]
+
+    monkeypatch.setattr(sdk, "_default_detector", None)
+    monkeypatch.setattr(sdk, "detector_from_settings", fake_from_settings)
+
+    guard_answer("010-1234-5678")
+    scrub_ingest("user@example.com")
+
+    assert len(created) == 1
+
+
+def test_detector_from_settings_passes_num_predict(monkeypatch):
+    """PII_GUARD_LLM_NUM_PREDICT가 Ollama 클라이언트의 num_predict로 전달됨"""
+    monkeypatch.setenv("PII_GUARD_LLM_NUM_PREDICT", "256")
+    monkeypatch.setenv("PII_GUARD_OLLAMA_URL", "http://127.0.0.1:9")
+
+    detector = sdk.detector_from_settings(Settings())
+
+    assert detector.llm_client.num_predict == 256
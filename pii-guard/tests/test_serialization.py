@@ -0,0 +1,51 @@
+# tests/test_serialization.py
+import sys
+import json
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.api import GuardResponse, ScrubBatchResponse
+from pii_guard.detector import PIIDetector
+from pii_guard.guard import guard_answer, scrub_ingest_batch
+from pii_guard.serialization import (
+    render, negotiate, to_columnar, MEDIA_JSON, MEDIA_COLUMNAR, HAS_MSGPACK
+)
+
+
+def test_fast_json_matches_pydantic_output():
+    """검증을 생략한 직렬화 결과가 응답 모델을 거친 결과와 같음"""
+    detector = PIIDetector(use_llm=False)
+    result = guard_answer("제 번호는 010-1234-5678이고 이메일은 user@example.com입니다.", detector)
+
+    response = render(result, None, GuardResponse)
+
+    assert response.media_type == MEDIA_JSON
+    assert json.loads(response.body) == json.loads(GuardResponse(**result).model_dump_json())
+
+
+def test_columnar_format_for_batch_and_original_is_untouched():
+    """열 배열 형식은 문서별 matches를 변환하고 공유 결과 dict는 바꾸지 않음"""
+    detector = PIIDetector(use_llm=False)
+    result = scrub_ingest_batch(["연락처 010-1234-5678, user@example.com", "매치 없음"], detector)
+
+    body = json.loads(render(result, MEDIA_COLUMNAR, ScrubBatchResponse).body)
+
+    first = body["results"][0]["matches"]
+    original = result["results"][0]["matches"]
+    assert first["types"] == [match["type"] for match in original]
+    assert first["starts"] == [match["span"][0] for match in original]
+    assert first["ends"] == [match["span"][1] for match in original]
+    assert body["results"][1]["matches"]["values"] == []
+    assert isinstance(result["results"][0]["matches"], list)
+    assert to_columnar({"answer": "x"}) == {"answer": "x"}
+
+
+def test_accept_negotiation_falls_back_to_json():
+    """지원하지 않는 형식이나 설치되지 않은 msgpack 요청은 JSON으로 응답"""
+    assert negotiate(None) == MEDIA_JSON
+    assert negotiate("text/html, */*;q=0.8") == MEDIA_JSON
+    assert negotiate(f"{MEDIA_COLUMNAR};q=1.0") == MEDIA_COLUMNAR
+    expected = "application/msgpack" if HAS_MSGPACK else MEDIA_JSON
+    assert negotiate("application/x-msgpack") == expected
@@ -0,0 +1,37 @@
+# tests/test_server.py
+import sys
+from pathlib import Path
+
+import pytest
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard import detector, server
+from pii_guard.settings import Settings
+
+
+def test_preflight_validates_whitelist_without_building_detector(monkeypatch, tmp_path):
+    """부모 프로세스의 사전 검증은 탐지기를 만들지 않고 화이트리스트 파일만 읽음"""
+    def fail(*args, **kwargs):
+        raise AssertionError("preflight built a PIIDetector")
+
+    monkeypatch.setattr(detector.PIIDetector, "__init__", fail)
+    whitelist = tmp_path / "whitelist.yml"
+    whitelist.write_text("phones:\n  - 02-1234-5678\nemails: []\n", encoding="utf-8")
+    monkeypatch.setenv("PII_GUARD_WHITELIST_PATH", str(whitelist))
+
+    server._preflight(Settings())
+
+
+def test_preflight_rejects_unreadable_whitelist(monkeypatch, tmp_path):
+    """지정한 화이트리스트를 읽을 수 없으면 워커를 띄우기 전에 종료"""
+    monkeypatch.setenv("PII_GUARD_WHITELIST_PATH", str(tmp_path / "missing.yml"))
+    with pytest.raises(SystemExit):
+        server._preflight(Settings())
+
+    broken = tmp_path / "broken.yml"
+    broken.write_text("- just\n- a list\n", encoding="utf-8")
+    monkeypatch.setenv("PII_GUARD_WHITELIST_PATH", str(broken))
+    with pytest.raises(SystemExit):
+        server._preflight(Settings())
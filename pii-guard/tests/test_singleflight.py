@@ -0,0 +1,100 @@
+# tests/test_singleflight.py
+import sys
+import asyncio
+from pathlib import Path
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.singleflight import SingleFlight
+
+
+def test_concurrent_identical_requests_share_one_execution():
+    """같은 키의 동시 요청은 한 번만 실행되고 같은 결과를 받음"""
+    flight = SingleFlight()
+    executions = []
+
+    async def work():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return {"answer": "ok"}
+
+    async def main():
+        key = flight.make_key("guard", "지점 영업시간은 9시입니다")
+        other = flight.make_key("guard", "다른 답변")
+        return await asyncio.gather(*[flight.do(key, work) for _ in range(10)], flight.do(other, work))
+
+    results = asyncio.run(main())
+
+    assert len(executions) == 2
+    assert all(result == {"answer": "ok"} for result in results)
+    assert flight.stats()["coalesced"] == 9
+    assert flight.stats()["in_flight"] == 0
+
+    print("[PASS] 동시 요청 합치기 테스트 통과")
+
+
+def test_errors_propagate_to_all_waiters():
+    """공유 실행의 예외는 모든 대기자에게 전달되고 다음 요청은 새로 실행"""
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("ollama down")
+
+    async def main():
+        results = await asyncio.gather(*[flight.do("k", failing) for _ in range(3)], return_exceptions=True)
+        retry = await flight.do("k", lambda: asyncio.sleep(0, result="recovered"))
+        return results, retry
+
+    results, retry = asyncio.run(main())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retry == "recovered"
+
+    print("[PASS] 공유 실행 예외 전달 테스트 통과")
+
+
+def test_guard_endpoint_coalesces_only_matching_non_debug_requests(monkeypatch):
+    """/guard는 같은 텍스트·옵션의 일반 요청만 합치고, 디버그 요청과 옵션이 다른 요청은 따로 실행"""
+    from pii_guard import api
+    from pii_guard.settings import Settings
+
+    executions = []
+
+    async def fake_run_detection(func, text, *args):
+        executions.append(args[-1])
+        await asyncio.sleep(0.05)
+        return {"answer": text}
+
+    settings = Settings()
+    monkeypatch.setattr(api, "run_detection", fake_run_detection)
+    monkeypatch.setattr(api, "respond", lambda result, *args: result)
+    monkeypatch.setattr(api, "get_detector", lambda: None)
+    monkeypatch.setattr(api, "get_settings", lambda: settings)
+    monkeypatch.setattr(api, "guard_flight", SingleFlight())
+    request = api.GuardRequest(text="지점 영업시간은 9시입니다")
+
+    async def burst(debug):
+        return await asyncio.gather(*[api.guard_llm_answer(request, None, debug) for _ in range(3)])
+
+    asyncio.run(burst(False))
+    assert len(executions) == 1
+    asyncio.run(burst(True))
+    assert len(executions) == 4
+
+    async def mixed_options():
+        settings.guard_early_exit = False
+        first = asyncio.ensure_future(api.guard_llm_answer(request, None, False))
+        await asyncio.sleep(0)
+        settings.guard_early_exit = True
+        await asyncio.gather(first, api.guard_llm_answer(request, None, False))
+
+    executions.clear()
+    asyncio.run(mixed_options())
+    assert executions == [False, True]
+
+
+if __name__ == "__main__":
+    test_concurrent_identical_requests_share_one_execution()
+    test_errors_propagate_to_all_waiters()
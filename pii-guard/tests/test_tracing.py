@@ -0,0 +1,63 @@
+# tests/test_tracing.py
+import sys
+import json
+import contextvars
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+from pii_guard.guard import guard_answer
+from pii_guard.tracing import TraceExporter, current_trace, span, start_trace
+
+
+def test_guard_records_stage_spans():
+    """guard_answer 단계별 구간이 현재 Trace에 기록되고 Server-Timing 값으로 변환됨"""
+    detector = PIIDetector(use_llm=False)
+
+    with start_trace("/guard") as trace:
+        guard_answer("제 번호는 010-1234-5678입니다.", detector)
+
+    timings = trace.timings()
+    assert {"normalize", "regex", "merge", "injection_rules", "score", "mask"} <= set(timings)
+    header = trace.server_timing()
+    assert header.startswith("normalize;dur=")
+    assert header.split(", ")[-1].startswith("total;dur=")
+    assert current_trace() is None
+
+
+def test_spans_from_fanout_threads_are_summed():
+    """copy_context로 넘긴 스레드의 구간도 같은 Trace에 합산"""
+    def work():
+        with span("llm_pii"):
+            pass
+
+    with start_trace() as trace:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            for _ in range(3):
+                executor.submit(contextvars.copy_context().run, work)
+
+    assert [item["name"] for item in trace.spans] == ["llm_pii"] * 3
+    assert trace.timings()["llm_pii"] == round(sum(item["duration_ms"] for item in trace.spans), 3)
+
+    # Trace 밖에서는 기록하지 않음
+    with span("regex"):
+        pass
+    assert current_trace() is None
+
+
+def test_exporter_appends_json_lines(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    exporter = TraceExporter(str(path))
+
+    for status in (200, 429):
+        with start_trace("/ingest/scrub") as trace:
+            with span("mask"):
+                pass
+        exporter.export(trace, status=status)
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record["status"] for record in records] == [200, 429]
+    assert records[0]["spans"][0]["name"] == "mask"
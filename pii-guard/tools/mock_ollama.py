@@ -0,0 +1,177 @@
+# tools/mock_ollama.py
+import re
+import sys
+import json
+import math
+import random
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from pii_guard.detector import PIIDetector
+
+ITEM_BLOCK = re.compile(r'\[ITEM id=([^\]]+)\]\n(.*?)\n\[/ITEM\]', re.DOTALL)
+USER_TEXT = re.compile(r'^다음 텍스트(?:에서 PII를 탐지하세요|를 분석하세요):\n\n', re.DOTALL)
+
+# 휴리스틱 인젝션 판정 키워드 (GPU 모델 대신 응답 형식만 맞춤)
+INJECTION_KEYWORDS = {
+    'IGNORE_COMMANDS': ['무시', 'ignore', 'disregard'],
+    'ROLE_MANIPULATION': ['너는 이제', '당신은 이제', 'you are now', 'act as'],
+    'SYSTEM_OVERRIDE': ['시스템 프롬프트', 'system prompt', 'override'],
+    'JAILBREAK': ['탈옥', 'jailbreak', '우회', 'bypass'],
+    'DATA_EXTRACTION': ['알려줘', 'reveal', '출력해'],
+}
+
+
+class LatencyModel:
+    """응답 지연 분포 (fixed, uniform, normal, lognormal) + 프롬프트 길이 비례 지연"""
+
+    def __init__(self, distribution: str = "lognormal", mean_ms: float = 800.0, stddev_ms: float = 300.0,
+                 per_char_ms: float = 0.0):
+        self.distribution = distribution
+        self.mean_ms = mean_ms
+        self.stddev_ms = stddev_ms
+        self.per_char_ms = per_char_ms  # 입력 문자당 추가 지연 (긴 프롬프트 처리 시간 흉내)
+
+    def sample(self, prompt_chars: int = 0) -> float:
+        """지연 시간(초) 샘플"""
+        if self.distribution == "fixed":
+            base = self.mean_ms
+        elif self.distribution == "uniform":
+            base = random.uniform(max(0.0, self.mean_ms - self.stddev_ms), self.mean_ms + self.stddev_ms)
+        elif self.distribution == "normal":
+            base = random.gauss(self.mean_ms, self.stddev_ms)
+        else:
+            # 평균/표준편차가 주어진 값이 되도록 로그정규 분포 매개변수 변환 (긴 꼬리 지연)
+            mean = max(self.mean_ms, 1e-3)
+            variance = self.stddev_ms ** 2
+            sigma2 = math.log(1 + variance / mean ** 2)
+            mu = math.log(mean) - sigma2 / 2
+            base = random.lognormvariate(mu, sigma2 ** 0.5)
+        return max(0.0, base + self.per_char_ms * prompt_chars) / 1000
+
+
+class MockResponder:
+    """요청 프롬프트 종류를 보고 실제 모델과 같은 형식의 JSON 응답 생성"""
+
+    def __init__(self, mode: str = "heuristic", canned: Optional[Dict[str, Any]] = None):
+        self.mode = mode
+        self.canned = canned or {}
+        self.detector = PIIDetector(use_llm=False)
+
+    def _pii_items(self, text: str) -> List[Dict[str, Any]]:
+        return [
+            {"type": match.type, "value": match.value, "start": match.start, "end": match.end,
+             "confidence": round(min(0.99, match.confidence + 0.05), 2)}
+            for match in self.detector._detect_pii_regex(text)
+        ]
+
+    def _injection(self, text: str) -> Dict[str, Any]:
+        lowered = text.lower()
+        attack_types = [attack_type for attack_type, keywords in INJECTION_KEYWORDS.items()
+                        if any(keyword in lowered for keyword in keywords)]
+        return {
+            "injection_detected": bool(attack_types),
+            "attack_types": attack_types,
+            "confidence": 0.85 if attack_types else 0.1,
+            "details": "mock heuristic"
+        }
+
+    def respond(self, system_prompt: str, user_prompt: str) -> str:
+        if "프롬프트 인젝션" in system_prompt:
+            kind = "injection"
+        elif "[ITEM id=" in user_prompt:
+            kind = "batch"
+        else:
+            kind = "pii"
+
+        if self.mode == "canned" and kind in self.canned:
+            return json.dumps(self.canned[kind], ensure_ascii=False)
+
+        text = USER_TEXT.sub('', user_prompt, count=1)
+        if kind == "injection":
+            payload = self._injection(text)
+        elif kind == "batch":
+            payload = {"results": [{"id": item_id, "pii_detected": self._pii_items(item_text)}
+                                   for item_id, item_text in ITEM_BLOCK.findall(user_prompt)]}
+        else:
+            payload = {"pii_detected": self._pii_items(text)}
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def create_app(latency: LatencyModel, responder: MockResponder, error_rate: float = 0.0,
+               error_status: int = 500, model: str = "gemma3:12b-it-qat") -> FastAPI:
+    """Ollama /api/chat, /api/tags 흉내 서버"""
+    app = FastAPI(title="Mock Ollama")
+    stats = {"requests": 0, "errors": 0}
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        system_prompt = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+        user_prompt = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        stats["requests"] += 1
+
+        await asyncio.sleep(latency.sample(len(system_prompt) + len(user_prompt)))
+        if error_rate and random.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse(status_code=error_status, content={"error": "mock failure"})
+
+        return {
+            "model": body.get("model", model),
+            "message": {"role": "assistant", "content": responder.respond(system_prompt, user_prompt)},
+            "done": True
+        }
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": model}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GPU 없이 부하 테스트를 하기 위한 Ollama 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "normal", "lognormal"], default="lognormal",
+                        help="응답 지연 분포")
+    parser.add_argument("--latency-mean-ms", type=float, default=800.0)
+    parser.add_argument("--latency-stddev-ms", type=float, default=300.0)
+    parser.add_argument("--latency-per-char-ms", type=float, default=0.0, help="프롬프트 문자당 추가 지연")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0.0-1.0)")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--mode", choices=["heuristic", "canned"], default="heuristic",
+                        help="heuristic: RegEx/키워드로 응답 생성, canned: --canned 파일의 고정 응답")
+    parser.add_argument("--canned", help='고정 응답 JSON 파일 ({"pii": {...}, "batch": {...}, "injection": {...}})')
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    canned = json.loads(Path(args.canned).read_text(encoding="utf-8")) if args.canned else None
+
+    import uvicorn
+    app = create_app(
+        LatencyModel(args.latency, args.latency_mean_ms, args.latency_stddev_ms, args.latency_per_char_ms),
+        MockResponder(args.mode, canned),
+        error_rate=args.error_rate,
+        error_status=args.error_status
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
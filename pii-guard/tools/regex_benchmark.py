@@ -0,0 +1,117 @@
+# tools/regex_benchmark.py
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 상위 디렉토리의 pii_guard 모듈을 임포트하기 위한 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pii_guard.detector import PIIDetector
+
+BACKENDS = ("re", "regex", "re2")
+
+SAMPLE_TEXTS = [
+    "지점 영업시간은 평일 오전 9시부터 오후 4시까지입니다.",
+    "안녕하세요. 제 전화번호는 010-1234-5678이고 이메일은 user@example.com입니다.",
+    "고객 박영희님의 연락처는 010-9876-5432이며, 서울시 강남구 역삼동에 거주합니다.",
+    "환불 계좌는 123-45-678901이며 카드번호 4111-1111-1111-1111로 결제되었습니다.",
+    "사번: EMP-20231 담당자 John Smith, 우편번호 06236, 고객번호 AB123456",
+    "대출 금리는 신용도에 따라 달라지며 자세한 내용은 상담원에게 문의하세요.",
+]
+
+# 역추적이 많은 입력 (긴 숫자/공백 나열, @ 없는 긴 메일 후보)
+ADVERSARIAL_TEXTS = [
+    ("1 " * 5000) + "x",
+    ("a." * 5000) + "@",
+    ("0" * 20000),
+]
+
+
+def load_texts(path: Optional[str]) -> List[str]:
+    """본문 목록 로드 (.jsonl의 text 필드 또는 빈 줄로 구분된 텍스트 파일)"""
+    if not path:
+        return SAMPLE_TEXTS
+    content = Path(path).read_text(encoding="utf-8")
+    if path.endswith(".jsonl"):
+        return [json.loads(line)["text"] for line in content.splitlines() if line.strip()]
+    return [block.strip() for block in content.split("\n\n") if block.strip()]
+
+
+def match_keys(detector: PIIDetector, texts: List[str]) -> List[tuple]:
+    return [(index, match.type, match.start, match.end)
+            for index, text in enumerate(texts)
+            for match in detector._detect_pii_regex(text)]
+
+
+def run_backend(name: str, texts: List[str], repeat: int, timeout: float,
+                baseline: Optional[set]) -> Dict[str, Any]:
+    """한 엔진으로 texts를 repeat번 탐지한 처리량과 re 대비 결과 차이"""
+    detector = PIIDetector(use_llm=False, regex_backend=name, regex_timeout=timeout)
+    actual = detector.regex_backend.name
+    keys = set(match_keys(detector, texts))  # 워밍업 겸 결과 수집
+
+    chars = sum(len(text) for text in texts)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            detector._detect_pii_regex(text)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "backend": actual if actual == name else f"{name} (미설치, {actual} 사용)",
+        "docs_per_sec": round(repeat * len(texts) / elapsed, 1) if elapsed else 0.0,
+        "mb_per_sec": round(repeat * chars / elapsed / 1e6, 2) if elapsed else 0.0,
+        "matches": len(keys),
+        "only_this": len(keys - baseline) if baseline is not None else 0,
+        "only_re": len(baseline - keys) if baseline is not None else 0,
+        "timeouts": getattr(detector.regex_backend, "timeouts", 0),
+    }
+
+
+def print_report(title: str, rows: List[Dict[str, Any]]) -> None:
+    print(f"\n[{title}]")
+    header = f"{'backend':<24} {'docs/s':>10} {'MB/s':>8} {'matches':>8} {'+':>5} {'-':>5} {'timeouts':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['backend']:<24} {row['docs_per_sec']:>10} {row['mb_per_sec']:>8} {row['matches']:>8} "
+              f"{row['only_this']:>5} {row['only_re']:>5} {row['timeouts']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RegEx 엔진별(re/regex/re2) PII 패턴 처리량 비교")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="쉼표로 구분")
+    parser.add_argument("--corpus", help="본문 파일 (.jsonl 또는 빈 줄로 구분된 텍스트)")
+    parser.add_argument("--repeat", type=int, default=200, help="말뭉치 반복 횟수")
+    parser.add_argument("--timeout-ms", type=float, default=100.0, help="regex 엔진 패턴별 시간 제한")
+    parser.add_argument("--adversarial", action="store_true", help="역추적 유발 입력 처리 시간도 측정")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    unknown = [name for name in backends if name not in BACKENDS]
+    if unknown:
+        print(f"알 수 없는 엔진: {', '.join(unknown)}")
+        sys.exit(1)
+
+    suites = {"corpus": (load_texts(args.corpus), args.repeat)}
+    if args.adversarial:
+        suites["adversarial"] = (ADVERSARIAL_TEXTS, 3)
+
+    results = {}
+    for suite, (texts, repeat) in suites.items():
+        baseline = set(match_keys(PIIDetector(use_llm=False), texts))
+        results[suite] = [run_backend(name, texts, repeat, args.timeout_ms / 1000, baseline) for name in backends]
+        print_report(suite, results[suite])
+    print("\n+: re에는 없는 매치 수, -: re에만 있는 매치 수")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n결과 저장: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()